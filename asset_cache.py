@@ -0,0 +1,161 @@
+import base64
+import json
+import logging
+import os
+import threading
+import urllib.parse
+
+import websocket
+
+from navigation import BASE_URL
+from snapshots import SNAPSHOT_ROOT, SnapshotStore, cache_control
+
+
+def cache_version():
+    """Snapshot version to serve assets from, from ASSET_CACHE; interception is off when unset."""
+    return os.environ.get("ASSET_CACHE")
+
+
+def default_allowlist():
+    """The app's own host plus any extra hosts listed in ASSET_ALLOWLIST (comma separated)."""
+    hosts = {urllib.parse.urlsplit(BASE_URL).hostname}
+    hosts.update(host.strip() for host in os.environ.get("ASSET_ALLOWLIST", "").split(",") if host.strip())
+    return hosts
+
+
+class AssetInterceptor:
+    """Answers every tab's requests through the DevTools Fetch domain.
+
+    It holds one connection to the browser and attaches to each page target on it: the
+    tabs open at ``attach`` and, through ``Target.setAutoAttach``, every tab opened later
+    (tab_scheduler.py), which waits for Fetch to be enabled before it loads anything.
+
+    A request whose path is in the snapshot is fulfilled from the content-addressed store.
+    A request to an allowlisted host that is not in the snapshot goes to the network.
+    Anything else is blocked: third-party analytics and fonts never leave the browser.
+    Requests and bytes are counted per page, keyed by the document URL that loaded them;
+    ``take_pages`` hands them over from the listener thread.
+    """
+
+    def __init__(self, version: str, root: str = SNAPSHOT_ROOT, allowlist=None):
+        self.version = version
+        self.store = SnapshotStore(root)
+        self.files = self.store.manifest(version)["files"]
+        self.allowlist = set(allowlist) if allowlist is not None else default_allowlist()
+        self.pages = {}
+        self.documents = {}  # DevTools session -> URL of the document it last loaded
+        self.sessions = {}  # page target id -> DevTools session
+        self._connection = None
+        self._listing = None  # id of the Target.getTargets call that lists the tabs open at attach
+        self._ids = iter(range(1, 1 << 62))
+        self._lock = threading.Lock()  # guards sends on the connection and ``pages``
+
+    def _count(self, session, key: str, amount: int = 1):
+        with self._lock:
+            stats = self.pages.setdefault(
+                self.documents.get(session), {"cached": 0, "network": 0, "blocked": 0, "cached_bytes": 0}
+            )
+            stats[key] += amount
+
+    def decide(self, request, session: str = None):
+        """The Fetch command answering one ``Fetch.requestPaused`` event of ``session``, as (method, params)."""
+        url = request["request"]["url"]
+        if request.get("resourceType") == "Document":
+            self.documents[session] = url
+        parts = urllib.parse.urlsplit(url)
+        entry = self.files.get(parts.path or "/") if parts.hostname in self.allowlist else None
+        if entry is not None:
+            body = self.store.read(entry["sha256"])
+            self._count(session, "cached")
+            self._count(session, "cached_bytes", len(body))
+            headers = [
+                {"name": "Content-Type", "value": entry["content_type"]},
+                {"name": "Content-Length", "value": str(len(body))},
+                {"name": "Cache-Control", "value": cache_control(parts.path, entry["content_type"])},
+                {"name": "ETag", "value": f'"{entry["sha256"]}"'},
+            ]
+            return "Fetch.fulfillRequest", {
+                "requestId": request["requestId"], "responseCode": 200, "responseHeaders": headers,
+                "body": base64.b64encode(body).decode(),
+            }
+        if parts.hostname in self.allowlist:
+            self._count(session, "network")
+            return "Fetch.continueRequest", {"requestId": request["requestId"]}
+        self._count(session, "blocked")
+        logging.info("Blocked request to %s: %s", parts.hostname, url)
+        return "Fetch.failRequest", {"requestId": request["requestId"], "errorReason": "BlockedByClient"}
+
+    def _send(self, method: str, params, session: str = None) -> int:
+        message = {"id": next(self._ids), "method": method, "params": params}
+        if session is not None:
+            message["sessionId"] = session
+        with self._lock:
+            self._connection.send(json.dumps(message))
+        return message["id"]
+
+    def _attached(self, params):
+        """Enable Fetch on a newly attached page target, then let it start loading."""
+        session, target = params["sessionId"], params["targetInfo"]
+        page = target["type"] == "page"
+        duplicate = page and target["targetId"] in self.sessions
+        if page and not duplicate:
+            self.sessions[target["targetId"]] = session
+            self._send("Fetch.enable", {"patterns": [{"urlPattern": "*", "requestStage": "Request"}]}, session)
+        if params.get("waitingForDebugger"):
+            self._send("Runtime.runIfWaitingForDebugger", {}, session)
+        if duplicate:
+            # Already intercepted through another session; a second one would pause every request twice
+            self._send("Target.detachFromTarget", {"sessionId": session})
+
+    def handle(self, message):
+        """Act on one message from the browser connection."""
+        method, params = message.get("method"), message.get("params", {})
+        if message.get("id") is not None and message["id"] == self._listing:
+            for target in message.get("result", {}).get("targetInfos", []):
+                if target["type"] == "page" and target["targetId"] not in self.sessions:
+                    self._send("Target.attachToTarget", {"targetId": target["targetId"], "flatten": True})
+        elif method == "Target.attachedToTarget":
+            self._attached(params)
+        elif method == "Target.detachedFromTarget":
+            for target, session in list(self.sessions.items()):
+                if session == params["sessionId"]:
+                    del self.sessions[target]
+            self.documents.pop(params["sessionId"], None)
+        elif method == "Fetch.requestPaused":
+            self._send(*self.decide(params, message.get("sessionId")), message.get("sessionId"))
+
+    def _listen(self):
+        while True:
+            try:
+                self.handle(json.loads(self._connection.recv()))
+            except (websocket.WebSocketException, OSError):
+                return
+
+    def attach(self, websocket_url: str):
+        """Start intercepting every request of every tab of the browser behind ``websocket_url``."""
+        self._connection = websocket.create_connection(websocket_url)
+        self._send("Target.setAutoAttach", {"autoAttach": True, "waitForDebuggerOnStart": True, "flatten": True})
+        self._listing = self._send("Target.getTargets", {})
+        threading.Thread(target=self._listen, daemon=True).start()
+        return self
+
+    def detach(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def take_pages(self):
+        """Per-page counts since the last call, leaving an empty slate for the next test."""
+        with self._lock:
+            pages, self.pages = self.pages, {}
+        return pages
+
+    def totals(self):
+        """Requests and bytes summed over every page this interceptor has seen."""
+        totals = {"cached": 0, "network": 0, "blocked": 0, "cached_bytes": 0}
+        with self._lock:
+            pages = [dict(stats) for stats in self.pages.values()]
+        for stats in pages:
+            for key in totals:
+                totals[key] += stats[key]
+        return totals
@@ -0,0 +1,219 @@
+import atexit
+import contextlib
+import logging
+import os
+import threading
+import time
+
+import psutil
+from selenium import webdriver
+
+from chrome_pool import new_session
+from memory_tracker import browser_processes
+
+
+PING = "return document.readyState;"
+# Empties the page's storage and returns how many entries it held
+CLEAR_STORAGE = ("const n = localStorage.length + sessionStorage.length; "
+                 "localStorage.clear(); sessionStorage.clear(); return n;")
+
+
+def _chromedrivers():
+    """chromedriver processes started by this Python process."""
+    return {child.pid: child for child in psutil.Process().children()
+            if "chromedriver" in child.name().lower()}
+
+
+def kill_tree(process):
+    """Kill a process and all of its descendants, ignoring ones that already exited."""
+    try:
+        processes = process.children(recursive=True) + [process]
+    except psutil.Error:
+        return
+    for p in processes:
+        with contextlib.suppress(psutil.Error):
+            p.kill()
+    psutil.wait_procs(processes, timeout=5)
+
+
+class BrowserManager:
+    """Owns one long-lived Chrome session and replaces it when it becomes a liability.
+
+    The browser is recycled after ``max_tests`` tests or ``max_age`` seconds and pinged
+    between tests. Browser creation and every test run under a watchdog: when one
+    exceeds its time budget the chromedriver and Chrome processes are killed, which makes
+    the blocked WebDriver call fail at once, and a fresh browser is started for the next
+    test. Every recycle, kill and replacement is appended to ``events``.
+
+    pytest tests get the browser from the ``driver`` fixture, which uses ``run``; the
+    suites' setUp/tearDown use ``begin`` (through ``setting_up``) and ``end``.
+    """
+
+    def __init__(self, factory=webdriver.Chrome, max_tests: int = 20, max_age: float = 600,
+                 test_timeout: float = 120, start_timeout: float = 60, ping_timeout: float = 10):
+        self.factory = factory
+        self.max_tests = max_tests
+        self.max_age = max_age
+        self.test_timeout = test_timeout
+        self.start_timeout = start_timeout
+        self.ping_timeout = ping_timeout
+        self.driver = None
+        self.started_at = 0.0
+        self.tests_run = 0
+        self.events = []
+        self._current = None
+
+    def _event(self, event: str, reason: str, test_id: str = None):
+        self.events.append({"event": event, "reason": reason, "test": test_id, "time": time.time()})
+        logging.warning("Browser %s: %s (%s)", event, reason, test_id or "between tests")
+
+    @staticmethod
+    def _arm(timeout: float, on_expire):
+        fired = threading.Event()
+
+        def expire():
+            fired.set()
+            on_expire()
+
+        timer = threading.Timer(timeout, expire)
+        timer.daemon = True
+        timer.start()
+        return timer, fired
+
+    @contextlib.contextmanager
+    def _watchdog(self, timeout: float, on_expire):
+        timer, fired = self._arm(timeout, on_expire)
+        try:
+            yield fired
+        finally:
+            timer.cancel()
+
+    def _kill_current(self):
+        if self.driver is None:
+            return
+        service = getattr(getattr(self.driver, "service", None), "process", None)
+        if service is not None:
+            kill_tree(psutil.Process(service.pid))
+        else:
+            for process in browser_processes(self.driver):
+                kill_tree(process)
+
+    def start(self):
+        """Start a new browser, killing any chromedriver it spawned if startup hangs."""
+        before = set(_chromedrivers())
+
+        def kill_new_chromedrivers():
+            for pid, process in _chromedrivers().items():
+                if pid not in before:
+                    kill_tree(process)
+
+        with self._watchdog(self.start_timeout, kill_new_chromedrivers) as fired:
+            try:
+                self.driver = self.factory()
+            except Exception:
+                if fired.is_set():
+                    self._event("kill", f"browser did not start within {self.start_timeout}s")
+                raise
+        self.started_at = time.monotonic()
+        self.tests_run = 0
+        return self.driver
+
+    def quit(self):
+        if self.driver is None:
+            return
+        try:
+            with self._watchdog(self.ping_timeout, self._kill_current):
+                self.driver.quit()
+        except Exception:
+            self._kill_current()
+        self.driver = None
+
+    def replace(self, event: str, reason: str, test_id: str = None):
+        self._event(event, reason, test_id)
+        self.quit()
+        return self.start()
+
+    def healthy(self) -> bool:
+        """Ping the browser with a round trip that must answer within ``ping_timeout``."""
+        try:
+            with self._watchdog(self.ping_timeout, self._kill_current) as fired:
+                self.driver.execute_script(PING)
+            return not fired.is_set()
+        except Exception:
+            return False
+
+    def acquire(self, test_id: str = None):
+        """Return a healthy browser for the next test, recycling or replacing it as needed."""
+        if self.driver is None:
+            return self.start()
+        age = time.monotonic() - self.started_at
+        if self.tests_run >= self.max_tests:
+            return self.replace("recycle", f"ran {self.tests_run} tests", test_id)
+        if age >= self.max_age:
+            return self.replace("recycle", f"alive for {age:.0f}s", test_id)
+        if not self.healthy():
+            return self.replace("replace", "failed health check", test_id)
+        return self.driver
+
+    def begin(self, test_id: str = None, timeout: float = None):
+        """Hand a browser to a test and start its time budget; the test must call ``end``.
+
+        A budget still running from a test that never called ``end`` is ended first, so
+        its timer cannot fire in the middle of this test.
+        """
+        if self._current is not None:
+            logging.warning("Test %s did not end its browser budget", self._current[0])
+            self.end()
+        timeout = timeout or self.test_timeout
+        driver = self.acquire(test_id)
+        timer, fired = self._arm(timeout, self._kill_current)
+        self._current = test_id, timeout, timer, fired
+        return driver
+
+    def end(self):
+        """Stop the running test's budget; a browser killed for overrunning it is replaced."""
+        if self._current is None:
+            return
+        test_id, timeout, timer, fired = self._current
+        self._current = None
+        timer.cancel()
+        self.tests_run += 1
+        if fired.is_set():
+            self.replace("kill", f"test exceeded its {timeout}s budget", test_id)
+
+    @contextlib.contextmanager
+    def setting_up(self, test_id: str = None, timeout: float = None):
+        """``begin`` for a setUp: if the rest of the setUp fails, teardown never runs, so end here."""
+        driver = self.begin(test_id, timeout)
+        try:
+            yield driver
+        except BaseException:
+            self.end()
+            raise
+
+    @contextlib.contextmanager
+    def run(self, test_id: str = None, timeout: float = None):
+        """Run one test under the time budget; a browser killed for overrunning is replaced."""
+        driver = self.begin(test_id, timeout)
+        try:
+            yield driver
+        finally:
+            self.end()
+
+
+def open_clean(driver, url: str):
+    """Load ``url`` in a reused browser, dropping whatever storage the previous test left behind."""
+    driver.get(url)
+    if driver.execute_script(CLEAR_STORAGE):
+        driver.refresh()
+    return driver
+
+
+# The worker's browser, shared by the driver fixture and the suites' setUp
+browsers = BrowserManager(
+    factory=new_session,
+    max_tests=int(os.environ.get("BROWSER_MAX_TESTS", 20)),
+    max_age=float(os.environ.get("BROWSER_MAX_AGE", 600)),
+    test_timeout=float(os.environ.get("TEST_TIME_BUDGET", 120)),
+)
+atexit.register(browsers.quit)
@@ -0,0 +1,217 @@
+import atexit
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.remote.switch_to import SwitchTo
+
+from asset_cache import AssetInterceptor, cache_version
+from device_profiles import apply_device_profile, default_profile
+from navigation import BASE_URL
+from timeline import timeline
+
+
+PROFILE_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".chrome_profile_template")
+# Chrome locks and per-run state that must not be copied into a clone
+PROFILE_SKIP = ("SingletonLock", "SingletonCookie", "SingletonSocket", "lockfile")
+# Keep background tabs rendering at full speed so flows in several tabs can overlap (see tab_scheduler.py)
+BACKGROUND_TAB_FLAGS = (
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+)
+
+
+class SharedService(Service):
+    """chromedriver service that outlives the sessions created on it.
+
+    ``start`` is a no-op while the process is running and ``stop``, which every
+    ``driver.quit()`` calls, leaves it alone; ``shutdown`` really stops it.
+    """
+
+    def start(self):
+        # Service only sets ``process`` once it has started one
+        process = getattr(self, "process", None)
+        if process is not None and process.poll() is None:
+            return
+        super().start()
+
+    def stop(self):
+        pass
+
+    def shutdown(self):
+        if getattr(self, "process", None) is not None:
+            super().stop()
+
+
+_service = None
+
+
+def shared_service() -> SharedService:
+    """The worker's chromedriver service, started on first use and stopped at exit."""
+    global _service
+    if _service is None:
+        _service = SharedService()
+        atexit.register(_service.shutdown)
+    return _service
+
+
+def build_profile_template(url: str = BASE_URL, path: str = PROFILE_TEMPLATE):
+    """Create a Chrome profile whose HTTP cache already holds the calculator's assets."""
+    if os.path.isdir(path):
+        return path
+    staging = tempfile.mkdtemp(prefix="profile-template-")
+    publishing = None
+    try:
+        options = webdriver.ChromeOptions()
+        options.add_argument(f"--user-data-dir={staging}")
+        driver = webdriver.Chrome(options=options, service=shared_service())
+        try:
+            driver.get(url)
+            driver.execute_script("localStorage.clear(); sessionStorage.clear();")
+            driver.delete_all_cookies()
+        finally:
+            driver.quit()
+        # Copied next to ``path`` first so the rename that publishes it stays on one filesystem
+        publishing = tempfile.mkdtemp(prefix=".profile-template-", dir=os.path.dirname(os.path.abspath(path)))
+        shutil.copytree(staging, publishing, dirs_exist_ok=True, ignore=shutil.ignore_patterns(*PROFILE_SKIP))
+        try:
+            os.rename(publishing, path)
+            publishing = None
+        except OSError:
+            pass  # another worker finished its template first; keep theirs
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+        if publishing is not None:
+            shutil.rmtree(publishing, ignore_errors=True)
+    return path
+
+
+def clone_profile(template: str = PROFILE_TEMPLATE) -> str:
+    """Copy the template into a fresh directory, using copy-on-write reflinks where the filesystem has them."""
+    clone = tempfile.mkdtemp(prefix="chrome-profile-")
+    if sys.platform.startswith("linux"):
+        result = subprocess.run(["cp", "-a", "--reflink=auto", f"{template}/.", clone], capture_output=True)
+        if result.returncode == 0:
+            for name in PROFILE_SKIP:
+                stale = os.path.join(clone, name)
+                if os.path.lexists(stale):
+                    os.remove(stale)
+            return clone
+    shutil.copytree(template, clone, dirs_exist_ok=True, ignore=shutil.ignore_patterns(*PROFILE_SKIP))
+    return clone
+
+
+class EmulatingSwitchTo(SwitchTo):
+    """Applies the session's device profile to every tab it opens; DevTools throttling is per tab."""
+
+    def new_window(self, type_hint: str = None):
+        super().new_window(type_hint)
+        if self._driver.device_profile:
+            apply_device_profile(self._driver, self._driver.device_profile)
+
+
+class PooledChrome(webdriver.Chrome):
+    """Chrome session on the shared service that removes its cloned profile on quit.
+
+    Navigation, screenshots and quitting show up as spans on the test timeline. Tabs
+    opened with ``switch_to.new_window`` get the session's ``device_profile`` as well.
+    """
+
+    def __init__(self, options=None, profile: str = None):
+        options = options or webdriver.ChromeOptions()
+        for flag in BACKGROUND_TAB_FLAGS:
+            if flag not in options.arguments:
+                options.add_argument(flag)
+        self.profile = profile
+        self.interceptor = None
+        self.device_profile = None
+        if profile:
+            options.add_argument(f"--user-data-dir={profile}")
+        super().__init__(options=options, service=shared_service())
+        self._switch_to = EmulatingSwitchTo(self)
+
+    def get(self, url: str):
+        with timeline.span("navigate", "browser", url=url):
+            super().get(url)
+
+    def get_screenshot_as_base64(self):
+        with timeline.span("screenshot", "browser"):
+            return super().get_screenshot_as_base64()
+
+    def quit(self):
+        try:
+            if self.interceptor is not None:
+                self.interceptor.detach()
+            with timeline.span("driver.quit", "browser"):
+                super().quit()
+        finally:
+            if self.profile:
+                shutil.rmtree(self.profile, ignore_errors=True)
+
+
+def new_session(options=None, warm_profile: bool = True, device: str = None):
+    """Start a Chrome session on the shared chromedriver, from a clone of the warm profile template.
+
+    ``device`` (default: the DEVICE_PROFILE environment variable) names a device profile
+    from device_profiles.py to emulate from the first page load on. With ASSET_CACHE set to
+    a snapshot version, every tab's requests are answered by an ``AssetInterceptor``.
+    """
+    device = device or default_profile()
+    with timeline.span("browser launch", "browser", device=device):
+        profile = clone_profile(build_profile_template()) if warm_profile else None
+        try:
+            driver = PooledChrome(options=options, profile=profile)
+        except Exception:
+            if profile:
+                shutil.rmtree(profile, ignore_errors=True)
+            raise
+        try:
+            if device:
+                apply_device_profile(driver, device)
+                driver.device_profile = device
+            if cache_version():
+                driver.interceptor = AssetInterceptor(cache_version()).attach(browser_websocket_url(driver))
+        except Exception:
+            driver.quit()  # also removes the cloned profile
+            raise
+        return driver
+
+
+def page_websocket_url(driver) -> str:
+    """DevTools websocket of the driver's current tab, for CDP events ``execute_cdp_cmd`` cannot deliver."""
+    address = driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+    target = driver.execute_cdp_cmd("Target.getTargetInfo", {})["targetInfo"]["targetId"]
+    return f"ws://{address}/devtools/page/{target}"
+
+
+def browser_websocket_url(driver) -> str:
+    """DevTools websocket of the whole browser, which sees tabs opened after it connects."""
+    address = driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+    with urllib.request.urlopen(f"http://{address}/json/version", timeout=10) as response:
+        return json.load(response)["webSocketDebuggerUrl"]
+
+
+def benchmark_session_creation(sessions: int = 5):
+    """Average seconds to create (and quit) a session: fresh ``webdriver.Chrome()`` vs. ``new_session()``."""
+    results = {}
+    for name, factory in (("per_test_spawn", webdriver.Chrome), ("shared_service", new_session)):
+        factory().quit()  # warm-up, builds the template and starts the shared service
+        start = time.perf_counter()
+        for _ in range(sessions):
+            driver = factory()
+            driver.quit()
+        results[name] = (time.perf_counter() - start) / sessions
+    logging.info(
+        "Session creation: %.0f ms per-test spawn, %.0f ms shared service + warm profile",
+        results["per_test_spawn"] * 1000, results["shared_service"] * 1000,
+    )
+    return results
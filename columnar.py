@@ -0,0 +1,234 @@
+"""Compact columnar gradebook files (``.gbc``) with memory-mapped, zero-copy loading.
+
+Layout: the magic ``GBCOL1\\n``, an 8-byte little-endian header length, a JSON header
+(row count, string dictionaries and the dtype/offset of every column) and then the raw
+column arrays, each aligned to 64 bytes. Text columns are dictionary-encoded to int32
+codes, letter grades are int8 codes into the reference letter scale (-1 for numeric
+grades) and missing numbers are NaN.
+
+``gradebook.compute`` reads ``.gbc`` files through ``ColumnarGradebook`` and
+``scenarios.gradebook_plan`` turns one into browser sessions; ``GradeEngine`` works one
+calculator page at a time and does not read them.
+
+Usage:
+    python columnar.py department.csv department.gbc
+"""
+import argparse
+import array
+import csv
+import json
+import mmap
+import struct
+
+import numpy as np
+
+from grade_engine import GRADE_TYPES, LETTER_SCALE
+
+
+MAGIC = b"GBCOL1\n"
+ALIGNMENT = 64
+LETTERS = list(LETTER_SCALE)
+LETTER_POINTS = np.array([LETTER_SCALE[letter][0] for letter in LETTERS])
+
+COLUMNS = {
+    "student": ("i", "<i4"),
+    "course": ("i", "<i4"),
+    "task": ("i", "<i4"),
+    "grade_type": ("b", "i1"),
+    "letter": ("b", "i1"),
+    "grade": ("d", "<f8"),
+    "weight": ("d", "<f8"),
+    "max_grade": ("d", "<f8"),
+}
+DICTIONARY_COLUMNS = ("student", "course", "task")
+
+
+def _number(value) -> float:
+    return float("nan") if value is None or value == "" else float(value)
+
+
+class ColumnarWriter:
+    """Accumulate rows into compact typed buffers and write them as one ``.gbc`` file."""
+
+    def __init__(self):
+        self.buffers = {name: array.array(typecode) for name, (typecode, _) in COLUMNS.items()}
+        self.dictionaries = {name: {} for name in DICTIONARY_COLUMNS}
+
+    def _code(self, column: str, value: str) -> int:
+        codes = self.dictionaries[column]
+        return codes.setdefault(value, len(codes))
+
+    def append(self, student: str, grade_type: str, task: str = "", grade=None, weight=None,
+               max_grade=None, course: str = ""):
+        if grade_type not in GRADE_TYPES:
+            raise ValueError(f"Invalid grade type for {student}: {grade_type}")
+        buffers = self.buffers
+        buffers["student"].append(self._code("student", student))
+        buffers["course"].append(self._code("course", course or ""))
+        buffers["task"].append(self._code("task", task or ""))
+        buffers["grade_type"].append(GRADE_TYPES.index(grade_type))
+        if grade_type == "Letter" and grade not in (None, ""):
+            if grade not in LETTER_SCALE:
+                raise ValueError(f"Invalid letter grade: {grade}")
+            buffers["letter"].append(LETTERS.index(grade))
+            buffers["grade"].append(float("nan"))
+        else:
+            buffers["letter"].append(-1)
+            buffers["grade"].append(_number(grade))
+        buffers["weight"].append(_number(weight))
+        buffers["max_grade"].append(_number(max_grade))
+
+    def write(self, path: str):
+        rows = len(self.buffers["student"])
+        columns = {}
+        offset = 0
+        for name, (_, dtype) in COLUMNS.items():
+            columns[name] = {"dtype": dtype, "offset": offset}
+            offset += -(-rows * np.dtype(dtype).itemsize // ALIGNMENT) * ALIGNMENT
+        header = json.dumps({
+            "rows": rows,
+            "columns": columns,
+            "dictionaries": {name: list(codes) for name, codes in self.dictionaries.items()},
+        }).encode("utf-8")
+        start = len(MAGIC) + 8 + len(header)
+        padding = -start % ALIGNMENT
+        with open(path, "wb") as f:
+            f.write(MAGIC + struct.pack("<Q", len(header) + padding) + header + b" " * padding)
+            for name, (_, dtype) in COLUMNS.items():
+                data = np.frombuffer(self.buffers[name], dtype=self.buffers[name].typecode).astype(dtype, copy=False)
+                f.write(data.tobytes())
+                f.write(b"\0" * (-data.nbytes % ALIGNMENT))
+
+
+class ColumnarGradebook:
+    """Read-only view of a ``.gbc`` file; every column is a NumPy array backed by the mmap.
+
+    Columns from ``table[name]`` are views into the file and stay valid after ``close``,
+    which then leaves the unmapping to the last of them. ``copy`` returns one that owns its data.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a columnar gradebook")
+        (header_length,) = struct.unpack_from("<Q", self._mmap, len(MAGIC))
+        data_start = len(MAGIC) + 8 + header_length
+        header = json.loads(self._mmap[len(MAGIC) + 8:data_start])
+        self.rows = header["rows"]
+        self.dictionaries = header["dictionaries"]
+        self.columns = {
+            name: np.frombuffer(self._mmap, dtype=spec["dtype"], count=self.rows, offset=data_start + spec["offset"])
+            for name, spec in header["columns"].items()
+        }
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def copy(self, name: str):
+        """Column ``name`` as an array of its own, detached from the file."""
+        return self.columns[name].copy()
+
+    def close(self):
+        self.columns = {}
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Views handed out by __getitem__ still point into the map; they hold the last
+            # references to it, and it is unmapped when they are freed
+            pass
+        self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def contributions(self):
+        """Vectorized (numerator, denominator) per row, following ``grade_engine.row_contribution``."""
+        grade_type = self["grade_type"]
+        letter = self["letter"]
+        value = np.where(letter >= 0, LETTER_POINTS[np.maximum(letter, 0)], self["grade"])
+        weight = np.nan_to_num(self["weight"])
+        points = grade_type == GRADE_TYPES.index("Points")
+        numerator = np.where(points, value, value * weight)
+        denominator = np.where(points, np.nan_to_num(self["max_grade"]), weight)
+        missing = np.isnan(value)
+        return np.where(missing, 0.0, numerator), np.where(missing, 0.0, denominator)
+
+    def student_totals(self):
+        """{(student, course): [grade_type, weighted, weight, rows]}, the same shape as ``gradebook.compute``."""
+        courses = len(self.dictionaries["course"])
+        keys, inverse = np.unique(self["student"].astype(np.int64) * courses + self["course"], return_inverse=True)
+        numerator, denominator = self.contributions()
+        weighted = np.bincount(inverse, weights=numerator, minlength=len(keys))
+        weights = np.bincount(inverse, weights=denominator, minlength=len(keys))
+        counts = np.bincount(inverse, minlength=len(keys))
+        first_type = np.full(len(keys), len(GRADE_TYPES), dtype=np.int8)
+        last_type = np.full(len(keys), -1, dtype=np.int8)
+        np.minimum.at(first_type, inverse, self["grade_type"])
+        np.maximum.at(last_type, inverse, self["grade_type"])
+
+        students = self.dictionaries["student"]
+        course_names = self.dictionaries["course"]
+        totals = {}
+        for index, key in enumerate(keys.tolist()):
+            student, course = students[key // courses], course_names[key % courses]
+            if first_type[index] != last_type[index]:
+                raise ValueError(f"{(student, course)} mixes grade types")
+            totals[(student, course)] = [GRADE_TYPES[first_type[index]], float(weighted[index]),
+                                         float(weights[index]), int(counts[index])]
+        return totals
+
+    def scenarios(self):
+        """Yield (student, course, grade_type, rows) with the suites' ``(task, grade, weight)`` tuples.
+
+        Grouping runs on the mapped columns; tuples are built one group at a time, as the
+        caller consumes them. Points rows carry ``max_grade`` in the last position, as in
+        ``run_tests_for_grade_type``.
+        """
+        order = np.lexsort((np.arange(self.rows), self["course"], self["student"]))
+        student, course = self["student"][order], self["course"][order]
+        boundaries = np.flatnonzero((np.diff(student) != 0) | (np.diff(course) != 0)) + 1
+        tasks = self.dictionaries["task"]
+        for start, end in zip(np.r_[0, boundaries].tolist(), np.r_[boundaries, self.rows].tolist()):
+            if start == end:
+                continue
+            group = order[start:end]
+            kind = GRADE_TYPES[self["grade_type"][group[0]]]
+            names = [tasks[code] for code in self["task"][group].tolist()]
+            letters = self["letter"][group].tolist()
+            grades = self["grade"][group].tolist()
+            last = self["max_grade" if kind == "Points" else "weight"][group].tolist()
+            rows = [(name, LETTERS[code] if code >= 0 else value, extra)
+                    for name, code, value, extra in zip(names, letters, grades, last)]
+            yield (self.dictionaries["student"][student[start]], self.dictionaries["course"][course[start]],
+                   kind, rows)
+
+
+def convert_csv(csv_path: str, out_path: str) -> int:
+    """Convert a gradebook CSV (the ``gradebook.py`` input format) and return the row count."""
+    writer = ColumnarWriter()
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            writer.append(row["student"], row["grade_type"], row.get("task"), row.get("grade"),
+                          row.get("weight"), row.get("max_grade"), row.get("course"))
+    writer.write(out_path)
+    return len(writer.buffers["student"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a gradebook CSV to the columnar .gbc format.")
+    parser.add_argument("csv")
+    parser.add_argument("output")
+    args = parser.parse_args(argv)
+    print(f"{convert_csv(args.csv, args.output)} rows written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,214 @@
 # conftest.py
+import json
+import logging
+import os
+
 import pytest
-from selenium import webdriver
+
+import text_entry
+from browser_lifecycle import browsers, open_clean
+from navigation import grade_type_url
+from waits import telemetry
+from scenarios import coverage
+from device_profiles import matrix
+import page_ready
+import log_buffer
+import golden_master
+from timeline import timeline, timeline_dir, merge, reset_directory, summarize
+
+@pytest.fixture
+def gradebook_rows():
+    """A small gradebook: (student, grade_type, task, grade, weight, max_grade) rows, students interleaved."""
+    return [
+        ("ana", "Percentage", "Assignment", 90, 25, ""),
+        ("ben", "Letter", "Presentation", "A", 20, ""),
+        ("ana", "Percentage", "Exam", 85, 30, ""),
+        ("cy", "Points", "Task 1", 80, "", 100),
+        ("ben", "Letter", "Quiz", "B+", 10, ""),
+        ("cy", "Points", "Task 2", 75, "", 90),
+        ("ana", "Percentage", "Project", 70, 15, ""),
+    ]
+
+
+@pytest.fixture(scope="session")
+def browser_manager():
+    """One long-lived browser per worker, recycled and health-checked between tests."""
+    yield browsers
+    browsers.quit()
+
 
 @pytest.fixture(scope="function")
-def driver():
+def driver(browser_manager, request):
     # Setup code
-    driver = webdriver.Chrome()
-    driver.get("https://softekogradecalculator.netlify.app/calculator/grade-calculator?type=letter")
-    yield driver
-    driver.quit()
+    marker = request.node.get_closest_marker("time_budget")
+    with browser_manager.run(request.node.nodeid, marker.args[0] if marker else None) as driver:
+        # The browser is shared between tests, so drop whatever state the previous test left behind
+        open_clean(driver, grade_type_url("Letter"))
+        yield driver
+        interceptor = getattr(driver, "interceptor", None)
+        pages = interceptor.take_pages() if interceptor is not None else None
+        if pages:
+            request.node.user_properties.append(("assets", pages))
+    events = [event for event in browser_manager.events if event["test"] == request.node.nodeid]
+    if events:
+        request.node.user_properties.append(("browser_lifecycle", events))
+
+
+def pytest_configure(config):
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        timeline.worker = workerinput["workerid"]
+    elif timeline.enabled:
+        reset_directory(timeline_dir())
+    config.addinivalue_line("markers", "time_budget(seconds): kill and replace the browser after this long")
+    config.addinivalue_line(
+        "markers", "text_entry(mode): enter text with 'fast' (default) or 'keystroke' entry, see text_entry.py"
+    )
+
+
+@pytest.fixture(autouse=True)
+def text_entry_mode(request):
+    """Apply the test's text_entry marker for the duration of the test."""
+    marker = request.node.get_closest_marker("text_entry")
+    text_entry.set_default_mode(marker.args[0] if marker else "fast")
+    yield
+    text_entry.set_default_mode("fast")
+
+
+@pytest.fixture(autouse=True)
+def test_logs(request):
+    """Buffer the test's log records in memory (see log_buffer.py) and attach what logging cost it."""
+    log_buffer.install_logging()
+    log_buffer.buffer.start_test(request.node.nodeid)
+    yield
+    log_buffer.buffer.end_test()
+    entry = dict(log_buffer.buffer.overhead[request.node.nodeid])
+    entry["seconds"] = log_buffer.buffer.test_seconds(request.node.nodeid)
+    request.node.user_properties.append(("logging", entry))
+
+
+@pytest.fixture(autouse=True)
+def wait_budget(request):
+    """Log where each test spent its explicit-wait time, largest condition first."""
+    telemetry.reset()
+    yield
+    summary = telemetry.summary()
+    if summary:
+        logging.info("Wait budget for %s: %.3fs", request.node.name, telemetry.total())
+        for label, entry in summary.items():
+            logging.info("  %s: %.3fs over %s waits, %s polls", label, entry["elapsed"], entry["count"], entry["polls"])
+        request.node.user_properties.append(("waits", summary))
+
+
+@pytest.fixture(autouse=True)
+def page_metrics_report(request):
+    """Attach the in-page metrics a test's helpers collected (see page_metrics.PageMetrics)."""
+    yield
+    metrics = getattr(request.instance, "metrics", None)
+    if metrics is not None and metrics.records:
+        request.node.user_properties.append(("page_metrics", metrics.records))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    with timeline.span(item.nodeid, "test"):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    with timeline.span("setup", "pytest", test=item.nodeid):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    with timeline.span("call", "pytest", test=item.nodeid):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    with timeline.span("teardown", "pytest", test=item.nodeid):
+        yield
+
+
+def pytest_sessionfinish(session):
+    """Write out golden-master records and this worker's phase timeline; the controller merges the timelines."""
+    golden_master.flush_session_recorder()
+    if os.environ.get("LOG_DUMP") and log_buffer.buffer.installed:
+        worker = getattr(session.config, "workerinput", {}).get("workerid", "main")
+        log_buffer.buffer.dump(os.path.join(log_buffer.LOG_DIR, f"session-{worker}.jsonl"))
+    if not timeline.enabled:
+        return
+    timeline.write(timeline_dir())
+    if getattr(session.config, "workerinput", None) is None:
+        merge(timeline_dir())
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Write out a failing test's log records, and attach the test's user properties (memory samples,
+    metrics...) to the pytest-html report."""
+    outcome = yield
+    report = outcome.get_result()
+    if report.failed and log_buffer.buffer.installed:
+        # Only failing tests pay for writing their log records out
+        item.user_properties.append(("log_file", log_buffer.buffer.dump_test(item.nodeid)))
+    pytest_html = item.config.pluginmanager.getplugin("html")
+    if pytest_html is None or report.when != "teardown":
+        return
+    extras = getattr(report, "extras", [])
+    for name, value in item.user_properties:
+        extras.append(pytest_html.extras.json(value, name=name))
+    report.extras = extras
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if browsers.events:
+        terminalreporter.section("browser lifecycle")
+        for event in browsers.events:
+            terminalreporter.write_line(f"{event['event']}: {event['reason']} ({event['test']})")
+    if coverage.sessions:
+        summary = coverage.summary()
+        terminalreporter.section("scenario coverage")
+        terminalreporter.write_line(
+            f"{summary['strength']}-way: {summary['covered']}/{summary['total']} interactions "
+            f"({summary['coverage']:.0%}) in {summary['sessions']} sessions, {summary['browser_seconds']}s of browser time, "
+            f"{summary['interactions_per_browser_second']:.2f} interactions per browser-second"
+        )
+    if page_ready.report.records:
+        records = page_ready.report.records
+        resets = sum(entry["reset"] for entry in records)
+        unhydrated = sum(not entry["hydrated"] for entry in records)
+        terminalreporter.section("page-ready gate")
+        terminalreporter.write_line(
+            f"{len(records)} tests, {resets} needed a reset, {unhydrated} passed on the DOM check without React hydration, "
+            f"mean gate {sum(e['elapsed'] for e in records) / len(records):.2f}s, "
+            f"an estimated {page_ready.report.estimated_saving():.1f}s saved against the speculative Reset/Clear"
+        )
+    if log_buffer.buffer.overhead:
+        overhead = log_buffer.buffer.overhead.values()
+        records = sum(entry["records"] for entry in overhead)
+        handler_seconds = sum(entry["handler_seconds"] for entry in overhead)
+        seconds = sum(log_buffer.buffer.test_seconds(test) for test in log_buffer.buffer.overhead)
+        terminalreporter.section("logging")
+        terminalreporter.write_line(
+            f"{records} records over {len(overhead)} tests: {seconds / len(overhead) * 1000:.2f} ms of logging per test "
+            f"end to end, {handler_seconds / len(overhead) * 1000:.2f} ms of it in the handler; "
+            f"failing tests' records in {log_buffer.LOG_DIR}/"
+        )
+    if matrix.cells:
+        terminalreporter.section("latency by device profile")
+        for line in matrix.format().splitlines():
+            terminalreporter.write_line(line)
+    if timeline.enabled:
+        with open(os.path.join(timeline_dir(), "timeline.json")) as f:
+            summary = summarize(json.load(f)["traceEvents"])
+        if summary:
+            terminalreporter.section("timeline")
+            terminalreporter.write_line(f"{summary['wall']:.1f}s wall, trace in {os.path.join(timeline_dir(), 'timeline.json')}")
+            for phase, seconds in sorted(summary["phases"].items(), key=lambda item: item[1], reverse=True):
+                terminalreporter.write_line(f"  {phase}: {seconds:.1f}s")
+            for worker, seconds in sorted(summary["idle"].items()):
+                terminalreporter.write_line(f"  {worker} idle between tests: {seconds:.1f}s")
@@ -0,0 +1,69 @@
+import os
+
+
+KBPS = 1024 / 8  # bytes per second in one kilobit per second
+
+# CPU slowdown is a multiplier on the host CPU; network throughput is in bytes/s, latency in ms
+PROFILES = {
+    "baseline": {"cpu_slowdown": 1, "network": None},
+    "low-end laptop": {"cpu_slowdown": 4, "network": {"latency": 40, "download": 10_000 * KBPS, "upload": 5_000 * KBPS}},
+    "slow 3G": {"cpu_slowdown": 2, "network": {"latency": 400, "download": 400 * KBPS, "upload": 400 * KBPS}},
+}
+
+
+def default_profile():
+    """Profile applied to every new session, from DEVICE_PROFILE (none by default)."""
+    return os.environ.get("DEVICE_PROFILE")
+
+
+def apply_device_profile(driver, name: str):
+    """Emulate the named device on the driver's current tab through DevTools.
+
+    The emulation does not carry over to other tabs; ``chrome_pool.PooledChrome`` applies
+    its session's profile to each tab it opens.
+    """
+    if name not in PROFILES:
+        raise ValueError(f"Unknown device profile: {name}")
+    profile = PROFILES[name]
+    driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": profile["cpu_slowdown"]})
+    network = profile["network"]
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+        "offline": False,
+        "latency": network["latency"] if network else 0,
+        "downloadThroughput": network["download"] if network else -1,
+        "uploadThroughput": network["upload"] if network else -1,
+    })
+
+
+class LatencyMatrix:
+    """Measured statistic of each budget under each device profile, for a side-by-side table."""
+
+    def __init__(self):
+        self.cells = {}
+
+    def record(self, budget_name: str, profile: str, statistic: str, value: float):
+        self.cells[(budget_name, profile)] = (statistic, value)
+
+    def rows(self):
+        budgets = list(dict.fromkeys(budget for budget, _ in self.cells))
+        profiles = [profile for profile in PROFILES if any(p == profile for _, p in self.cells)]
+        return budgets, profiles
+
+    def format(self) -> str:
+        budgets, profiles = self.rows()
+        width = max([len(budget) for budget in budgets] + [6])
+        lines = [f"{'budget':<{width}}  " + "  ".join(f"{profile:>16}" for profile in profiles)]
+        for budget in budgets:
+            cells = []
+            for profile in profiles:
+                if (budget, profile) in self.cells:
+                    statistic, value = self.cells[(budget, profile)]
+                    cells.append(f"{f'{statistic} {value:.1f} ms':>16}")
+                else:
+                    cells.append(f"{'-':>16}")
+            lines.append(f"{budget:<{width}}  " + "  ".join(cells))
+        return "\n".join(lines)
+
+
+matrix = LatencyMatrix()
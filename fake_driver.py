@@ -0,0 +1,653 @@
+"""In-memory stand-in for the Chrome driver, modelling the calculator's form.
+
+Covers the part of the WebDriver API the suites use: ``find_element(s)`` with the CSS
+selectors and XPath expressions the helpers use, ``execute_script`` for the scripts in
+``SCRIPTS``, ``execute_cdp_cmd``, and element ``click``/``send_keys``/``clear``/``get_attribute``/``tag_name``.
+Scripts are matched on their exact text, imported from the modules that send them, so
+editing one of them cannot silently change what the fake does; an unknown script
+raises ValueError. Rows are re-created when the form is reset
+or the grade type changes; the old elements then raise StaleElementReferenceException
+like real ones would. Helpers run against it in microseconds, so their branching
+can be tested without a browser; ``FakeClock`` does the same for their timing.
+"""
+import itertools
+import json
+import re
+import urllib.parse
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    InvalidSelectorException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.common.timeouts import Timeouts
+
+import letter_select
+import memory_tracker
+import page_metrics
+import page_ready
+import perf_budgets
+import result_display
+import tab_scheduler
+import text_entry
+from browser_lifecycle import CLEAR_STORAGE, PING
+from grade_engine import GRADE_TYPES
+
+
+INITIAL_ROWS = 3
+
+# The page's own tables, written out here rather than taken from grade_engine so that a
+# result the suites check against the fake is not the engine checking itself
+GRADE_POINTS = {
+    "A+": 4.3, "A": 4.0, "A-": 3.7, "B+": 3.3, "B": 3.0, "B-": 2.7, "C+": 2.3,
+    "C": 2.0, "C-": 1.7, "D+": 1.3, "D": 1.0, "D-": 0.7, "F": 0.0,
+}
+PERCENTAGE_CUTOFFS = (
+    (97, "A+"), (93, "A"), (90, "A-"), (87, "B+"), (83, "B"), (80, "B-"),
+    (77, "C+"), (73, "C"), (70, "C-"), (67, "D+"), (63, "D"), (60, "D-"),
+)
+LETTER_OPTIONS = ("",) + tuple(GRADE_POINTS)
+NUMBER_CHARACTERS = set("0123456789.-+eE")
+NUMBER = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+
+# WebDriver idioms the suites write inline
+CLICK = "arguments[0].click();"
+SCROLL_INTO_VIEW = ("arguments[0].scrollIntoView({block: 'center'});", "arguments[0].scrollIntoView(true);")
+STEP_UP = "arguments[0].stepUp();"
+STEP_DOWN = "arguments[0].stepDown();"
+
+
+class FakeElement:
+    def __init__(self, tag: str, attributes=None, text: str = "", on_click=None):
+        self.tag_name = tag
+        self.attributes = dict(attributes or {})
+        self._text = text
+        self.on_click = on_click
+        self.children = []
+        self.parent = None
+        self.stale = False
+        self.obscured = False
+        self.options = []
+
+    def append(self, *children):
+        for child in children:
+            child.parent = self
+            self.children.append(child)
+        return self
+
+    def iter(self):
+        """Descendants in document order."""
+        for child in self.children:
+            yield child
+            yield from child.iter()
+
+    def _check(self):
+        if self.stale:
+            raise StaleElementReferenceException(f"<{self.tag_name}> is no longer attached to the DOM")
+
+    @property
+    def text(self) -> str:
+        self._check()
+        return self._text + "".join(child.text for child in self.children)
+
+    @property
+    def value(self) -> str:
+        return self.attributes.get("value", "")
+
+    def set_value(self, value: str):
+        """Assign through the value setter: number inputs drop anything that is not a number."""
+        value = str(value)
+        if self.attributes.get("type") == "number" and value and not NUMBER.match(value):
+            value = ""
+        self.attributes["value"] = value
+
+    def get_attribute(self, name: str):
+        self._check()
+        if name == "value":
+            return self.value
+        return self.attributes.get(name)
+
+    get_dom_attribute = get_attribute
+    get_property = get_attribute
+
+    def is_displayed(self) -> bool:
+        self._check()
+        return True
+
+    def is_enabled(self) -> bool:
+        self._check()
+        return "disabled" not in self.attributes
+
+    def is_selected(self) -> bool:
+        self._check()
+        return self.parent is not None and self.parent.value == self.value
+
+    def click(self):
+        """A native click, which lands on whatever covers the element when it is obscured."""
+        self._check()
+        if self.obscured:
+            raise ElementClickInterceptedException(f"<{self.tag_name}> is not clickable: another element would receive the click")
+        self.activate()
+
+    def activate(self):
+        """What a JavaScript ``element.click()`` does: run the handler, covered or not."""
+        self._check()
+        if self.on_click:
+            self.on_click()
+
+    def clear(self):
+        self._check()
+        self.attributes["value"] = ""
+
+    def send_keys(self, *values):
+        self._check()
+        typed = "".join(str(value) for value in values)
+        if self.tag_name == "select":
+            # Type-ahead: each key extends the prefix and selects the first option starting with it
+            prefix = ""
+            for key in typed:
+                prefix += key.lower()
+                match = next((option for option in self.options if option and option.lower().startswith(prefix)), None)
+                if match is not None:
+                    self.attributes["value"] = match
+        elif self.attributes.get("type") == "number":
+            self.attributes["value"] = self.value + "".join(key for key in typed if key in NUMBER_CHARACTERS)
+        else:
+            self.attributes["value"] = self.value + typed
+
+    def step(self, direction: int):
+        """``stepUp()``/``stepDown()``: move by ``step`` and clamp to ``min``/``max``."""
+        self._check()
+        step = float(self.attributes.get("step", 1))
+        current = float(self.value) if NUMBER.match(self.value or "") else 0.0
+        value = current + direction * step
+        if "min" in self.attributes:
+            value = max(value, float(self.attributes["min"]))
+        if "max" in self.attributes:
+            value = min(value, float(self.attributes["max"]))
+        self.attributes["value"] = f"{value:g}"
+
+    def find_elements(self, by=By.ID, value: str = None):
+        self._check()
+        return find_all(self, by, value)
+
+    def find_element(self, by=By.ID, value: str = None):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"No element matches {by} {value!r}")
+        return found[0]
+
+    def __repr__(self):
+        return f"<FakeElement {self.tag_name} {self.attributes}>"
+
+
+# --- selectors --------------------------------------------------------------------------
+
+COMPOUND = re.compile(r"(?P<tag>[a-zA-Z*][\w-]*)?(?P<rest>(?:\.[\w-]+|#[\w-]+|\[[^\]]+\])*)$")
+ATTRIBUTE = re.compile(r"""\[\s*([\w-]+)\s*(?:([*^$]?=)\s*['"]?(.*?)['"]?\s*)?\]""")
+
+
+def _split_outside_brackets(selector: str, separator: str):
+    parts, depth, current = [], 0, ""
+    for character in selector:
+        depth += character == "["
+        depth -= character == "]"
+        if depth == 0 and (character.isspace() if separator == " " else character == separator):
+            if current.strip():
+                parts.append(current.strip())
+            current = ""
+        else:
+            current += character
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def _compound_matcher(compound: str):
+    match = COMPOUND.match(compound)
+    if not match:
+        raise InvalidSelectorException(f"Unsupported CSS selector: {compound}")
+    tag = match.group("tag")
+    rest = match.group("rest")
+    classes = re.findall(r"\.([\w-]+)", re.sub(r"\[[^\]]+\]", "", rest))
+    ids = re.findall(r"#([\w-]+)", re.sub(r"\[[^\]]+\]", "", rest))
+    attributes = ATTRIBUTE.findall(rest)
+
+    def matches(element):
+        if tag and tag != "*" and element.tag_name != tag:
+            return False
+        element_classes = element.attributes.get("class", "").split()
+        if any(name not in element_classes for name in classes):
+            return False
+        if any(element.attributes.get("id") != name for name in ids):
+            return False
+        for name, operator, expected in attributes:
+            actual = element.value if name == "value" else element.attributes.get(name)
+            if actual is None:
+                return False
+            if operator == "=" and actual != expected:
+                return False
+            if operator == "*=" and expected not in actual:
+                return False
+            if operator == "^=" and not actual.startswith(expected):
+                return False
+            if operator == "$=" and not actual.endswith(expected):
+                return False
+        return True
+    return matches
+
+
+def css_select(root, selector: str):
+    """querySelectorAll: descendants of ``root`` matching any selector group, in document order."""
+    groups = [[_compound_matcher(part) for part in _split_outside_brackets(group, " ")]
+              for group in _split_outside_brackets(selector, ",")]
+
+    def matches_group(element, matchers):
+        if not matchers[-1](element):
+            return False
+        ancestor = element.parent
+        for matcher in reversed(matchers[:-1]):
+            while ancestor is not None and not matcher(ancestor):
+                ancestor = ancestor.parent
+            if ancestor is None:
+                return False
+            ancestor = ancestor.parent
+        return True
+
+    return [element for element in root.iter() if any(matches_group(element, matchers) for matchers in groups)]
+
+
+XPATH_STEP = re.compile(r"(?P<tag>[\w*]+)(?P<predicates>(?:\[[^\]]+\])*)")
+XPATH_PREDICATE = re.compile(r"\[([^\]]+)\]")
+
+
+def _xpath_filter(predicate: str):
+    predicate = predicate.strip()
+    text = re.fullmatch(r"normalize-space\(\)\s*=\s*['\"](.*)['\"]", predicate)
+    if text:
+        return lambda element: " ".join(element.text.split()) == text.group(1)
+    contains = re.fullmatch(r"contains\(\s*(text\(\)|@[\w-]+)\s*,\s*['\"](.*)['\"]\s*\)", predicate)
+    if contains:
+        source, expected = contains.groups()
+        if source == "text()":
+            return lambda element: expected in element._text
+        return lambda element: expected in (element.attributes.get(source[1:]) or "")
+    raise InvalidSelectorException(f"Unsupported XPath predicate: [{predicate}]")
+
+
+def xpath_select(root, expression: str):
+    """The XPath subset the suites use: ``//`` steps with text, class and position predicates."""
+    if expression.startswith(".//"):
+        expression = expression[1:]
+    if not expression.startswith("//"):
+        raise InvalidSelectorException(f"Unsupported XPath: {expression}")
+    context = [root]
+    for step in expression[2:].split("//"):
+        match = XPATH_STEP.fullmatch(step)
+        if not match:
+            raise InvalidSelectorException(f"Unsupported XPath step: {step}")
+        tag = match.group("tag")
+        predicates = XPATH_PREDICATE.findall(match.group("predicates"))
+        found, seen = [], set()
+        for node in context:
+            for parent in [node] + list(node.iter()):
+                candidates = [child for child in parent.children if tag == "*" or child.tag_name == tag]
+                for predicate in predicates:
+                    if predicate.strip().isdigit():
+                        position = int(predicate)
+                        candidates = candidates[position - 1:position]
+                    else:
+                        candidates = [child for child in candidates if _xpath_filter(predicate)(child)]
+                for candidate in candidates:
+                    if id(candidate) not in seen:
+                        seen.add(id(candidate))
+                        found.append(candidate)
+        context = found
+    order = {id(element): index for index, element in enumerate(root.iter())}
+    return sorted(context, key=lambda element: order.get(id(element), -1))
+
+
+def find_all(root, by, value):
+    if by == By.CSS_SELECTOR:
+        return css_select(root, value)
+    if by == By.XPATH:
+        return xpath_select(root, value)
+    if by == By.TAG_NAME:
+        return css_select(root, value)
+    if by == By.ID:
+        return css_select(root, f"[id='{value}']")
+    if by == By.NAME:
+        return css_select(root, f"[name='{value}']")
+    if by == By.CLASS_NAME:
+        return css_select(root, f".{value}")
+    raise InvalidSelectorException(f"Unsupported locator strategy: {by}")
+
+
+# --- the calculator ---------------------------------------------------------------------
+
+class FakeCalculator:
+    """The grade calculator page: grade type buttons, the row form, and the add and reset buttons."""
+
+    def __init__(self, grade_type: str = "Percentage", initial_rows: int = INITIAL_ROWS):
+        if grade_type not in GRADE_TYPES:
+            raise ValueError(f"Invalid grade type: {grade_type}")
+        self.grade_type = grade_type
+        self.initial_rows = initial_rows
+        self.document = FakeElement("html")
+        body = FakeElement("body")
+        self.document.append(body)
+        for name in GRADE_TYPES:
+            body.append(FakeElement("button", {"type": "button"}, f"{name} Grade",
+                                    on_click=lambda name=name: self.switch(name)))
+        self.form = FakeElement("form", {"class": "flex flex-col gap-2"})
+        self.add_button = FakeElement("button", {"type": "button"}, "+ Add new row", on_click=self.add_row)
+        self.reset_button = FakeElement("button", {"type": "button"}, "Reset/Clear", on_click=self.reset)
+        body.append(FakeElement("div", {"class": "flex flex-col gap-2 w-full"}).append(
+            self.form, FakeElement("div", {"class": "flex gap-2"}).append(self.add_button, self.reset_button)))
+        self.reset()
+
+    @property
+    def rows(self):
+        return self.form.children
+
+    def _input(self, field: str, index: int, **attributes):
+        return FakeElement("input", dict(attributes, name=f"rows.{index}.{field}", value=""))
+
+    def _make_row(self, index: int):
+        row = FakeElement("div", {"class": "flex flex-row gap-3 justify-start"})
+        row.append(self._input("task", index, type="text", placeholder="e.g Assignment"))
+        if self.grade_type == "Letter":
+            grade = FakeElement("select", {"name": f"rows.{index}.grade", "value": ""})
+            grade.options = list(LETTER_OPTIONS)
+            grade.append(*(FakeElement("option", {"value": option}, option or "Select") for option in LETTER_OPTIONS))
+            row.append(grade)
+        elif self.grade_type == "Points":
+            row.append(self._input("grade", index, type="number", min="0"))
+        else:
+            row.append(self._input("grade", index, type="number", min="0", max="100"))
+        if self.grade_type == "Points":
+            row.append(self._input("maxGrade", index, type="number", min="0"))
+        else:
+            row.append(self._input("weight", index, type="number", min="0", max="100"))
+        row.append(FakeElement("button", {"type": "button"}, "×", on_click=lambda: self.delete_row(row)))
+        return row
+
+    def _renumber(self):
+        for index, row in enumerate(self.rows):
+            for field in row.iter():
+                if "name" in field.attributes:
+                    field.attributes["name"] = re.sub(r"rows\.\d+\.", f"rows.{index}.", field.attributes["name"])
+
+    def _drop(self, row):
+        for element in [row] + list(row.iter()):
+            element.stale = True
+        row.parent = None
+
+    def add_row(self):
+        self.form.append(self._make_row(len(self.rows)))
+
+    def displayed_result(self) -> str:
+        """The result text next to the form, worked out from the rows with the page's tables."""
+        rows = []
+        for row in self.rows:
+            fields = {field.attributes["name"].split(".")[-1]: field.value
+                      for field in row.iter() if "name" in field.attributes}
+            if fields["grade"]:
+                rows.append(fields)
+        if self.grade_type == "Points":
+            earned = sum(float(fields["grade"]) for fields in rows)
+            possible = sum(float(fields["maxGrade"] or 0) for fields in rows)
+            percentage = earned / possible * 100 if possible > 0 else None
+        else:
+            weights = [float(fields["weight"] or 0) for fields in rows]
+            if self.grade_type == "Letter":
+                grades = [GRADE_POINTS[fields["grade"]] for fields in rows]
+            else:
+                grades = [float(fields["grade"]) for fields in rows]
+            total = sum(weights)
+            if total <= 0:
+                return ""
+            average = sum(grade * weight for grade, weight in zip(grades, weights)) / total
+            if self.grade_type == "Letter":
+                letter = min(GRADE_POINTS, key=lambda name: abs(GRADE_POINTS[name] - average))
+                return f"GPA: {average:.2f} ({letter})"
+            percentage = average
+        if percentage is None:
+            return ""
+        letter = next((name for cutoff, name in PERCENTAGE_CUTOFFS if percentage >= cutoff), "F")
+        return f"Your grade: {percentage:.2f}% ({letter})"
+
+    def delete_row(self, row):
+        self.rows.remove(row)
+        self._drop(row)
+        self._renumber()
+
+    def reset(self):
+        for row in list(self.rows):
+            self._drop(row)
+        self.form.children = []
+        for _ in range(self.initial_rows):
+            self.add_row()
+
+    def switch(self, grade_type: str):
+        self.grade_type = grade_type
+        self.reset()
+
+
+class FakeClock:
+    """Stands in for the ``time`` module of the module under test; sleeping only moves the clock forward."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class _SwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def new_window(self, kind: str = "tab"):
+        self._driver.current_window_handle = self._driver._open_window()
+
+    def window(self, handle: str):
+        if handle not in self._driver._windows:
+            raise NoSuchWindowException(f"No window {handle}")
+        self._driver.current_window_handle = handle
+
+
+class FakeDriver:
+    """WebDriver-shaped access to ``FakeCalculator`` pages, one per window."""
+
+    def __init__(self, initial_rows: int = INITIAL_ROWS):
+        self.initial_rows = initial_rows
+        self._windows = {"window-0": {"url": "about:blank", "page": None}}
+        self.current_window_handle = "window-0"
+        self.switch_to = _SwitchTo(self)
+        self.scripts = []
+        self.screenshots = []
+        self.closed = False
+        self.timeouts = Timeouts(script=30)
+        self.commands = []
+        # DevTools Performance.getMetrics counters, performance.now() in ms and the page's long tasks
+        self.performance = {"TaskDuration": 0.0, "LayoutCount": 0}
+        self.performance_now = 0.0
+        self.long_tasks = []
+        self.js_heap = 0
+        self._loads = itertools.count(1)
+        self._handles = itertools.count(1)
+
+    @property
+    def window_handles(self):
+        return list(self._windows)
+
+    @property
+    def page(self) -> FakeCalculator:
+        return self._windows[self.current_window_handle]["page"]
+
+    @property
+    def current_url(self) -> str:
+        return self._windows[self.current_window_handle]["url"]
+
+    @property
+    def title(self) -> str:
+        return "Grade Calculator" if self.page else ""
+
+    def get(self, url: str):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+        grade_type = query.get("type", ["percentage"])[0].capitalize()
+        page = FakeCalculator(grade_type, self.initial_rows)
+        page.time_origin = float(next(self._loads))
+        self._windows[self.current_window_handle] = {"url": url, "page": page}
+
+    def refresh(self):
+        self.get(self.current_url)
+
+    def find_elements(self, by=By.ID, value: str = None):
+        if self.page is None:
+            return []
+        return find_all(self.page.document, by, value)
+
+    def find_element(self, by=By.ID, value: str = None):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"No element matches {by} {value!r}")
+        return found[0]
+
+    def execute_script(self, script: str, *args):
+        """Run one of the scripts in ``SCRIPTS``; anything else raises ValueError."""
+        handler = SCRIPTS.get(script)
+        if handler is None:
+            raise ValueError(f"unknown script: {script.strip()[:80]}")
+        return handler(self, *args)
+
+    def _open_window(self) -> str:
+        handle = f"window-{next(self._handles)}"
+        self._windows[handle] = {"url": "about:blank", "page": None}
+        return handle
+
+    def execute(self, command: str, params=None):
+        """The window commands selenium's own ``SwitchTo`` sends, for code built on it."""
+        if command == Command.NEW_WINDOW:
+            return {"value": {"handle": self._open_window(), "type": "tab"}}
+        if command == Command.SWITCH_TO_WINDOW:
+            self.switch_to.window(params["handle"])
+            return {"value": None}
+        raise ValueError(f"unknown command: {command}")
+
+    def execute_cdp_cmd(self, command: str, params):
+        """Record a DevTools command; ``Performance.getMetrics`` reports ``performance``."""
+        self.commands.append((command, params))
+        if command == "Performance.getMetrics":
+            return {"metrics": [{"name": name, "value": value} for name, value in self.performance.items()]}
+        if command == "Page.addScriptToEvaluateOnNewDocument":
+            return {"identifier": str(len(self.commands))}
+        return {}
+
+    def execute_async_script(self, script: str, *args):
+        """Only the page-ready gate, which the synchronous fake page always passes at once."""
+        if script != page_ready.READY_SCRIPT:
+            raise ValueError(f"unknown script: {script.strip()[:80]}")
+        self.scripts.append("ready")
+        return {"ready_at": 0.0, "state": self._form_state(), "hydrated": True}
+
+    def _click(self, element):
+        self.scripts.append("click")
+        element.activate()
+
+    def _scroll(self, element):
+        self.scripts.append("scroll")
+        element._check()
+        element.obscured = False
+
+    def _step(self, element, direction: int):
+        self.scripts.append("step")
+        element.step(direction)
+
+    def _set_value(self, element, value):
+        self.scripts.append("set_value")
+        element._check()
+        element.set_value(value)
+
+    def _navigate(self, url: str):
+        self.scripts.append("navigate")
+        self.get(url)
+
+    def _read_options(self, element):
+        self.scripts.append("read_options")
+        element._check()
+        return {"page": self.page.time_origin, "options": [[option.text, option.value] for option in element.children]}
+
+    def _select_option(self, element, value, page):
+        self.scripts.append("select_option")
+        element._check()
+        if self.page.time_origin != page:
+            return False
+        element.set_value(value)
+        return True
+
+    def _ping(self):
+        if self.closed:
+            raise WebDriverException("browser is gone")
+        return "complete"
+
+    def _start_measure(self, action):
+        self.scripts.append("start_measure")
+        return self.performance_now
+
+    def _end_measure(self, action, since):
+        self.scripts.append("end_measure")
+        return {"duration": self.performance_now - since,
+                "longTasks": [task for task in self.long_tasks if task["start"] >= since], "marks": []}
+
+    def _form_state(self):
+        """Like ``page_ready.FORM_STATE``: the form's [name, value] pairs as a JSON string."""
+        if self.page is None:
+            return None
+        return json.dumps([[field.attributes.get("name"), field.value] for field in css_select(self.page.form, "input, select")])
+
+    def save_screenshot(self, filename: str) -> bool:
+        self.screenshots.append(filename)
+        return True
+
+    def set_script_timeout(self, seconds: float):
+        self.timeouts.script = seconds
+
+    def close(self):
+        """Close the current window; like WebDriver, switch to another one before the next command."""
+        del self._windows[self.current_window_handle]
+
+    def quit(self):
+        self.closed = True
+
+
+SCRIPTS = {
+    CLICK: FakeDriver._click,
+    **{script: FakeDriver._scroll for script in SCROLL_INTO_VIEW},
+    STEP_UP: lambda driver, element: driver._step(element, 1),
+    STEP_DOWN: lambda driver, element: driver._step(element, -1),
+    text_entry.SET_VALUE_SCRIPT: FakeDriver._set_value,
+    tab_scheduler.NAVIGATE: FakeDriver._navigate,
+    letter_select.READ_OPTIONS: FakeDriver._read_options,
+    letter_select.SELECT_OPTION: FakeDriver._select_option,
+    result_display.DISPLAYED_RESULT: lambda driver: driver.page.displayed_result() if driver.page else "",
+    page_ready.FORM_STATE: FakeDriver._form_state,
+    PING: FakeDriver._ping,
+    memory_tracker.JS_HEAP: lambda driver: driver.js_heap,
+    page_metrics.START_SCRIPT: FakeDriver._start_measure,
+    page_metrics.END_SCRIPT: FakeDriver._end_measure,
+    page_metrics.CLEAR_SCRIPT: lambda driver: driver.scripts.append("clear_marks"),
+    CLEAR_STORAGE: lambda driver: 0,
+    perf_budgets.ROW_COUNT: lambda driver: len(driver.page.rows) if driver.page else 0,
+}
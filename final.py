@@ -1,24 +1,37 @@
 import time
 import logging
 import unittest
-from selenium import webdriver
+from browser_lifecycle import browsers, open_clean
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
+from waits import AdaptiveWait as WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from navigation import GradeTypeNavigator, BASE_URL
+from page_metrics import PageMetrics, measured
+from text_entry import enter_text
+from page_ready import ensure_initial_state
+from letter_select import select_letter
+from log_buffer import install_logging
 
 
 class TestGradeCalculator(unittest.TestCase):
     def setUp(self):
         """Initial setup of the WebDriver with logging configuration."""
-        logging.basicConfig(level=logging.INFO)
-        self.driver = webdriver.Chrome()
-        self.driver.get("https://softekogradecalculator.netlify.app/calculator/grade-calculator")
-        self.clear_all_rows()
+        install_logging()
+        with browsers.setting_up(self.id()) as driver:
+            self.driver = open_clean(driver, BASE_URL)
+            self.navigator = GradeTypeNavigator(self.driver)
+            self.metrics = PageMetrics(self.driver)
+            self.readiness = ensure_initial_state(self.driver)
 
     def tearDown(self):
-        """Tear down the WebDriver session."""
-        self.driver.quit()
+        """Close the navigator's tabs and hand the browser back to the manager, which recycles it when due."""
+        try:
+            self.metrics.clear()
+            self.navigator.close()
+        finally:
+            browsers.end()
 
+    @measured("clear_all_rows")
     def clear_all_rows(self):
         """Utility function to clear all rows before starting a test."""
         try:
@@ -30,22 +43,12 @@ class TestGradeCalculator(unittest.TestCase):
         except Exception:
             logging.info("No rows to clear or reset button not clickable.")
 
+    @measured("select_grade_type")
     def select_grade_type(self, grade_type: str):
-        """Select a grade type button (Percentage, Letter, Points)."""
-        driver = self.driver
-        grade_type_buttons = {
-            "Percentage": (By.XPATH, "//button[contains(text(), 'Percentage')]"),
-            "Letter": (By.XPATH, "//button[contains(text(), 'Letter')]"),
-            "Points": (By.XPATH, "//button[contains(text(), 'Points')]")
-        }
-
-        button_locator = grade_type_buttons.get(grade_type)
-        if button_locator:
-            WebDriverWait(driver, 10).until(EC.element_to_be_clickable(button_locator)).click()
-            logging.info(f"Selected grade type: {grade_type}")
-        else:
-            raise ValueError(f"Invalid grade type: {grade_type}")
+        """Select a grade type (Percentage, Letter, Points) through the fastest working route."""
+        self.navigator.switch(grade_type)
 
+    @measured("add_row")
     def add_row(self, task: str, grade: str, weight: int = 0, max_grade: int = None):
         """Utility method to add a row with task, grade, and weight data."""
         driver = self.driver
@@ -57,30 +60,27 @@ class TestGradeCalculator(unittest.TestCase):
         time.sleep(1)  # Wait for the row to be added
         self.fill_details(task, grade, weight, max_grade)
 
+    @measured("fill_details")
     def fill_details(self, task: str, grade: str, weight: int = 0, max_grade: int = None):
         """Fill in the details of the new row, handling different grade types."""
         driver = self.driver
         task_inputs = driver.find_elements(By.CSS_SELECTOR, "input[placeholder='e.g Assignment']")
-        task_inputs[-1].clear()
-        task_inputs[-1].send_keys(task)
+        enter_text(driver, task_inputs[-1], task)
 
         grade_elements = driver.find_elements(By.CSS_SELECTOR, "select[name*='rows'][name*='grade'], input[name*='rows'][name*='grade']")
         if grade_elements[-1].tag_name == 'select':
             # It's a dropdown for letter grades
-            grade_elements[-1].send_keys(grade)
+            select_letter(driver, grade_elements[-1], grade)
         else:
             # It's an input for percentage or points
-            grade_elements[-1].clear()
-            grade_elements[-1].send_keys(str(grade))
+            enter_text(driver, grade_elements[-1], str(grade))
 
         if max_grade is not None:
             max_grade_inputs = driver.find_elements(By.CSS_SELECTOR, "input[name*='rows'][name*='maxGrade']")
-            max_grade_inputs[-1].clear()
-            max_grade_inputs[-1].send_keys(str(max_grade))
+            enter_text(driver, max_grade_inputs[-1], str(max_grade))
         else:
             weight_inputs = driver.find_elements(By.CSS_SELECTOR, "input[name*='rows'][name*='weight']")
-            weight_inputs[-1].clear()
-            weight_inputs[-1].send_keys(str(weight))
+            enter_text(driver, weight_inputs[-1], str(weight))
 
     def test_percentage_grade_type(self):
         """Test add/reset/delete operations for Percentage grade type."""
@@ -103,9 +103,9 @@ class TestGradeCalculator(unittest.TestCase):
         try:
             form = driver.find_element(By.CSS_SELECTOR, "form.flex.flex-col.gap-2")
             initial_rows = len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row.gap-3.justify-start"))
-            logging.info(f"Initial rows count for {grade_type}: {initial_rows}")
+            logging.info("Initial rows count for %s: %s", grade_type, initial_rows)
         except Exception as e:
-            logging.error(f"Error counting initial rows for {grade_type}: {str(e)}")
+            logging.error("Error counting initial rows for %s: %s", grade_type, e)
             driver.save_screenshot(f"initial_rows_error_{grade_type.lower()}.png")
             raise
 
@@ -125,22 +125,23 @@ class TestGradeCalculator(unittest.TestCase):
         added_rows = len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row.gap-3.justify-start"))
         expected_rows = initial_rows + len(tasks)
         assert added_rows == expected_rows, f"Expected {expected_rows} rows but found {added_rows}"
-        logging.info(f"Rows after addition for {grade_type}: {added_rows}")
+        logging.info("Rows after addition for %s: %s", grade_type, added_rows)
 
-        # Click the "Reset/Clear" button to remove all rows
+        # Click the "Reset/Clear" button to remove all rows; only the click and the rows
+        # settling after it are measured
         reset_button = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable((By.XPATH, "//button[normalize-space()='Reset/Clear']"))
         )
-        reset_button.click()
+        with self.metrics.measure("reset"):
+            reset_button.click()
+            # Verify the rows are reset to the initial state
+            WebDriverWait(driver, 10).until(
+                lambda d: len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row.gap-3.justify-start")) == initial_rows
+            )
         time.sleep(1)
-
-        # Verify the rows are reset to the initial state
-        WebDriverWait(driver, 10).until(
-            lambda d: len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row.gap-3.justify-start")) == initial_rows
-        )
         cleared_rows = len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row.gap-3.justify-start"))
         assert cleared_rows == initial_rows, f"Expected {initial_rows} rows after reset for {grade_type} but got {cleared_rows}"
-        logging.info(f"Rows after reset for {grade_type}: {cleared_rows}")
+        logging.info("Rows after reset for %s: %s", grade_type, cleared_rows)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+"""Golden-master store of what the calculator displayed for each course scenario, per app version.
+
+Usage:
+    GOLDEN_VERSION=3f2a9c1b7d04 pytest test_all.py -k pairwise
+    python golden_master.py versions
+    python golden_master.py diff 3f2a9c1b7d04 8b1e0d27c5aa
+
+Each version is a directory of gzip-compressed JSON-lines runs. A recorder only ever
+adds new run files, each sorted by scenario hash, so a version can be read as a k-way
+merge of its runs in scenario order. Re-recorded scenarios resolve to their latest run.
+``diff`` merge-joins two versions the same way and holds one record per run in memory.
+"""
+import argparse
+import gzip
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import time
+
+from selenium.webdriver.common.by import By
+
+from result_display import displayed_result
+
+
+GOLDEN_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+
+def recording_version():
+    """App version to record under, from GOLDEN_VERSION; recording is off when it is unset."""
+    return os.environ.get("GOLDEN_VERSION")
+
+
+def scenario_key(grade_type: str, tasks) -> str:
+    """Stable hash of a scenario's inputs."""
+    canonical = json.dumps([grade_type, [list(task) for task in tasks]], separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:20]
+
+
+def displayed_state(driver):
+    """(displayed result text, per-row field values as the page shows them)."""
+    result = displayed_result(driver)
+    rows = [
+        [field.get_attribute("value") for field in row.find_elements(By.CSS_SELECTOR, "input, select")]
+        for row in driver.find_elements(By.CSS_SELECTOR, "form.flex.flex-col.gap-2 div.flex.flex-row")
+    ]
+    return result, rows
+
+
+class GoldenMasterStore:
+    def __init__(self, root: str = GOLDEN_ROOT):
+        self.root = root
+
+    def versions(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+
+    def runs(self, version: str):
+        directory = os.path.join(self.root, version)
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"No golden master recorded for version {version}")
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".jsonl.gz"))
+
+    @staticmethod
+    def read_run(path: str):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def scan(self, version: str):
+        """Records of a version in scenario order, one per scenario (the latest run wins)."""
+        def tagged(index, path):
+            for record in self.read_run(path):
+                yield record["scenario"], -index, record
+
+        runs = [tagged(index, path) for index, path in enumerate(self.runs(version))]
+        merged = heapq.merge(*runs, key=lambda item: item[:2])
+        for _, group in itertools.groupby(merged, key=lambda item: item[0]):
+            yield next(group)[2]
+
+
+class GoldenMasterRecorder:
+    """Buffers records and appends them to a version as sorted, compressed run files."""
+
+    def __init__(self, version: str, root: str = GOLDEN_ROOT, buffer_size: int = 10_000):
+        self.version = version
+        self.directory = os.path.join(root, version)
+        self.buffer_size = buffer_size
+        self.buffer = {}
+        os.makedirs(self.directory, exist_ok=True)
+
+    def record(self, grade_type: str, tasks, result, rows):
+        key = scenario_key(grade_type, tasks)
+        self.buffer[key] = {
+            "scenario": key, "grade_type": grade_type, "tasks": [list(task) for task in tasks],
+            "result": result, "rows": rows,
+        }
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+        return key
+
+    def flush(self):
+        if not self.buffer:
+            return None
+        # Nanosecond time first so run names sort in the order they were written; pid keeps workers apart
+        path = os.path.join(self.directory, f"run-{time.time_ns():020d}-{os.getpid()}.jsonl.gz")
+        with gzip.open(path + ".tmp", "wt", encoding="utf-8") as f:
+            for key in sorted(self.buffer):
+                f.write(json.dumps(self.buffer[key], separators=(",", ":")) + "\n")
+        os.replace(path + ".tmp", path)
+        self.buffer = {}
+        return path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+
+_recorder = None
+
+
+def session_recorder():
+    """The recorder for GOLDEN_VERSION shared by the tests of this process, or None."""
+    global _recorder
+    if _recorder is None and recording_version():
+        _recorder = GoldenMasterRecorder(recording_version())
+    return _recorder
+
+
+def flush_session_recorder():
+    if _recorder is not None:
+        _recorder.flush()
+
+
+def diff(store: GoldenMasterStore, old: str, new: str):
+    """Yield only the scenarios whose displayed result or rows differ between two versions."""
+    sentinel = {"scenario": None}
+    old_records, new_records = store.scan(old), store.scan(new)
+    before, after = next(old_records, sentinel), next(new_records, sentinel)
+    while before is not sentinel or after is not sentinel:
+        if after is sentinel or (before is not sentinel and before["scenario"] < after["scenario"]):
+            yield {"scenario": before["scenario"], "status": "removed", "old": before, "new": None}
+            before = next(old_records, sentinel)
+        elif before is sentinel or after["scenario"] < before["scenario"]:
+            yield {"scenario": after["scenario"], "status": "added", "old": None, "new": after}
+            after = next(new_records, sentinel)
+        else:
+            if (before["result"], before["rows"]) != (after["result"], after["rows"]):
+                yield {"scenario": after["scenario"], "status": "changed", "old": before, "new": after}
+            before, after = next(old_records, sentinel), next(new_records, sentinel)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Golden-master results per calculator version.")
+    parser.add_argument("--root", default=GOLDEN_ROOT)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("versions", help="list recorded versions")
+    diff_parser = commands.add_parser("diff", help="scenarios whose displayed result changed")
+    diff_parser.add_argument("old")
+    diff_parser.add_argument("new")
+    diff_parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    store = GoldenMasterStore(args.root)
+    if args.command == "versions":
+        for version in store.versions():
+            print(f"{version}  {len(store.runs(version))} runs")
+        return
+    changes = 0
+    for change in itertools.islice(diff(store, args.old, args.new), args.limit):
+        changes += 1
+        record = change["new"] or change["old"]
+        print(f"{change['status']:<8} {change['scenario']}  {record['grade_type']} {record['tasks']}")
+        if change["status"] == "changed":
+            print(f"    {change['old']['result']!r} -> {change['new']['result']!r}")
+    print(f"{changes} scenarios differ between {args.old} and {args.new}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import itertools
+import json
+import os
+import re
+
+
+# Reference letter scale: grade points used for Letter rows and the lowest percentage for each letter
+REFERENCE_SCALE = {
+    "A+": (4.3, 97), "A": (4.0, 93), "A-": (3.7, 90),
+    "B+": (3.3, 87), "B": (3.0, 83), "B-": (2.7, 80),
+    "C+": (2.3, 77), "C": (2.0, 73), "C-": (1.7, 70),
+    "D+": (1.3, 67), "D": (1.0, 63), "D-": (0.7, 60),
+    "F": (0.0, 0),
+}
+
+
+def load_letter_scale(path: str = None):
+    """The letter scale in a JSON file of ``{"A": [grade points, lowest percentage], ...}``, or the reference one."""
+    if not path:
+        return dict(REFERENCE_SCALE)
+    with open(path) as f:
+        return {letter: (float(points), float(minimum)) for letter, (points, minimum) in json.load(f).items()}
+
+
+# The calculator's scale is not published; LETTER_SCALE_FILE replaces the reference scale with it
+LETTER_SCALE = load_letter_scale(os.environ.get("LETTER_SCALE_FILE"))
+
+# Whether LETTER_SCALE is known to be the calculator's: given in LETTER_SCALE_FILE, or matched
+# against the grade points the page's letter options carry (see letter_select.build_index)
+scale_confirmed = bool(os.environ.get("LETTER_SCALE_FILE"))
+
+GRADE_TYPES = ("Percentage", "Letter", "Points")
+
+# The course result in the text the page shows next to the form: "85.25%" or "GPA: 3.06"
+PERCENTAGE_SHOWN = re.compile(r"(\d+(?:\.(\d+))?)\s*%")
+GPA_SHOWN = re.compile(r"GPA\D{0,20}?(\d+(?:\.(\d+))?)", re.IGNORECASE)
+
+
+def percentage_to_letter(percentage: float) -> str:
+    for letter, (_, minimum) in LETTER_SCALE.items():
+        if percentage >= minimum:
+            return letter
+    return "F"
+
+
+def gpa_to_letter(gpa: float) -> str:
+    """Closest letter on the reference scale to a grade point average."""
+    return min(LETTER_SCALE, key=lambda letter: abs(LETTER_SCALE[letter][0] - gpa))
+
+
+def row_contribution(grade_type: str, grade, weight=0, max_grade=None):
+    """(numerator, denominator) one row adds to a course's running sums."""
+    if grade is None or grade == "":
+        return 0.0, 0.0
+    if grade_type == "Points":
+        return float(grade), float(max_grade or 0)
+    if grade_type == "Letter":
+        if grade not in LETTER_SCALE:
+            raise ValueError(f"Invalid letter grade: {grade}")
+        grade = LETTER_SCALE[grade][0]
+    weight = float(weight or 0)
+    return float(grade) * weight, weight
+
+
+def result_from_sums(grade_type: str, weighted_sum: float, total_weight: float):
+    """Course result for the given running sums, or None while no row carries weight."""
+    if total_weight <= 0:
+        return None
+    if grade_type == "Letter":
+        gpa = weighted_sum / total_weight
+        return {"gpa": round(gpa, 2), "letter": gpa_to_letter(gpa)}
+    if grade_type == "Points":
+        percentage = weighted_sum / total_weight * 100
+    else:
+        percentage = weighted_sum / total_weight
+    return {"percentage": round(percentage, 2), "letter": percentage_to_letter(percentage)}
+
+
+def shown_result(grade_type: str, text: str):
+    """(value, decimals shown) of the course result in the page's result text, or None."""
+    match = (GPA_SHOWN if grade_type == "Letter" else PERCENTAGE_SHOWN).search(text or "")
+    if not match:
+        return None
+    return float(match.group(1)), len(match.group(2) or "")
+
+
+def matches_display(grade_type: str, expected, text: str) -> bool:
+    """Whether the page's result text shows ``expected`` (a ``GradeEngine.result()``) to the precision it displays."""
+    shown = shown_result(grade_type, text)
+    if expected is None:
+        return shown is None or shown[0] == 0
+    if shown is None:
+        return False
+    value, decimals = shown
+    expected_value = expected["gpa" if grade_type == "Letter" else "percentage"]
+    # Half a unit of the last digit shown, plus the engine's own rounding to two places
+    return abs(value - expected_value) <= 0.5 * 10 ** -decimals + 0.005
+
+
+class GradeEngine:
+    """Mirror of the calculator's row list that keeps the result current in O(1) per event.
+
+    Percentage rows contribute ``grade * weight``, Letter rows ``grade points * weight`` and
+    Points rows ``grade`` out of ``max_grade``. Only the running sums are touched when a row
+    is added, edited, deleted or the form is reset; rows without a grade count for nothing,
+    like the calculator's empty starting rows. Row ids are also kept in form order in a
+    list, so looking a row up by position is O(1); deleting a row other than the last
+    shifts the ones after it, as the form does.
+    """
+
+    def __init__(self, grade_type: str, initial_rows: int = 0):
+        if grade_type not in GRADE_TYPES:
+            raise ValueError(f"Invalid grade type: {grade_type}")
+        self.grade_type = grade_type
+        self.initial_rows = initial_rows
+        self._ids = itertools.count()
+        self.reset()
+
+    def reset(self):
+        """Back to the calculator's initial state: ``initial_rows`` empty rows."""
+        self.rows = {}
+        self.order = []
+        self.weighted_sum = 0.0
+        self.total_weight = 0.0
+        for _ in range(self.initial_rows):
+            row_id = next(self._ids)
+            self.rows[row_id] = None
+            self.order.append(row_id)
+
+    @property
+    def row_count(self) -> int:
+        return len(self.rows)
+
+    def _apply(self, contribution, sign: int):
+        numerator, denominator = contribution
+        self.weighted_sum += sign * numerator
+        self.total_weight += sign * denominator
+
+    def add(self, task: str = "", grade=None, weight: int = 0, max_grade: int = None) -> int:
+        """Append a row and return its id."""
+        row_id = next(self._ids)
+        contribution = row_contribution(self.grade_type, grade, weight, max_grade)
+        self.rows[row_id] = (task, grade, weight, max_grade, contribution)
+        self.order.append(row_id)
+        self._apply(contribution, 1)
+        return row_id
+
+    def edit(self, row_id: int, task: str = "", grade=None, weight: int = 0, max_grade: int = None):
+        """Replace the values of an existing row."""
+        if row_id not in self.rows:
+            raise KeyError(f"Unknown row: {row_id}")
+        old = self.rows[row_id]
+        if old is not None:
+            self._apply(old[4], -1)
+        contribution = row_contribution(self.grade_type, grade, weight, max_grade)
+        self.rows[row_id] = (task, grade, weight, max_grade, contribution)
+        self._apply(contribution, 1)
+
+    def _remove(self, row_id: int):
+        old = self.rows.pop(row_id)
+        if old is not None:
+            self._apply(old[4], -1)
+
+    def delete(self, row_id: int):
+        if row_id not in self.rows:
+            raise KeyError(f"Unknown row: {row_id}")
+        if self.order[-1] == row_id:
+            self.order.pop()
+        else:
+            self.order.remove(row_id)
+        self._remove(row_id)
+
+    def row_id_at(self, position: int) -> int:
+        """Id of the row shown at ``position`` in the form (negative positions count from the end)."""
+        return self.order[position]
+
+    def delete_at(self, position: int):
+        self._remove(self.order.pop(position))
+
+    def result(self):
+        """Current course result, or None while no row carries weight."""
+        return result_from_sums(self.grade_type, self.weighted_sum, self.total_weight)
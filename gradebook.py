@@ -0,0 +1,163 @@
+"""Compute per-student course results for whole gradebooks with the calculator's rules.
+
+Input is CSV (with a header) or JSONL, one task row per line with the fields
+``student``, ``course`` (optional), ``grade_type``, ``task``, ``grade``, ``weight`` and ``max_grade``,
+or a columnar ``.gbc`` file written by ``columnar.py``.
+
+CSV and JSONL files are split into byte ranges that workers reduce in parallel. Each
+worker holds one chunk at a time, but the per-(student, course) sums, in the workers and
+the merged result, grow with the number of students and courses in the file.
+
+Usage:
+    python gradebook.py department.csv --workers 8 --output results.csv
+"""
+import argparse
+import csv
+import io
+import json
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from columnar import ColumnarGradebook
+from grade_engine import GRADE_TYPES, row_contribution, result_from_sums
+
+
+CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def _line_end(data, position: int, size: int) -> int:
+    end = data.find(b"\n", position)
+    return size if end == -1 else end + 1
+
+
+def _row_end(data, start: int, position: int, size: int, quoted: bool = True) -> int:
+    """End of the row containing ``position``, for a ``start`` that begins a row.
+
+    A CSV field in quotes may span lines, so a newline only ends the row when the quotes
+    since ``start`` are balanced; escaped quotes (``""``) count twice and keep the parity.
+    """
+    end = _line_end(data, position, size)
+    if not quoted:
+        return end
+    quotes = data[start:end].count(b'"')
+    while quotes % 2 and end < size:
+        next_end = _line_end(data, end, size)
+        quotes += data[end:next_end].count(b'"')
+        end = next_end
+    return end
+
+
+def chunk_ranges(path: str, chunk_size: int = CHUNK_SIZE):
+    """Split the file into (start, end) byte ranges that begin and end on row boundaries.
+
+    The CSV header row is excluded from the ranges and returned separately.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return b"", []
+    quoted = not path.endswith(".jsonl")
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        header = b""
+        if quoted:
+            start = _row_end(data, 0, 0, size)
+            header = data[:start]
+        ranges = []
+        while start < size:
+            end = _row_end(data, start, min(start + chunk_size, size) - 1, size, quoted)
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+
+def _parse_rows(path: str, header: bytes, text: str):
+    if path.endswith(".jsonl"):
+        for line in text.splitlines():
+            if line.strip():
+                yield json.loads(line)
+    else:
+        fieldnames = next(csv.reader([header.decode("utf-8-sig")]))
+        yield from csv.DictReader(io.StringIO(text), fieldnames=fieldnames)
+
+
+def process_chunk(path: str, header: bytes, start: int, end: int):
+    """Reduce one byte range to partial sums: {(student, course): [grade_type, weighted, weight, rows]}.
+
+    Partial sums are additive, so a student whose rows span several chunks merges exactly.
+    """
+    totals = {}
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = data[start:end].decode("utf-8")
+    for row in _parse_rows(path, header, text):
+        grade_type = row["grade_type"]
+        if grade_type not in GRADE_TYPES:
+            raise ValueError(f"Invalid grade type for {row['student']}: {grade_type}")
+        numerator, denominator = row_contribution(grade_type, row.get("grade"), row.get("weight"), row.get("max_grade"))
+        key = (row["student"], row.get("course") or "")
+        entry = totals.setdefault(key, [grade_type, 0.0, 0.0, 0])
+        if entry[0] != grade_type:
+            raise ValueError(f"{key} mixes grade types {entry[0]} and {grade_type}")
+        entry[1] += numerator
+        entry[2] += denominator
+        entry[3] += 1
+    return totals
+
+
+def compute(path: str, workers: int = None, chunk_size: int = CHUNK_SIZE):
+    """Return ({(student, course): [grade_type, weighted, weight, rows]}, total rows)."""
+    if path.endswith(".gbc"):
+        with ColumnarGradebook(path) as table:
+            totals = table.student_totals()
+        return totals, sum(entry[3] for entry in totals.values())
+
+    header, ranges = chunk_ranges(path, chunk_size)
+    totals = {}
+    starts = [start for start, _ in ranges]
+    ends = [end for _, end in ranges]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial in pool.map(process_chunk, repeat(path), repeat(header), starts, ends):
+            for key, (grade_type, numerator, denominator, rows) in partial.items():
+                entry = totals.setdefault(key, [grade_type, 0.0, 0.0, 0])
+                if entry[0] != grade_type:
+                    raise ValueError(f"{key} mixes grade types {entry[0]} and {grade_type}")
+                entry[1] += numerator
+                entry[2] += denominator
+                entry[3] += rows
+    return totals, sum(entry[3] for entry in totals.values())
+
+
+def write_results(totals, output):
+    writer = csv.writer(output)
+    writer.writerow(["student", "course", "grade_type", "rows", "percentage", "gpa", "letter"])
+    for (student, course), (grade_type, numerator, denominator, rows) in sorted(totals.items()):
+        result = result_from_sums(grade_type, numerator, denominator) or {}
+        writer.writerow([student, course, grade_type, rows,
+                         result.get("percentage", ""), result.get("gpa", ""), result.get("letter", "")])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-student grades for CSV/JSONL gradebooks.")
+    parser.add_argument("gradebook")
+    parser.add_argument("--output", help="results CSV (default: stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="bytes per chunk")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    totals, rows = compute(args.gradebook, args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    if args.output:
+        with open(args.output, "w", newline="") as output:
+            write_results(totals, output)
+    else:
+        write_results(totals, sys.stdout)
+    print(f"{rows} rows, {len(totals)} students in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} rows/sec)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import logging
+import weakref
+
+import grade_engine
+from grade_engine import LETTER_SCALE
+from text_entry import SET_VALUE_SCRIPT
+
+
+# Every option of a Letter row's select as [text, value], and the document's time origin,
+# which is different on each page load
+READ_OPTIONS = """
+const select = arguments[0];
+return {page: performance.timeOrigin, options: [...select.options].map(option => [option.text.trim(), option.value])};
+"""
+
+# Sets the option's value as long as the page is still the one the index was read from
+SELECT_OPTION = "if (performance.timeOrigin !== arguments[2]) return false;\n" + SET_VALUE_SCRIPT + "return true;\n"
+
+# driver -> (page time origin, {letter: option value}); one entry per driver, replaced on reload
+_indexes = weakref.WeakKeyDictionary()
+
+
+def build_index(options):
+    """Map each letter on the reference scale to the value of its option.
+
+    An option matches a letter by its text or by its value. Raises ValueError when the
+    select is missing a letter of ``LETTER_SCALE`` or offers one that is not on it. When
+    the option values are grade points, they are checked against the scale's, which
+    confirms it for the result checks (``grade_engine.scale_confirmed``).
+    """
+    index, unknown = {}, []
+    for text, value in options:
+        if value == "":
+            continue  # the "Select" placeholder
+        if text in LETTER_SCALE:
+            index[text] = value
+        elif value in LETTER_SCALE:
+            index[value] = value
+        else:
+            unknown.append(text or value)
+    missing = [letter for letter in LETTER_SCALE if letter not in index]
+    if missing or unknown:
+        raise ValueError(f"Letter options do not match the reference scale: missing {missing}, unknown {unknown}")
+    points = {letter: _number(value) for letter, value in index.items()}
+    if None not in points.values():
+        differ = {letter: value for letter, value in points.items() if value != LETTER_SCALE[letter][0]}
+        if differ:
+            raise ValueError(f"The page's grade points differ from LETTER_SCALE: {differ}; set LETTER_SCALE_FILE")
+        grade_engine.scale_confirmed = True
+    return index
+
+
+def _number(value: str):
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def options_index(driver, element, refresh: bool = False):
+    """(page, index) for the page ``element`` is on, reading its options once per page load."""
+    if not refresh and driver in _indexes:
+        return _indexes[driver]
+    answer = driver.execute_script(READ_OPTIONS, element)
+    entry = answer["page"], build_index(answer["options"])
+    _indexes[driver] = entry
+    logging.info("Indexed %s letter options for page loaded at %s", len(entry[1]), entry[0])
+    return entry
+
+
+def select_letter(driver, element, letter: str):
+    """Select ``letter`` in a Letter row's grade select with one script call.
+
+    Sets the option's value directly and fires a single input and change event, instead
+    of typing into the select, where type-ahead makes "B" land on "B+".
+    """
+    if letter not in LETTER_SCALE:
+        raise ValueError(f"Invalid letter grade: {letter}")
+    page, index = options_index(driver, element)
+    if not driver.execute_script(SELECT_OPTION, element, index[letter], page):
+        # The page was reloaded since its options were read
+        page, index = options_index(driver, element, refresh=True)
+        driver.execute_script(SELECT_OPTION, element, index[letter], page)
+    return index[letter]
@@ -0,0 +1,202 @@
+"""In-memory structured logging for the suites.
+
+The tests log a line for every click and every row they fill. Writing each one to the
+console or a file as it happens costs the test that I/O. Here the root logger hands
+records to a queue. A listener thread keeps the most recent ones in a ring buffer, and
+they are written out as JSON lines only when a test fails or when asked.
+Like ``QueueHandler``, the handler formats the message when the record is handed over
+and drops its arguments and traceback object, so the buffer does not keep WebElements
+or rows alive; ``logging.info("... %s", value)`` still formats nothing for records below
+the logger's level.
+
+The handler sits next to pytest's log capture, which keeps working (``caplog``, the
+"Captured log" sections). ``-p no:logging`` skips that capture's formatting for a run
+that only needs the buffer.
+
+Per test, ``overhead`` counts records and the time spent in the handler, from the
+record reaching it to its hand-off to the queue. That leaves out what ``Logger.info``
+does before the handler (level check, caller lookup, record creation). ``record_cost``
+times that part once, and the summary adds it per record for the end-to-end cost.
+
+Usage:
+    LOG_BUFFER=50000 pytest test_all.py      # records kept in memory (default 10000)
+    LOG_BUFFER=0 pytest test_all.py          # log straight to the console as before
+    LOG_DUMP=1 pytest test_all.py            # also write every buffered record at the end
+"""
+import collections
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import time
+
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+
+
+def buffer_capacity() -> int:
+    """Records kept in memory, from LOG_BUFFER; 0 turns the buffer off."""
+    return int(os.environ.get("LOG_BUFFER", 10_000))
+
+
+def structured(record) -> dict:
+    """One record, as prepared by ``BufferedQueueHandler``, as a JSON-ready dict."""
+    entry = {
+        "time": record.created,
+        "level": record.levelname,
+        "logger": record.name,
+        "test": getattr(record, "test", None),
+        "thread": record.threadName,
+        "message": record.getMessage(),
+    }
+    if record.exc_text:
+        entry["exception"] = record.exc_text
+    return entry
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last ``capacity`` records as they are; older ones fall off the end."""
+
+    def __init__(self, capacity: int):
+        super().__init__()
+        self.records = collections.deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class BufferedQueueHandler(logging.handlers.QueueHandler):
+    """Tags each record with the running test and times the handler's share of the caller's cost."""
+
+    def __init__(self, log_queue, log_buffer):
+        super().__init__(log_queue)
+        self.log_buffer = log_buffer
+
+    def prepare(self, record):
+        # As QueueHandler.prepare does, but the traceback is kept apart from the message
+        # for ``structured``. The copy leaves the record as it is for the other handlers.
+        prepared = copy.copy(record)
+        prepared.msg = prepared.message = record.getMessage()
+        prepared.args = None
+        if record.exc_info:
+            prepared.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+        prepared.exc_info = None
+        prepared.test = self.log_buffer.test
+        return prepared
+
+    def handle(self, record):
+        start = time.perf_counter()
+        try:
+            return super().handle(record)
+        finally:
+            self.log_buffer.charge(time.perf_counter() - start)
+
+
+class LogBuffer:
+    """The root logger's ring buffer, with per-test record counts and logging overhead."""
+
+    def __init__(self, capacity: int = None):
+        self.capacity = capacity
+        self.test = None
+        self.overhead = {}
+        self.queue = None
+        self.ring = None
+        self.handler = None
+        self.listener = None
+        self._record_cost = None
+
+    @property
+    def installed(self) -> bool:
+        return self.handler is not None
+
+    def install(self, level=logging.INFO):
+        """Route the root logger through the buffer; the handler is added only once per process."""
+        logging.getLogger().setLevel(level)
+        if self.installed:
+            return self
+        capacity = self.capacity if self.capacity is not None else buffer_capacity()
+        if not capacity:
+            logging.basicConfig(level=level)
+            return self
+        self.queue = queue.Queue()
+        self.ring = RingBufferHandler(capacity)
+        self.handler = BufferedQueueHandler(self.queue, self)
+        self.listener = logging.handlers.QueueListener(self.queue, self.ring)
+        self.listener.start()
+        logging.getLogger().addHandler(self.handler)
+        return self
+
+    def uninstall(self):
+        if not self.installed:
+            return
+        logging.getLogger().removeHandler(self.handler)
+        self.listener.stop()
+        self.handler = self.listener = None
+
+    def start_test(self, test: str):
+        self.test = test
+        self.overhead[test] = {"records": 0, "handler_seconds": 0.0}
+
+    def end_test(self):
+        """Records logged after this, e.g. at session finish, belong to no test."""
+        self.test = None
+
+    def charge(self, seconds: float):
+        entry = self.overhead.get(self.test)
+        if entry is not None:
+            entry["records"] += 1
+            entry["handler_seconds"] += seconds
+
+    def record_cost(self, calls: int = 2000) -> float:
+        """Seconds a ``logging.info("... %s", value)`` call spends before its record reaches a handler.
+
+        Timed once, on a logger outside the logging hierarchy whose only handler is a
+        NullHandler, so nothing reaches the ring buffer.
+        """
+        if self._record_cost is None:
+            logger = logging.Logger("log_buffer.record_cost")
+            logger.addHandler(logging.NullHandler())
+            start = time.perf_counter()
+            for n in range(calls):
+                logger.info("Timing record %s of %s", n, calls)
+            self._record_cost = (time.perf_counter() - start) / calls
+        return self._record_cost
+
+    def test_seconds(self, test: str) -> float:
+        """A test's end-to-end logging time: measured handler time plus the calibrated cost per record."""
+        entry = self.overhead[test]
+        return entry["handler_seconds"] + entry["records"] * self.record_cost()
+
+    def records(self, test: str = None):
+        """Buffered records, oldest first, optionally only one test's."""
+        if self.ring is None:
+            return []
+        if self.installed:
+            self.queue.join()  # let the listener catch up with everything logged so far
+        return [record for record in list(self.ring.records) if test is None or record.test == test]
+
+    def dump(self, path: str, test: str = None) -> int:
+        """Write buffered records as JSON lines; returns how many were written."""
+        records = self.records(test)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            for record in records:
+                f.write(json.dumps(structured(record), default=str) + "\n")
+        return len(records)
+
+    def dump_test(self, test: str, root: str = LOG_DIR) -> str:
+        """Write one test's records to ``root``, named after its node id; returns the path."""
+        path = os.path.join(root, re.sub(r"[^\w.-]+", "_", test).strip("_") + ".jsonl")
+        self.dump(path, test)
+        return path
+
+
+buffer = LogBuffer()
+
+
+def install_logging(level=logging.INFO):
+    """What the suites' setUp calls instead of ``logging.basicConfig``."""
+    return buffer.install(level)
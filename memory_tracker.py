@@ -0,0 +1,101 @@
+import logging
+
+import psutil
+
+
+MB = 1024 * 1024
+JS_HEAP = "return window.performance.memory ? window.performance.memory.usedJSHeapSize : 0;"
+
+
+def session_flags(capabilities):
+    """Command-line flags that tell this session's browser apart from others on the same chromedriver."""
+    flags = set()
+    user_data_dir = capabilities.get("chrome", {}).get("userDataDir")
+    if user_data_dir:
+        flags.add(f"--user-data-dir={user_data_dir}")
+    address = capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+    if address:
+        flags.add(f"--remote-debugging-port={address.rsplit(':', 1)[-1]}")
+    return flags
+
+
+def browser_processes(driver):
+    """Return this session's Chrome processes: its browser process and everything it started.
+
+    chromedriver may be shared by several sessions (chrome_pool.SharedService), so the
+    browser is picked among its descendants by the flags in the session's capabilities.
+    """
+    try:
+        service = psutil.Process(driver.service.process.pid)
+        flags = session_flags(driver.capabilities)
+        for process in service.children(recursive=True):
+            cmdline = process.cmdline()
+            if flags & set(cmdline) and not any(arg.startswith("--type=") for arg in cmdline):
+                return [process] + process.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        pass
+    return []
+
+
+def sample_memory(driver):
+    """Sample browser RSS, renderer RSS and the page JS heap, all in bytes."""
+    browser_rss = 0
+    renderer_rss = 0
+    for process in browser_processes(driver):
+        try:
+            rss = process.memory_info().rss
+            cmdline = process.cmdline()
+        except psutil.Error:
+            continue
+        if "--type=renderer" in cmdline:
+            renderer_rss += rss
+        elif not any(arg.startswith("--type=") for arg in cmdline):
+            browser_rss += rss
+
+    try:
+        js_heap = driver.execute_script(JS_HEAP) or 0
+    except Exception:
+        js_heap = 0
+
+    return {"browser_rss": browser_rss, "renderer_rss": renderer_rss, "js_heap": int(js_heap)}
+
+
+class MemoryTracker:
+    """Per-test memory sampling for a long-lived browser session."""
+
+    def __init__(self, growth_threshold: int = 50 * MB, memory_budget: int = 1024 * MB):
+        self.growth_threshold = growth_threshold
+        self.memory_budget = memory_budget
+        self.results = {}
+
+    @staticmethod
+    def total(sample) -> int:
+        return sample["browser_rss"] + sample["renderer_rss"]
+
+    def record(self, test_id: str, before, after):
+        """Store the before/after samples of a test and flag excessive growth."""
+        growth = {key: after[key] - before[key] for key in after}
+        total_growth = self.total(after) - self.total(before)
+        leaked = total_growth > self.growth_threshold
+        result = {
+            "before": before,
+            "after": after,
+            "growth": growth,
+            "total_growth": total_growth,
+            "leak_suspected": leaked,
+        }
+        self.results[test_id] = result
+        if leaked:
+            logging.warning(
+                "Memory grew by %.1f MB during %s (threshold %.1f MB)",
+                total_growth / MB, test_id, self.growth_threshold / MB,
+            )
+        return result
+
+    def over_budget(self, sample) -> bool:
+        """Return True once the browser has crossed the memory budget and should be recycled."""
+        return self.total(sample) > self.memory_budget
+
+    def flagged(self):
+        """Return the ids of the tests whose growth exceeded the threshold."""
+        return [test_id for test_id, result in self.results.items() if result["leak_suspected"]]
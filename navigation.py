@@ -0,0 +1,164 @@
+import logging
+import os
+import statistics
+import time
+
+from selenium.webdriver.common.by import By
+from waits import AdaptiveWait as WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+
+# GRADECAL_URL points the suites at another copy of the app, e.g. a locally served snapshot
+BASE_URL = os.environ.get("GRADECAL_URL", "https://softekogradecalculator.netlify.app/calculator/grade-calculator")
+
+GRADE_TYPE_BUTTONS = {
+    "Percentage": (By.XPATH, "//button[contains(text(), 'Percentage')]"),
+    "Letter": (By.XPATH, "//button[contains(text(), 'Letter')]"),
+    "Points": (By.XPATH, "//button[contains(text(), 'Points')]")
+}
+
+ROUTES = ("click", "url", "tab")
+
+# Route timings and broken routes of this process, shared by every navigator so each test
+# builds on what the previous ones measured instead of starting over with the first route
+route_timings = {route: [] for route in ROUTES}
+broken_routes = set()
+
+
+def grade_type_url(grade_type: str, base_url: str = BASE_URL) -> str:
+    return f"{base_url}?type={grade_type.lower()}"
+
+
+def current_grade_type(driver):
+    """Detect the active grade type from the form fields it renders."""
+    if driver.find_elements(By.CSS_SELECTOR, "select[name*='rows'][name*='grade']"):
+        return "Letter"
+    if driver.find_elements(By.CSS_SELECTOR, "input[name*='rows'][name*='maxGrade']"):
+        return "Points"
+    if driver.find_elements(By.CSS_SELECTOR, "input[name*='rows'][name*='weight']"):
+        return "Percentage"
+    return None
+
+
+class GradeTypeNavigator:
+    """Switch grade type through the cheapest route that still lands on the right form.
+
+    Routes are an in-page click on the grade type button, loading ``?type=<grade type>``,
+    or switching to a tab already loaded for that grade type. Every route is tried once,
+    after which the fastest route by median time is used. Timings and broken routes are
+    shared by the navigators of a process (``route_timings``, ``broken_routes``) unless
+    given. A route that settles on the wrong grade type for ``settle`` seconds is dropped
+    for that grade type without waiting out the full timeout.
+
+    The "tab" route's timings are switches to a tab that is already open; opening and
+    loading a new tab is not timed, since every navigator starts with no tabs of its own.
+    ``close`` closes the tabs a navigator opened and returns to the tab it started on.
+    """
+
+    def __init__(self, driver, base_url: str = BASE_URL, timeout: int = 10, settle: float = 1.0,
+                 timings=None, broken=None):
+        self.driver = driver
+        self.base_url = base_url
+        self.timeout = timeout
+        self.settle = settle
+        self.timings = route_timings if timings is None else timings
+        self.broken = broken_routes if broken is None else broken
+        self.tabs = {}
+        self.origin = None
+        self.opened = []
+
+    def available_routes(self, grade_type: str, fresh: bool):
+        # Only a URL load guarantees a freshly loaded form; the others keep the page state
+        routes = ("url",) if fresh else ROUTES
+        return [route for route in routes if (route, grade_type) not in self.broken]
+
+    def choose_route(self, grade_type: str, fresh: bool = False) -> str:
+        routes = self.available_routes(grade_type, fresh)
+        if not routes:
+            raise RuntimeError(f"No route shows the {grade_type} form")
+        untried = [route for route in routes if not self.timings[route]]
+        if untried:
+            return untried[0]
+        return min(routes, key=lambda route: statistics.median(self.timings[route]))
+
+    def switch(self, grade_type: str, fresh: bool = False) -> str:
+        """Show the form for ``grade_type`` and return the route that was used."""
+        if grade_type not in GRADE_TYPE_BUTTONS:
+            raise ValueError(f"Invalid grade type: {grade_type}")
+
+        while True:
+            route = self.choose_route(grade_type, fresh)
+            start = time.perf_counter()
+            cold = getattr(self, f"_via_{route}")(grade_type)
+            if self._wait_for(grade_type):
+                if not cold:
+                    self.timings[route].append(time.perf_counter() - start)
+                logging.info("Selected grade type: %s via %s", grade_type, route)
+                return route
+            logging.warning("Route '%s' did not show the %s form, dropping it", route, grade_type)
+            self.broken.add((route, grade_type))
+
+    def _wait_for(self, grade_type: str) -> bool:
+        """Wait for the form of ``grade_type``; False once another grade type's form has stayed up ``settle`` seconds."""
+        wrong_since = None
+
+        def landed(driver):
+            nonlocal wrong_since
+            shown = current_grade_type(driver)
+            if shown == grade_type:
+                return "landed"
+            if shown is None:
+                wrong_since = None
+                return False
+            wrong_since = wrong_since or time.perf_counter()
+            return "wrong" if time.perf_counter() - wrong_since >= self.settle else False
+
+        try:
+            return WebDriverWait(self.driver, self.timeout).until(landed) == "landed"
+        except Exception:
+            return False
+
+    def _via_click(self, grade_type: str):
+        button = WebDriverWait(self.driver, self.timeout).until(
+            EC.element_to_be_clickable(GRADE_TYPE_BUTTONS[grade_type])
+        )
+        self.driver.execute_script("arguments[0].click();", button)
+        self._remember_tab(grade_type)
+
+    def _via_url(self, grade_type: str):
+        self.driver.get(grade_type_url(grade_type, self.base_url))
+        self._remember_tab(grade_type)
+
+    def _via_tab(self, grade_type: str) -> bool:
+        """Switch to the tab kept for ``grade_type``; True when it had to be opened first."""
+        handle = self.tabs.get(grade_type)
+        cold = handle not in self.driver.window_handles
+        if cold:
+            if self.origin is None:
+                self.origin = self.driver.current_window_handle
+            self.driver.switch_to.new_window("tab")
+            self.opened.append(self.driver.current_window_handle)
+            self.driver.get(grade_type_url(grade_type, self.base_url))
+            handle = self.driver.current_window_handle
+        self.driver.switch_to.window(handle)
+        self._remember_tab(grade_type)
+        return cold
+
+    def _remember_tab(self, grade_type: str):
+        # The current tab now shows grade_type, whatever it was cached for before
+        handle = self.driver.current_window_handle
+        self.tabs = {cached: tab for cached, tab in self.tabs.items() if tab != handle}
+        self.tabs[grade_type] = handle
+
+    def close(self):
+        """Close the tabs this navigator opened and switch back to the tab it started on."""
+        if not self.opened:
+            return
+        handles = self.driver.window_handles
+        for handle in self.opened:
+            if handle in handles:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+        self.opened = []
+        self.tabs = {}
+        self.driver.switch_to.window(self.origin)
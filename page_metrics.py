@@ -0,0 +1,135 @@
+import contextlib
+import functools
+import logging
+import os
+import time
+
+from timeline import timeline
+
+# DevTools Performance.getMetrics counters and durations worth diffing around an action
+METRICS = ("LayoutCount", "RecalcStyleCount", "LayoutDuration", "RecalcStyleDuration", "ScriptDuration", "TaskDuration")
+
+START_SCRIPT = """
+if (!window.__gcLongTasks) {
+    window.__gcLongTasks = [];
+    try {
+        new PerformanceObserver(list => {
+            for (const entry of list.getEntries()) {
+                window.__gcLongTasks.push({start: entry.startTime, duration: entry.duration});
+            }
+        }).observe({type: 'longtask', buffered: true});
+    } catch (e) {}
+}
+performance.mark(arguments[0] + ':start');
+return performance.now();
+"""
+
+END_SCRIPT = """
+const name = arguments[0], since = arguments[1];
+performance.mark(name + ':end');
+const measure = performance.measure(name, name + ':start', name + ':end');
+return {
+    duration: measure ? measure.duration : performance.now() - since,
+    longTasks: window.__gcLongTasks.filter(task => task.start >= since),
+    marks: performance.getEntriesByType('mark')
+        .filter(mark => mark.startTime >= since && !mark.name.startsWith(name + ':'))
+        .map(mark => ({name: mark.name, time: mark.startTime - since})),
+};
+"""
+
+# The browser is shared between tests; drop the previous test's user-timing entries
+CLEAR_SCRIPT = "performance.clearMarks(); performance.clearMeasures();"
+
+
+def metrics_enabled() -> bool:
+    """In-page metrics are collected when the PAGE_METRICS environment variable is set to 1."""
+    return os.environ.get("PAGE_METRICS") == "1"
+
+
+class PageMetrics:
+    """Browser-side cost of each helper action, kept apart from WebDriver transport time.
+
+    ``wall`` is what the harness waited for the action, ``page_time`` is the in-page
+    user-timing measure between the start and end marks and ``main_thread`` is the
+    DevTools TaskDuration delta. ``harness`` is ``wall - main_thread``: time spent in
+    WebDriver round trips, sleeps and polling rather than in the calculator itself.
+    """
+
+    def __init__(self, driver, enabled: bool = None):
+        self.driver = driver
+        self.enabled = metrics_enabled() if enabled is None else enabled
+        self.records = []
+        self._cdp_ready = False
+
+    def _devtools_metrics(self):
+        if not self._cdp_ready:
+            self.driver.execute_cdp_cmd("Performance.enable", {})
+            self._cdp_ready = True
+        metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        return {metric["name"]: metric["value"] for metric in metrics if metric["name"] in METRICS}
+
+    def clear(self):
+        """Remove this page's user-timing marks and measures; the suites call it in teardown."""
+        if not self.enabled:
+            return
+        try:
+            self.driver.execute_script(CLEAR_SCRIPT)
+        except Exception as e:
+            logging.warning("Could not clear page metrics: %s", e)
+
+    @contextlib.contextmanager
+    def measure(self, action: str):
+        """Record the in-page metrics of the wrapped helper call when metrics are enabled."""
+        if not self.enabled:
+            yield
+            return
+        try:
+            before = self._devtools_metrics()
+            since = self.driver.execute_script(START_SCRIPT, action)
+        except Exception as e:
+            logging.warning("Could not start page metrics for %s: %s", action, e)
+            yield
+            return
+
+        start = time.perf_counter()
+        yield
+        wall = time.perf_counter() - start
+
+        try:
+            page = self.driver.execute_script(END_SCRIPT, action, since)
+            after = self._devtools_metrics()
+        except Exception as e:
+            # The action may have navigated away, which drops the marks and DevTools counters
+            logging.warning("Could not finish page metrics for %s: %s", action, e)
+            return
+        deltas = {name: after.get(name, 0) - before.get(name, 0) for name in METRICS}
+        record = {
+            "action": action,
+            "wall": wall,
+            "page_time": page["duration"] / 1000,
+            "main_thread": deltas["TaskDuration"],
+            "harness": max(wall - deltas["TaskDuration"], 0.0),
+            "devtools": deltas,
+            "long_tasks": page["longTasks"],
+            "marks": page["marks"],
+        }
+        self.records.append(record)
+        logging.info(
+            "%s: %.0f ms wall, %.0f ms main thread, %.0f layouts, %s long tasks",
+            action, wall * 1000, deltas["TaskDuration"] * 1000, deltas["LayoutCount"], len(page["longTasks"]),
+        )
+
+
+def measured(action: str):
+    """Decorate a helper method so its calls are measured by ``self.metrics`` when present and show on the timeline."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = getattr(self, "metrics", None)
+            with timeline.span(action, "helper"):
+                if metrics is None:
+                    return method(self, *args, **kwargs)
+                with metrics.measure(action):
+                    return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
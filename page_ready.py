@@ -0,0 +1,146 @@
+import logging
+import time
+
+from selenium.webdriver.common.by import By
+from waits import AdaptiveWait as WebDriverWait
+
+
+# What setUp used to spend per test: up to 10 s waiting for Reset/Clear to be clickable,
+# then a fixed 1 s sleep after clicking it
+LEGACY_RESET_SLEEP = 1.0
+
+# The form's fields as a JSON string of [name, value] pairs, or null while there is no form
+FORM_STATE = """
+const form = document.querySelector("form.flex.flex-col.gap-2");
+return form ? JSON.stringify([...form.querySelectorAll("input, select")].map(field => [field.name, field.value])) : null;
+"""
+
+# Resolves once the page is loaded, the form is usable and no resource request has started
+# for ``quiet`` ms, with the form's state. It also waits for React to hydrate the form (its
+# buttons carry React props), but only for ``hydration`` ms: those props are React internals,
+# so past that the DOM check alone decides. The moment is kept in window.__gcReady.
+READY_SCRIPT = """
+const quiet = arguments[0], hydration = arguments[1], done = arguments[arguments.length - 1];
+const formState = () => { """ + FORM_STATE + """ };
+const addButton = () => [...document.querySelectorAll("button")].find(b => b.textContent.trim() === "+ Add new row");
+const usable = () => {
+    const add = addButton();
+    return add && !add.disabled && document.querySelector("form.flex.flex-col.gap-2 div.flex.flex-row");
+};
+const hydrated = () => Object.keys(addButton()).some(key => key.startsWith("__reactProps$"));
+const started = performance.now();
+let resources = -1, stableSince = 0;
+const check = () => {
+    const count = performance.getEntriesByType("resource").length;
+    const now = performance.now();
+    if (count !== resources) { resources = count; stableSince = now; }
+    if (document.readyState === "complete" && usable() && now - stableSince >= quiet) {
+        const react = hydrated();
+        if (react || now - started >= hydration) {
+            window.__gcReady = now;
+            return done({ready_at: now, state: formState(), hydrated: react});
+        }
+    }
+    requestAnimationFrame(check);
+};
+check();
+"""
+
+# URL -> the form's state right after the app's own Reset/Clear, the known-pristine form
+# later tests on that URL are compared against
+pristine_forms = {}
+
+
+class ReadinessReport:
+    """Per-test gate timings and the estimated time saved against the old speculative Reset/Clear."""
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, entry):
+        self.records.append(entry)
+
+    def reset_cost(self) -> float:
+        """Mean seconds a real Reset/Clear took (click until the form settled), 0 before the first one."""
+        resets = [entry["reset_seconds"] for entry in self.records if entry["reset"]]
+        return sum(resets) / len(resets) if resets else 0.0
+
+    def estimated_saving(self) -> float:
+        return sum(entry["estimated_saving"] for entry in self.records)
+
+    def reset(self):
+        self.records = []
+
+
+# The gates of the real-browser tests, summarized by conftest; unit tests pass their own report
+report = ReadinessReport()
+
+
+def wait_until_ready(driver, timeout: float = 10, quiet: float = 100, hydration: float = 3000):
+    """Block until the form is usable and the network is quiet; returns the page's answer.
+
+    The driver's script timeout is raised for the wait and put back afterwards.
+    """
+    previous = driver.timeouts.script
+    driver.set_script_timeout(timeout)
+    try:
+        return driver.execute_async_script(READY_SCRIPT, quiet, hydration)
+    finally:
+        driver.set_script_timeout(previous)
+
+
+def settled_state(driver, timeout: float = 10):
+    """The form's state once two polls in a row read the same one."""
+    last = None
+
+    def settled(d):
+        nonlocal last
+        state, last = last, d.execute_script(FORM_STATE)
+        return last if last is not None and last == state else None
+
+    return WebDriverWait(driver, timeout, label="form settled").until(settled)
+
+
+def ensure_initial_state(driver, timeout: float = 10, into: ReadinessReport = None):
+    """Gate a test on a ready page, resetting the form only if it differs from the known-pristine one.
+
+    The first gate on a URL has nothing to compare against, so it resets and keeps the
+    form the app's Reset/Clear leaves as that URL's entry in ``pristine_forms``. Returns
+    the gate's timings and records them in ``into`` (default: ``report``).
+    ``estimated_saving`` is only non-zero when the reset was skipped: the legacy sleep
+    plus what real resets cost in this report.
+    """
+    into = report if into is None else into
+    start = time.perf_counter()
+    ready = wait_until_ready(driver, timeout)
+    ready_time = time.perf_counter() - start
+    if not ready["hydrated"]:
+        logging.warning("React did not hydrate the form in time; the page-ready gate fell back to the DOM check")
+    url = driver.current_url
+    known = pristine_forms.get(url)
+    reset = known is None or ready["state"] != known
+    reset_seconds = 0.0
+    if reset:
+        reset_start = time.perf_counter()
+        driver.execute_script(
+            "arguments[0].click();", driver.find_element(By.XPATH, "//button[normalize-space()='Reset/Clear']")
+        )
+        if known is None:
+            pristine_forms[url] = settled_state(driver, timeout)
+        else:
+            WebDriverWait(driver, timeout, label="form pristine").until(lambda d: d.execute_script(FORM_STATE) == known)
+        reset_seconds = time.perf_counter() - reset_start
+    entry = {
+        "ready": ready_time,
+        "hydrated": ready["hydrated"],
+        "reset": reset,
+        "reset_seconds": reset_seconds,
+        "elapsed": time.perf_counter() - start,
+        "estimated_saving": 0.0 if reset else LEGACY_RESET_SLEEP + into.reset_cost(),
+    }
+    into.record(entry)
+    logging.info(
+        "Page ready after %.0f ms, %s; an estimated %.2fs saved against the speculative Reset/Clear",
+        ready_time * 1000, "reset needed" if reset else "already pristine", entry["estimated_saving"],
+    )
+    return entry
@@ -0,0 +1,167 @@
+import json
+import math
+import os
+import statistics
+import weakref
+
+from device_profiles import PROFILES
+from navigation import BASE_URL, grade_type_url
+
+
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_budgets.json")
+ACTIONS = ("add_row", "reset", "switch", "load")
+STATISTICS = ("min", "median", "mean", "p95", "max")
+
+# Shared in-page helpers; every timing is taken with performance.now() inside the page,
+# so WebDriver round trips are not part of the measured value.
+PAGE_HELPERS = """
+const form = () => document.querySelector("form.flex.flex-col.gap-2");
+const rowCount = () => { const f = form(); return f ? f.querySelectorAll("div.flex.flex-row").length : 0; };
+const button = text => [...document.querySelectorAll("button")].find(b => b.textContent.trim() === text);
+const buttonContaining = text => [...document.querySelectorAll("button")].find(b => b.textContent.includes(text));
+const gradeType = () => document.querySelector("select[name*='rows'][name*='grade']") ? "Letter"
+    : document.querySelector("input[name*='rows'][name*='maxGrade']") ? "Points"
+    : document.querySelector("input[name*='rows'][name*='weight']") ? "Percentage" : null;
+const timeUntil = (start, condition, done) => {
+    // Resolve on the first animation frame after the condition holds, i.e. once it rendered
+    const check = () => condition() ? requestAnimationFrame(() => done(performance.now() - start))
+                                    : requestAnimationFrame(check);
+    check();
+};
+const done = arguments[arguments.length - 1];
+"""
+
+# Registered before navigation so it records the moment the form first becomes interactive
+INTERACTIVE_PROBE = """
+(() => {
+    const ready = () => {
+        const add = [...document.querySelectorAll("button")].find(b => b.textContent.trim() === "+ Add new row");
+        return add && !add.disabled && document.querySelector("form.flex.flex-col.gap-2 div.flex.flex-row");
+    };
+    const observer = new MutationObserver(() => {
+        if (window.__gcInteractive === undefined && ready()) {
+            window.__gcInteractive = performance.now();
+            observer.disconnect();
+        }
+    });
+    observer.observe(document, {childList: true, subtree: true, attributes: true});
+})();
+"""
+
+# driver -> identifier of its registered INTERACTIVE_PROBE; the registration lasts as long as the browser
+_probes = weakref.WeakKeyDictionary()
+
+WAIT_INTERACTIVE = PAGE_HELPERS + """
+const check = () => window.__gcInteractive !== undefined ? done(window.__gcInteractive) : requestAnimationFrame(check);
+check();
+"""
+
+FILL_ROWS = PAGE_HELPERS + """
+const target = arguments[0];
+const step = () => {
+    const before = rowCount();
+    if (before >= target) return done(before);
+    button("+ Add new row").click();
+    const wait = () => rowCount() > before ? Promise.resolve().then(step) : requestAnimationFrame(wait);
+    wait();
+};
+step();
+"""
+
+ADD_ROW = PAGE_HELPERS + """
+const before = rowCount();
+const start = performance.now();
+button("+ Add new row").click();
+timeUntil(start, () => rowCount() > before, done);
+"""
+
+RESET = PAGE_HELPERS + """
+const initial = arguments[0];
+const start = performance.now();
+button("Reset/Clear").click();
+timeUntil(start, () => rowCount() <= initial, done);
+"""
+
+SWITCH = PAGE_HELPERS + """
+const target = arguments[0];
+const start = performance.now();
+buttonContaining(target).click();
+timeUntil(start, () => gradeType() === target, done);
+"""
+
+ROW_COUNT = "return document.querySelectorAll('form.flex.flex-col.gap-2 div.flex.flex-row').length;"
+
+
+def load_budgets(path: str = BUDGET_FILE):
+    """Load and validate the versioned budget file."""
+    with open(path) as f:
+        data = json.load(f)
+    for budget in data["budgets"]:
+        if budget["action"] not in ACTIONS:
+            raise ValueError(f"{budget['name']}: unknown action {budget['action']}")
+        if budget["statistic"] not in STATISTICS:
+            raise ValueError(f"{budget['name']}: unknown statistic {budget['statistic']}")
+        for profile in budget.get("profile_max_ms", {}):
+            if profile not in PROFILES:
+                raise ValueError(f"{budget['name']}: unknown device profile {profile}")
+    return data
+
+
+def max_ms(budget, profile: str = "baseline"):
+    """The budget's limit under a device profile; ``max_ms`` is the baseline one. None when unbudgeted."""
+    if profile == "baseline":
+        return budget["max_ms"]
+    return budget.get("profile_max_ms", {}).get(profile)
+
+
+def summarize(samples):
+    """Distribution of in-page timings in milliseconds; p95 uses the nearest-rank method."""
+    ordered = sorted(samples)
+    return {
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "p95": ordered[max(math.ceil(0.95 * len(ordered)) - 1, 0)],
+        "max": ordered[-1],
+        "samples": [round(sample, 2) for sample in samples],
+    }
+
+
+def install_probe(driver):
+    """Register ``INTERACTIVE_PROBE`` for every new document of ``driver``, once per driver."""
+    if driver not in _probes:
+        _probes[driver] = driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": INTERACTIVE_PROBE}
+        )["identifier"]
+    return _probes[driver]
+
+
+def measure(driver, budget, base_url: str = BASE_URL):
+    """Collect ``budget['samples']`` in-page timings (ms) of the budget's action."""
+    driver.set_script_timeout(60)
+    grade_type = budget["grade_type"]
+    url = grade_type_url(grade_type, base_url)
+    samples = []
+
+    install_probe(driver)
+    if budget["action"] == "load":
+        for _ in range(budget["samples"]):
+            driver.get(url)
+            samples.append(driver.execute_async_script(WAIT_INTERACTIVE))
+        return samples
+
+    driver.get(url)
+    driver.execute_async_script(WAIT_INTERACTIVE)
+    initial_rows = driver.execute_script(ROW_COUNT)
+    other_type = "Percentage" if grade_type != "Percentage" else "Letter"
+    for sample in range(budget["samples"]):
+        if budget["action"] == "switch":
+            target = grade_type if sample % 2 else other_type
+            samples.append(driver.execute_async_script(SWITCH, target))
+            continue
+        driver.execute_async_script(FILL_ROWS, budget["rows"])
+        if budget["action"] == "add_row":
+            samples.append(driver.execute_async_script(ADD_ROW))
+        else:
+            samples.append(driver.execute_async_script(RESET, initial_rows))
+    return samples
@@ -0,0 +1,224 @@
+"""Import pytest-html reports and JSON results into SQLite and query duration trends.
+
+Usage:
+    python perf_trends.py import report.html report_final.html results.json
+    python perf_trends.py trend "final.py::TestGradeCalculator::test_letter_grade_type"
+    python perf_trends.py slowest --limit 10
+    python perf_trends.py movers
+    python perf_trends.py regressions --ratio 1.5
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sqlite3
+import statistics
+from datetime import datetime
+
+
+DEFAULT_DB = "perf_trends.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    digest TEXT NOT NULL UNIQUE,
+    started_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test_id TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    PRIMARY KEY (test_id, run_id)
+);
+CREATE INDEX IF NOT EXISTS results_by_run ON results (run_id);
+"""
+
+
+# Databases from before runs were keyed by content had one run per report path
+MIGRATE_RUNS_BY_PATH = """
+CREATE TABLE runs_by_digest (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    digest TEXT NOT NULL UNIQUE,
+    started_at TEXT NOT NULL
+);
+INSERT INTO runs_by_digest (id, source, digest, started_at) SELECT id, source, 'path:' || source, started_at FROM runs;
+DROP TABLE runs;
+ALTER TABLE runs_by_digest RENAME TO runs;
+"""
+
+
+def connect(path: str = DEFAULT_DB):
+    connection = sqlite3.connect(path)
+    columns = [row[1] for row in connection.execute("PRAGMA table_info(runs)")]
+    if columns and "digest" not in columns:
+        connection.executescript(MIGRATE_RUNS_BY_PATH)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def report_digest(path: str) -> str:
+    """Content hash that identifies a run, so a report file overwritten by the next run is a new run."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_duration(text: str) -> float:
+    """Convert pytest-html durations ("00:00:16" or "250 ms") to seconds."""
+    text = text.strip()
+    if text.endswith("ms"):
+        return float(text[:-2]) / 1000
+    hours, minutes, seconds = text.split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def parse_html_report(path: str):
+    """Return (started_at, [(test_id, outcome, seconds)]) from a pytest-html 4 report."""
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    blob = re.search(r'data-jsonblob="([^"]*)"', content)
+    if blob is None:
+        raise ValueError(f"{path} is not a pytest-html report")
+    data = json.loads(html.unescape(blob.group(1)))
+
+    generated = re.search(r"Report generated on (\S+) at (\S+)", content)
+    if generated:
+        started_at = datetime.strptime(" ".join(generated.groups()), "%d-%b-%Y %H:%M:%S")
+    else:
+        started_at = datetime.fromtimestamp(os.path.getmtime(path))
+
+    results = []
+    for test_id, entries in data["tests"].items():
+        # A test can appear once per phase (e.g. a teardown error); keep the total time and worst outcome
+        outcome = entries[-1]["result"].lower()
+        for entry in entries:
+            if entry["result"].lower() not in ("passed", "skipped"):
+                outcome = entry["result"].lower()
+        results.append((test_id, outcome, sum(parse_duration(entry["duration"]) for entry in entries)))
+    return started_at.isoformat(), results
+
+
+def parse_json_report(path: str):
+    """Return (started_at, [(test_id, outcome, seconds)]) from a pytest-json-report file."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    started_at = datetime.fromtimestamp(data.get("created", os.path.getmtime(path)))
+    results = []
+    for test in data["tests"]:
+        duration = sum(test.get(phase, {}).get("duration", 0) for phase in ("setup", "call", "teardown"))
+        results.append((test["nodeid"], test["outcome"], duration))
+    return started_at.isoformat(), results
+
+
+def import_report(connection, path: str) -> int:
+    """Store one report as a run and return its test count.
+
+    Runs are keyed by the report's content: importing a report that is already stored
+    changes nothing, and a new report written to the same path adds a run next to the old one.
+    """
+    parser = parse_json_report if path.endswith(".json") else parse_html_report
+    started_at, results = parser(path)
+    digest = report_digest(path)
+    with connection:
+        if connection.execute("SELECT 1 FROM runs WHERE digest = ?", (digest,)).fetchone():
+            return len(results)
+        run_id = connection.execute(
+            "INSERT INTO runs (source, digest, started_at) VALUES (?, ?, ?)",
+            (os.path.abspath(path), digest, started_at),
+        ).lastrowid
+        connection.executemany(
+            "INSERT INTO results (run_id, test_id, outcome, duration) VALUES (?, ?, ?, ?)",
+            [(run_id, test_id, outcome, duration) for test_id, outcome, duration in results],
+        )
+    return len(results)
+
+
+def trend(connection, test_id: str):
+    """Duration history of one test, oldest run first."""
+    return connection.execute(
+        "SELECT runs.started_at, results.outcome, results.duration FROM results "
+        "JOIN runs ON runs.id = results.run_id WHERE results.test_id = ? ORDER BY runs.started_at",
+        (test_id,),
+    ).fetchall()
+
+
+def _histories(connection):
+    histories = {}
+    rows = connection.execute(
+        "SELECT results.test_id, results.duration FROM results "
+        "JOIN runs ON runs.id = results.run_id WHERE results.outcome = 'passed' ORDER BY runs.started_at"
+    )
+    for test_id, duration in rows:
+        histories.setdefault(test_id, []).append(duration)
+    return histories
+
+
+def slowest(connection, limit: int = 10):
+    """Tests with the highest median duration over their passing runs."""
+    medians = [(test_id, statistics.median(durations), len(durations))
+               for test_id, durations in _histories(connection).items()]
+    return sorted(medians, key=lambda row: row[1], reverse=True)[:limit]
+
+
+def movers(connection, limit: int = 10):
+    """Tests whose duration changed most between their last two passing runs."""
+    changes = [(test_id, durations[-2], durations[-1], durations[-1] - durations[-2])
+               for test_id, durations in _histories(connection).items() if len(durations) >= 2]
+    return sorted(changes, key=lambda row: abs(row[3]), reverse=True)[:limit]
+
+
+def regressions(connection, ratio: float = 1.5, min_delta: float = 1.0):
+    """Tests whose latest passing run is slower than the median of their earlier runs."""
+    found = []
+    for test_id, durations in _histories(connection).items():
+        if len(durations) < 2:
+            continue
+        baseline = statistics.median(durations[:-1])
+        latest = durations[-1]
+        if latest - baseline >= min_delta and latest >= baseline * ratio:
+            found.append((test_id, baseline, latest))
+    return sorted(found, key=lambda row: row[2] - row[1], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-test duration trends from past test reports.")
+    parser.add_argument("--db", default=DEFAULT_DB, help="SQLite database path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="import pytest-html or pytest-json-report files")
+    import_parser.add_argument("reports", nargs="+")
+    trend_parser = commands.add_parser("trend", help="duration history of one test")
+    trend_parser.add_argument("test_id")
+    for name in ("slowest", "movers"):
+        commands.add_parser(name).add_argument("--limit", type=int, default=10)
+    regressions_parser = commands.add_parser("regressions")
+    regressions_parser.add_argument("--ratio", type=float, default=1.5)
+    regressions_parser.add_argument("--min-delta", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    connection = connect(args.db)
+    if args.command == "import":
+        for report in args.reports:
+            print(f"{report}: {import_report(connection, report)} tests")
+    elif args.command == "trend":
+        for started_at, outcome, duration in trend(connection, args.test_id):
+            print(f"{started_at}  {outcome:<8} {duration:8.2f}s")
+    elif args.command == "slowest":
+        for test_id, median, runs in slowest(connection, args.limit):
+            print(f"{median:8.2f}s  ({runs} runs)  {test_id}")
+    elif args.command == "movers":
+        for test_id, previous, latest, delta in movers(connection, args.limit):
+            print(f"{delta:+8.2f}s  {previous:.2f}s -> {latest:.2f}s  {test_id}")
+    else:
+        for test_id, baseline, latest in regressions(connection, args.ratio, args.min_delta):
+            print(f"{baseline:.2f}s -> {latest:.2f}s  {test_id}")
+
+
+if __name__ == "__main__":
+    main()
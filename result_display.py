@@ -0,0 +1,63 @@
+"""The course result the calculator shows next to the form, checked against ``GradeEngine``.
+
+Percentage and Points results do not depend on the letter scale. Letter results are
+GPAs over ``LETTER_SCALE``'s grade points, so they are only asserted once the scale is
+confirmed to be the calculator's (see ``grade_engine.scale_confirmed``); until then
+the suites log the GPA the page shows and move on.
+"""
+import logging
+
+from selenium.common.exceptions import TimeoutException
+
+import grade_engine
+from grade_engine import matches_display
+from waits import AdaptiveWait as WebDriverWait
+
+
+# Seconds the page gets to show a new result after a row is added, deleted or reset
+RESULT_TIMEOUT = 10
+
+# Text the page shows outside the row form (course result, letter, summaries), whitespace-normalized
+DISPLAYED_RESULT = """
+const form = document.querySelector("form.flex.flex-col.gap-2");
+const root = document.querySelector("main") || document.body;
+const clone = root.cloneNode(true);
+const formInClone = clone.querySelector("form.flex.flex-col.gap-2");
+if (formInClone) formInClone.remove();
+clone.querySelectorAll("button, script, style").forEach(node => node.remove());
+return clone.textContent.replace(/\\s+/g, " ").trim();
+"""
+
+
+def displayed_result(driver) -> str:
+    return driver.execute_script(DISPLAYED_RESULT)
+
+
+def checks_result(grade_type: str) -> bool:
+    """Whether results of this grade type are asserted: Letter ones only on a confirmed scale."""
+    return grade_type != "Letter" or grade_engine.scale_confirmed
+
+
+def shows_result(driver, grade_type: str, expected) -> bool:
+    """Wait condition: the page shows ``expected``, or the result is not checked for this grade type."""
+    return not checks_result(grade_type) or matches_display(grade_type, expected, displayed_result(driver))
+
+
+def expect_result(driver, engine, timeout: float = None) -> str:
+    """Wait until the page displays the result ``engine`` expects; returns the text it shows.
+
+    Raises AssertionError with the displayed text when the page does not catch up in time.
+    """
+    expected = engine.result()
+    if not checks_result(engine.grade_type):
+        logging.debug("Letter scale not confirmed, not checking %s against the page", expected)
+        return displayed_result(driver)
+    try:
+        WebDriverWait(driver, timeout or RESULT_TIMEOUT).until(
+            lambda d: matches_display(engine.grade_type, expected, displayed_result(d))
+        )
+    except TimeoutException:
+        raise AssertionError(
+            f"Expected {expected} for {engine.grade_type}, the page shows {displayed_result(driver)!r}"
+        ) from None
+    return displayed_result(driver)
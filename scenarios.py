@@ -0,0 +1,144 @@
+import argparse
+import itertools
+import logging
+
+from columnar import ColumnarGradebook
+from grade_engine import LETTER_SCALE, GRADE_TYPES
+
+
+TASK_NAMES = ("Quiz", "Final exam, part 2 (take-home)", "Übung 3")
+WEIGHTS = (0, 1, 50, 99, 100)
+
+# Values per row parameter for each grade type: every letter, and the boundaries of each numeric range
+PARAMETER_SPACE = {
+    "Percentage": {"task": TASK_NAMES, "grade": (0, 59, 60, 89.5, 100), "weight": WEIGHTS},
+    "Letter": {"task": TASK_NAMES, "grade": tuple(LETTER_SCALE), "weight": WEIGHTS},
+    "Points": {"task": TASK_NAMES, "grade": (0, 1, 10, 100), "max_grade": (1, 10, 100, 1000)},
+}
+
+# Rows the calculator should never be given; interactions that only occur in them need no coverage
+CONSTRAINTS = {
+    "Points": lambda row: row["grade"] <= row["max_grade"],
+}
+
+
+def full_space(grade_type: str):
+    """Every valid row for the grade type, as dicts of parameter -> value."""
+    parameters = PARAMETER_SPACE[grade_type]
+    valid = CONSTRAINTS.get(grade_type, lambda row: True)
+    rows = (dict(zip(parameters, values)) for values in itertools.product(*parameters.values()))
+    return [row for row in rows if valid(row)]
+
+
+def interactions(row, strength: int = 2):
+    """The t-way (parameter, value) combinations a row exercises."""
+    return set(itertools.combinations(sorted(row.items()), strength))
+
+
+def covering_set(grade_type: str, strength: int = 2):
+    """Greedy t-wise covering set: rows from ``full_space`` until every interaction is covered.
+
+    Each step takes the row covering the most still-uncovered interactions (first one on a
+    tie, so the result is deterministic). The spaces here have a few hundred rows at most,
+    which keeps scanning the whole space cheap.
+    """
+    space = full_space(grade_type)
+    candidates = [(row, interactions(row, strength)) for row in space]
+    uncovered = set().union(*(covered for _, covered in candidates))
+    chosen = []
+    while uncovered:
+        row, covered = max(candidates, key=lambda candidate: len(candidate[1] & uncovered))
+        chosen.append(row)
+        uncovered -= covered
+    logging.info("%s: %s rows cover all %s-way interactions of %s", grade_type, len(chosen), strength, len(space))
+    return chosen
+
+
+def as_task(grade_type: str, row):
+    """Row dict as the (task, grade, weight or max_grade) tuple the row helpers take."""
+    return row["task"], row["grade"], row["max_grade" if grade_type == "Points" else "weight"]
+
+
+def scenario_plan(strength: int = 2, rows_per_session: int = 10, grade_types=GRADE_TYPES):
+    """Split each grade type's covering set into browser sessions of at most ``rows_per_session`` rows."""
+    plan = []
+    for grade_type in grade_types:
+        rows = covering_set(grade_type, strength)
+        for start in range(0, len(rows), rows_per_session):
+            plan.append((grade_type, [as_task(grade_type, row) for row in rows[start:start + rows_per_session]]))
+    return plan
+
+
+def gradebook_plan(path: str, rows_per_session: int = 10):
+    """Sessions replaying a columnar gradebook (``.gbc``): each student's rows in a course, split like ``scenario_plan``."""
+    plan = []
+    with ColumnarGradebook(path) as table:
+        for _, _, grade_type, rows in table.scenarios():
+            for start in range(0, len(rows), rows_per_session):
+                plan.append((grade_type, rows[start:start + rows_per_session]))
+    return plan
+
+
+def session_ids(plan):
+    """Readable test ids for a plan, e.g. ``Letter-2``."""
+    counts = {}
+    ids = []
+    for grade_type, _ in plan:
+        counts[grade_type] = counts.get(grade_type, 0) + 1
+        ids.append(f"{grade_type}-{counts[grade_type]}")
+    return ids
+
+
+class CoverageReport:
+    """Interactions covered by the sessions that ran, against the browser time they took."""
+
+    def __init__(self, strength: int = 2):
+        self.strength = strength
+        self.covered = {grade_type: set() for grade_type in GRADE_TYPES}
+        self.seconds = 0.0
+        self.sessions = 0
+
+    def record(self, grade_type: str, tasks, seconds: float):
+        parameters = list(PARAMETER_SPACE[grade_type])
+        for task in tasks:
+            self.covered[grade_type] |= interactions(dict(zip(parameters, task)), self.strength)
+        self.seconds += seconds
+        self.sessions += 1
+
+    def summary(self):
+        total = covered = 0
+        for grade_type in GRADE_TYPES:
+            space = set().union(*(interactions(row, self.strength) for row in full_space(grade_type)))
+            total += len(space)
+            covered += len(self.covered[grade_type] & space)
+        return {
+            "strength": self.strength,
+            "sessions": self.sessions,
+            "covered": covered,
+            "total": total,
+            "coverage": covered / total if total else 0.0,
+            "browser_seconds": round(self.seconds, 2),
+            "interactions_per_browser_second": covered / self.seconds if self.seconds else 0.0,
+        }
+
+
+coverage = CoverageReport()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the t-wise scenario plan against the exhaustive one.")
+    parser.add_argument("--strength", type=int, default=2)
+    parser.add_argument("--rows-per-session", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    plan = scenario_plan(args.strength, args.rows_per_session)
+    exhaustive = sum(len(full_space(grade_type)) for grade_type in GRADE_TYPES)
+    reduced = sum(len(tasks) for _, tasks in plan)
+    print(f"{args.strength}-way: {reduced} rows in {len(plan)} sessions instead of {exhaustive} rows "
+          f"({-(-exhaustive // args.rows_per_session)} sessions)")
+    for name, (_, tasks) in zip(session_ids(plan), plan):
+        print(f"  {name}: {tasks}")
+
+
+if __name__ == "__main__":
+    main()
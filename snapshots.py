@@ -0,0 +1,224 @@
+"""Capture the calculator into version-pinned, content-addressed snapshots and serve them locally.
+
+Usage:
+    python snapshots.py capture --label prod-2024-06
+    python snapshots.py list
+    python snapshots.py serve 3f2a9c1b7d04 --port 8000
+    GRADECAL_URL=http://127.0.0.1:8000/calculator/grade-calculator pytest final.py
+
+Every file is stored once under ``objects/`` by its SHA-256; a snapshot is a manifest of
+URL path -> object, and its version is the hash of that manifest, so the same app always
+gets the same version and a version can never change under the suites.
+"""
+import argparse
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import threading
+import urllib.parse
+import urllib.request
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from navigation import BASE_URL
+
+
+SNAPSHOT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots")
+ASSET_EXTENSIONS = (".js", ".css", ".json", ".woff", ".woff2", ".ttf", ".svg", ".png", ".ico", ".webp")
+# Quoted same-origin paths inside JS and CSS, e.g. lazily loaded chunks and url(...) fonts
+ASSET_REFERENCE = re.compile(r"""["'(](/[\w\-./~%@]+?(?:""" + "|".join(
+    re.escape(extension) for extension in ASSET_EXTENSIONS) + r"""))(?:\?[^"')]*)?["')]""")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+class _AssetLinks(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script" and attrs.get("src"):
+            self.links.append(attrs["src"])
+        elif tag == "link" and attrs.get("href"):
+            self.links.append(attrs["href"])
+        elif tag == "img" and attrs.get("src"):
+            self.links.append(attrs["src"])
+
+
+def asset_links(content: bytes, content_type: str, page_url: str):
+    """Same-origin absolute URLs referenced by an HTML page, a script or a stylesheet."""
+    text = content.decode("utf-8", errors="replace")
+    if "html" in content_type:
+        parser = _AssetLinks()
+        parser.feed(text)
+        candidates = parser.links + ASSET_REFERENCE.findall(text)
+    else:
+        candidates = ASSET_REFERENCE.findall(text)
+    origin = urllib.parse.urlsplit(page_url)
+    links = []
+    for candidate in candidates:
+        url = urllib.parse.urljoin(page_url, candidate)
+        parts = urllib.parse.urlsplit(url)
+        if (parts.scheme, parts.netloc) == (origin.scheme, origin.netloc):
+            links.append(urllib.parse.urlunsplit((parts.scheme, parts.netloc, parts.path, parts.query, "")))
+    return links
+
+
+def fetch(url: str):
+    with urllib.request.urlopen(url, timeout=30) as response:
+        content_type = response.headers.get("Content-Type") or mimetypes.guess_type(url)[0] or "application/octet-stream"
+        return response.read(), content_type
+
+
+class SnapshotStore:
+    """``objects/<sha256>`` blobs plus ``versions/<version>.json`` manifests under one root."""
+
+    def __init__(self, root: str = SNAPSHOT_ROOT):
+        self.root = root
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(root, "versions"), exist_ok=True)
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    def put(self, content: bytes) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(content)
+            os.replace(path + ".tmp", path)
+        return digest
+
+    def read(self, digest: str) -> bytes:
+        with open(self.object_path(digest), "rb") as f:
+            return f.read()
+
+    def capture(self, url: str = BASE_URL, label: str = None, fetcher=fetch) -> str:
+        """Download the page and every same-origin asset it pulls in; return the snapshot version."""
+        files = {}
+        queue = [url]
+        seen = set()
+        while queue:
+            current = queue.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            content, content_type = fetcher(current)
+            path = urllib.parse.urlsplit(current).path or "/"
+            files[path] = {"sha256": self.put(content), "content_type": content_type, "size": len(content)}
+            if "html" in content_type or path.endswith((".js", ".css")):
+                queue.extend(link for link in asset_links(content, content_type, current) if link not in seen)
+
+        manifest = {"source": url, "entry": urllib.parse.urlsplit(url).path or "/", "files": dict(sorted(files.items()))}
+        version = hashlib.sha256(json.dumps(manifest, sort_keys=True).encode()).hexdigest()[:12]
+        path = os.path.join(self.root, "versions", f"{version}.json")
+        if label is None and os.path.exists(path):
+            label = self.manifest(version)["label"]
+        manifest.update(version=version, label=label)
+        with open(path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        return version
+
+    def manifest(self, version: str):
+        with open(os.path.join(self.root, "versions", f"{version}.json")) as f:
+            return json.load(f)
+
+    def versions(self):
+        """(version, label, source, file count) of every stored snapshot."""
+        found = []
+        for name in sorted(os.listdir(os.path.join(self.root, "versions"))):
+            if name.endswith(".json"):
+                manifest = self.manifest(name[:-5])
+                found.append((manifest["version"], manifest["label"], manifest["source"], len(manifest["files"])))
+        return found
+
+
+def cache_control(path: str, content_type: str) -> str:
+    """Long-lived immutable caching for hashed build assets, revalidation for pages."""
+    if "html" in content_type or not posixpath.splitext(path)[1]:
+        return REVALIDATE
+    return IMMUTABLE
+
+
+def make_handler(store: SnapshotStore, manifest):
+    files = manifest["files"]
+
+    class SnapshotHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_HEAD(self):
+            self.do_GET(body=False)
+
+        def do_GET(self, body: bool = True):
+            path = urllib.parse.urlsplit(self.path).path
+            entry = files.get(path) or files.get(path.rstrip("/")) or files.get(posixpath.join(path, "index.html"))
+            if entry is None:
+                self.send_error(404)
+                return
+            etag = f'"{entry["sha256"]}"'
+            if etag in self.headers.get("If-None-Match", ""):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", cache_control(path, entry["content_type"]))
+                self.end_headers()
+                return
+            content = store.read(entry["sha256"])
+            self.send_response(200)
+            self.send_header("Content-Type", entry["content_type"])
+            self.send_header("Content-Length", str(len(content)))
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache_control(path, entry["content_type"]))
+            self.end_headers()
+            if body:
+                self.wfile.write(content)
+
+    return SnapshotHandler
+
+
+def serve(version: str, root: str = SNAPSHOT_ROOT, host: str = "127.0.0.1", port: int = 0):
+    """Serve a snapshot from a background thread; returns (server, URL of the captured page)."""
+    store = SnapshotStore(root)
+    manifest = store.manifest(version)
+    server = ThreadingHTTPServer((host, port), make_handler(store, manifest))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}{manifest['entry']}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Version-pinned offline snapshots of the calculator.")
+    parser.add_argument("--root", default=SNAPSHOT_ROOT)
+    commands = parser.add_subparsers(dest="command", required=True)
+    capture_parser = commands.add_parser("capture", help="download the app into a new snapshot")
+    capture_parser.add_argument("--url", default=BASE_URL)
+    capture_parser.add_argument("--label")
+    commands.add_parser("list", help="list stored snapshots")
+    serve_parser = commands.add_parser("serve", help="serve one snapshot until interrupted")
+    serve_parser.add_argument("version")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    if args.command == "capture":
+        print(SnapshotStore(args.root).capture(args.url, args.label))
+    elif args.command == "list":
+        for version, label, source, count in SnapshotStore(args.root).versions():
+            print(f"{version}  {label or '-':<20} {count:4} files  {source}")
+    else:
+        server, url = serve(args.version, args.root, args.host, args.port)
+        print(f"Serving {args.version} at {url} (GRADECAL_URL={url})")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+import statistics
+
+import websocket
+
+from chrome_pool import page_websocket_url
+from perf_budgets import PAGE_HELPERS
+
+
+def soak_cycles() -> int:
+    """Cycles per grade type in soak mode, from SOAK_CYCLES; 0 (the default) skips the soak tests."""
+    return int(os.environ.get("SOAK_CYCLES", 0))
+
+
+def sample_every() -> int:
+    return int(os.environ.get("SOAK_SAMPLE_EVERY", 50))
+
+
+# One add/delete/reset cycle, timed in the page: add ``rows`` rows, delete the last one, reset
+CYCLE = PAGE_HELPERS + """
+const rows = arguments[0], initial = arguments[1];
+const start = performance.now();
+const waitFor = (condition, next) => { const check = () => condition() ? next() : requestAnimationFrame(check); check(); };
+let added = 0;
+const resetAll = () => {
+    button("Reset/Clear").click();
+    waitFor(() => rowCount() <= initial, () => done(performance.now() - start));
+};
+const deleteLast = () => {
+    const before = rowCount();
+    form().querySelectorAll("div.flex.flex-row")[before - 1].querySelector("button").click();
+    waitFor(() => rowCount() < before, resetAll);
+};
+const addNext = () => {
+    if (added === rows) return deleteLast();
+    const before = rowCount();
+    button("+ Add new row").click();
+    added++;
+    waitFor(() => rowCount() > before, addNext);
+};
+addNext();
+"""
+
+
+def sample_page(driver):
+    """JS heap in use (after a forced GC) and live DOM nodes / event listeners of the page."""
+    driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+    heap = driver.execute_cdp_cmd("Runtime.getHeapUsage", {})
+    counters = driver.execute_cdp_cmd("Memory.getDOMCounters", {})
+    return {"js_heap": heap["usedSize"], "dom_nodes": counters["nodes"], "listeners": counters["jsEventListeners"]}
+
+
+def fit_trend(xs, ys):
+    """Least-squares slope of ys over xs and how well a straight line explains them (r squared)."""
+    if len(xs) < 3 or len(set(ys)) < 2:
+        return 0.0, 0.0
+    slope, _ = statistics.linear_regression(xs, ys)
+    return slope, statistics.correlation(xs, ys) ** 2
+
+
+def save_heap_snapshot(driver, path: str) -> str:
+    """Write a .heapsnapshot of the current page, loadable in the DevTools Memory panel.
+
+    The snapshot arrives as a stream of DevTools events, which ``execute_cdp_cmd`` cannot
+    receive, so it is taken over the browser's own DevTools websocket.
+    """
+    connection = websocket.create_connection(page_websocket_url(driver), timeout=300)
+    try:
+        connection.send(json.dumps({"id": 1, "method": "HeapProfiler.takeHeapSnapshot", "params": {"reportProgress": False}}))
+        with open(path, "w") as f:
+            while True:
+                message = json.loads(connection.recv())
+                if message.get("method") == "HeapProfiler.addHeapSnapshotChunk":
+                    f.write(message["params"]["chunk"])
+                elif message.get("id") == 1:
+                    break
+    finally:
+        connection.close()
+    return path
+
+
+class SoakMonitor:
+    """Samples taken during a soak run and the growth trends fitted to them.
+
+    Memory is sampled every ``sample_every`` cycles and latency is recorded for every
+    cycle. The first ``warmup`` cycles are left out of the fits, while caches and JIT
+    settle. A metric "keeps climbing" when its fitted slope per cycle is over the limit
+    and a straight line explains at least ``min_r2`` of its variance. That way a single
+    GC spike or slow cycle does not fail the run.
+    """
+
+    LIMITS = {"js_heap": 2048, "dom_nodes": 0.5, "listeners": 0.1, "latency_ms": 0.01}
+
+    def __init__(self, sample_every: int = 50, warmup: int = 100, min_r2: float = 0.6, limits=None):
+        self.sample_every = sample_every
+        self.warmup = warmup
+        self.min_r2 = min_r2
+        self.limits = dict(self.LIMITS, **(limits or {}))
+        self.samples = []
+        self.latencies = []
+
+    def record_cycle(self, cycle: int, latency_ms: float):
+        self.latencies.append((cycle, latency_ms))
+
+    def due(self, cycle: int) -> bool:
+        return cycle % self.sample_every == 0
+
+    def record_sample(self, cycle: int, sample):
+        self.samples.append(dict(sample, cycle=cycle))
+        logging.info(
+            "Cycle %s: heap %.0f KB, %s DOM nodes, %s listeners",
+            cycle, sample["js_heap"] / 1024, sample["dom_nodes"], sample["listeners"],
+        )
+
+    def trends(self):
+        """{metric: (slope per cycle, r squared)} over the cycles after warm-up."""
+        samples = [sample for sample in self.samples if sample["cycle"] >= self.warmup]
+        latencies = [(cycle, ms) for cycle, ms in self.latencies if cycle >= self.warmup]
+        trends = {
+            metric: fit_trend([sample["cycle"] for sample in samples], [sample[metric] for sample in samples])
+            for metric in ("js_heap", "dom_nodes", "listeners")
+        }
+        trends["latency_ms"] = fit_trend([cycle for cycle, _ in latencies], [ms for _, ms in latencies])
+        return trends
+
+    def climbing(self):
+        """Metrics whose growth per cycle is over the limit and consistent enough to be a trend."""
+        return {
+            metric: (slope, r2) for metric, (slope, r2) in self.trends().items()
+            if slope > self.limits[metric] and r2 >= self.min_r2
+        }
+
+    def leaking(self) -> bool:
+        return any(metric != "latency_ms" for metric in self.climbing())
@@ -0,0 +1,137 @@
+import contextlib
+import logging
+import time
+
+from selenium.common.exceptions import (
+    NoSuchElementException, StaleElementReferenceException, TimeoutException, WebDriverException,
+)
+
+from timeline import timeline
+from waits import condition_label, telemetry
+
+
+# Setting location returns at once, unlike driver.get, so all tabs load in parallel
+NAVIGATE = "window.location.href = arguments[0];"
+
+
+class Wait:
+    """Yielded by a tab flow: resume the flow once ``condition(driver)`` is truthy."""
+
+    def __init__(self, condition, timeout: float = 10, label: str = None):
+        self.condition = condition
+        self.timeout = timeout
+        self.label = label or condition_label(condition)
+
+
+class TabScheduler:
+    """Run several flows in their own tabs of one browser, interleaving their commands.
+
+    A flow is a generator that drives the current tab and yields a ``Wait`` whenever
+    the page has to catch up (a row rendering, a form loading). The scheduler then moves
+    on to the next tab and only checks that condition once per round, so while one tab
+    renders the others keep receiving commands. WebDriver still sends one command at a
+    time; the overlap comes from the page work that happens between them.
+
+    The first flow runs in the tab that was current; ``run`` closes the tabs it opened
+    for the others and switches back to that tab when it finishes.
+    """
+
+    IGNORED = (NoSuchElementException, StaleElementReferenceException)
+
+    def __init__(self, driver, poll: float = 0.005, max_poll: float = 0.1):
+        self.driver = driver
+        self.poll = poll
+        self.max_poll = max_poll
+        self.flows = {}
+        self.origin = None
+        self.opened = []
+        self.started = {}
+        self.durations = {}
+
+    def open_tab(self, name: str, url: str):
+        """Start loading ``url`` in a tab for ``name`` without waiting for the load."""
+        if self.origin is None:
+            self.origin = self.driver.current_window_handle
+        else:
+            self.driver.switch_to.new_window("tab")
+            self.opened.append(self.driver.current_window_handle)
+        self.driver.execute_script(NAVIGATE, url)
+        return self.driver.current_window_handle
+
+    def add(self, name: str, url: str, flow):
+        """Open a tab for ``flow(driver)``; it starts once the scheduler runs."""
+        handle = self.open_tab(name, url)
+        self.flows[name] = {"handle": handle, "flow": flow(self.driver), "wait": None, "since": None, "value": None}
+
+    def _switch(self, handle):
+        if self.driver.current_window_handle != handle:
+            self.driver.switch_to.window(handle)
+
+    def _ready(self, name: str, state) -> bool:
+        wait = state["wait"]
+        if wait is None:
+            return True
+        try:
+            value = wait.condition(self.driver)
+        except self.IGNORED:
+            value = None
+        elapsed = time.perf_counter() - state["since"]
+        if value:
+            telemetry.record(f"{name}: {wait.label}", elapsed, 1, False)
+            state["value"] = value
+            return True
+        if elapsed > wait.timeout:
+            telemetry.record(f"{name}: {wait.label}", elapsed, 1, True)
+            raise TimeoutException(f"{name}: wait for {wait.label} timed out after {wait.timeout}s")
+        return False
+
+    def close_tabs(self):
+        """Close the tabs opened for the flows and switch back to the starting tab."""
+        while self.opened:
+            handle = self.opened.pop()
+            with contextlib.suppress(WebDriverException):
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+        if self.origin is not None:
+            self.driver.switch_to.window(self.origin)
+
+    def run(self):
+        """Drive every flow to completion and return each flow's duration in seconds."""
+        try:
+            return self._run()
+        finally:
+            self.close_tabs()
+
+    def _run(self):
+        start = time.perf_counter()
+        active = dict(self.flows)
+        poll = self.poll
+        while active:
+            progressed = False
+            for name, state in list(active.items()):
+                self._switch(state["handle"])
+                if not self._ready(name, state):
+                    continue
+                progressed = True
+                self.started.setdefault(name, time.perf_counter() - start)
+                try:
+                    with timeline.span(name, "tab"):
+                        state["wait"] = state["flow"].send(state["value"])
+                    state["since"] = time.perf_counter()
+                    state["value"] = None
+                except StopIteration:
+                    self.durations[name] = time.perf_counter() - start
+                    del active[name]
+            if progressed:
+                poll = self.poll
+            else:
+                time.sleep(poll)
+                poll = min(poll * 2, self.max_poll)
+        logging.info("Tabs finished in %.2fs overall, seconds per tab: %s", time.perf_counter() - start, self.durations)
+        return self.durations
+
+    def overlap(self) -> float:
+        """Seconds during which every flow had started and none had finished; 0 if they ran one after another."""
+        if not self.durations:
+            return 0.0
+        return max(0.0, min(self.durations.values()) - max(self.started.values()))
@@ -1,19 +1,44 @@
 import time
 import logging
-from selenium import webdriver
+from browser_lifecycle import browsers, open_clean
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
+from waits import AdaptiveWait as WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import pytest
+from memory_tracker import MemoryTracker, sample_memory, MB
+from log_buffer import install_logging
+from navigation import BASE_URL
+from text_entry import enter_text
+
 
 class TestGradeCalculator:
     @pytest.fixture(scope="class", autouse=True)
-    def setup_class(self):
-        logging.basicConfig(level=logging.INFO)
-        self.driver = webdriver.Chrome()
-        self.driver.get("https://softekogradecalculator.netlify.app/calculator/grade-calculator")
+    def setup_class(self, request):
+        install_logging()
+        request.cls.memory = MemoryTracker()
         yield
-        self.driver.quit()
+
+    @pytest.fixture(autouse=True)
+    def track_memory(self, request):
+        """Sample browser memory around each test and recycle the browser once it is over budget.
+
+        The tests of this class continue on the page the previous one left, so the page is
+        only loaded when the manager hands over a new browser.
+        """
+        cls = request.cls
+        cls.driver = browsers.begin(request.node.nodeid)
+        try:
+            if not cls.driver.current_url.startswith(BASE_URL):
+                open_clean(cls.driver, BASE_URL)
+            before = sample_memory(cls.driver)
+            yield
+            after = sample_memory(cls.driver)
+        finally:
+            browsers.end()
+        result = cls.memory.record(request.node.nodeid, before, after)
+        request.node.user_properties.append(("memory", result))
+        if cls.memory.over_budget(after):
+            browsers.replace("recycle", f"used {cls.memory.total(after) / MB:.1f} MB", request.node.nodeid)
 
     def add_row(self, task: str, grade: int, weight: int):
         try:
@@ -31,14 +56,11 @@ class TestGradeCalculator:
     def fill_details(self, task: str, grade: int, weight: int):
         try:
             task_inputs = self.driver.find_elements(By.CSS_SELECTOR, "input[placeholder='e.g Assignment']")
-            task_inputs[-1].clear()
-            task_inputs[-1].send_keys(task)
+            enter_text(self.driver, task_inputs[-1], task)
             grade_inputs = self.driver.find_elements(By.CSS_SELECTOR, "input[name*='rows'][name*='grade']")
-            grade_inputs[-1].clear()
-            grade_inputs[-1].send_keys(str(grade))
+            enter_text(self.driver, grade_inputs[-1], str(grade))
             weight_inputs = self.driver.find_elements(By.CSS_SELECTOR, "input[name*='rows'][name*='weight']")
-            weight_inputs[-1].clear()
-            weight_inputs[-1].send_keys(str(weight))
+            enter_text(self.driver, weight_inputs[-1], str(weight))
         except Exception as e:
             self.driver.save_screenshot("data_input_error.png")
             raise
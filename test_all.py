@@ -1,45 +1,76 @@
+import os
 import time
 import logging
-from selenium import webdriver
+import pytest
+from browser_lifecycle import browsers, open_clean
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
+from waits import AdaptiveWait as WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from visual_regression import VisualBaselines
+from navigation import GradeTypeNavigator, GRADE_TYPE_BUTTONS, BASE_URL, current_grade_type, grade_type_url
+from grade_engine import GradeEngine
+from page_metrics import PageMetrics, measured
+from text_entry import enter_text
+from letter_select import select_letter
+from tab_scheduler import TabScheduler, Wait
+import scenarios
+import golden_master
+import result_display
+from log_buffer import install_logging
+
+SCENARIO_PLAN = scenarios.scenario_plan()
+if os.environ.get("SCENARIO_GRADEBOOK"):
+    SCENARIO_PLAN += scenarios.gradebook_plan(os.environ["SCENARIO_GRADEBOOK"])
+
+GRADE_TYPES_AND_TASKS = {
+    "Percentage": [("Assignment", 90, 25), ("Exam", 85, 30), ("Project", 70, 15)],
+    "Letter": [("Presentation", "A", 20), ("Quiz", "B+", 10), ("Report", "C", 20)],
+    "Points": [("Task 1", 80, 100), ("Task 2", 75, 90), ("Task 3", 90, 100)],
+}
+
+
+def row_count(driver) -> int:
+    return len(driver.find_elements(By.CSS_SELECTOR, "form.flex.flex-col.gap-2 div.flex.flex-row"))
+
+
+def click_button(driver, text: str):
+    button = driver.find_element(By.XPATH, f"//button[normalize-space()='{text}']")
+    driver.execute_script("arguments[0].click();", button)
 
 class TestGradeCalculator:
     def setup_method(self, method):
         """Initial setup of the WebDriver with logging configuration."""
-        logging.basicConfig(level=logging.INFO)
-        self.driver = webdriver.Chrome()
-        self.driver.get("https://softekogradecalculator.netlify.app/calculator/grade-calculator")
+        install_logging()
+        with browsers.setting_up(method.__qualname__) as driver:
+            self.driver = open_clean(driver, BASE_URL)
+            self.navigator = GradeTypeNavigator(self.driver)
+            self.metrics = PageMetrics(self.driver)
+            self.visual = VisualBaselines()
+        self.engine = None
 
     def teardown_method(self, method):
-        """Tear down the WebDriver session."""
-        self.driver.quit()
+        """Close the navigator's tabs and hand the browser back to the manager, which recycles it when due."""
+        try:
+            self.metrics.clear()
+            self.navigator.close()
+        finally:
+            browsers.end()
 
+    @measured("select_grade_type")
     def select_grade_type(self, grade_type: str):
-        """Select a grade type button (Percentage, Letter, Points)."""
+        """Select a grade type (Percentage, Letter, Points) through the fastest working route."""
         driver = self.driver
-        grade_type_buttons = {
-            "Percentage": (By.XPATH, "//button[contains(text(), 'Percentage')]"),
-            "Letter": (By.XPATH, "//button[contains(text(), 'Letter')]"),
-            "Points": (By.XPATH, "//button[contains(text(), 'Points')]")
-        }
-
-        if grade_type in grade_type_buttons:
-            button_locator = grade_type_buttons[grade_type]
-            try:
-                button = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable(button_locator)
-                )
-                driver.execute_script("arguments[0].click();", button)
-                logging.info(f"Selected grade type: {grade_type}")
-            except Exception as e:
-                driver.save_screenshot(f"select_{grade_type.lower()}_error.png")
-                logging.error(f"Failed to select grade type '{grade_type}': {str(e)}")
-                raise
-        else:
+        if grade_type not in GRADE_TYPE_BUTTONS:
             raise ValueError(f"Invalid grade type: {grade_type}")
 
+        try:
+            self.navigator.switch(grade_type)
+        except Exception as e:
+            driver.save_screenshot(f"select_{grade_type.lower()}_error.png")
+            logging.error("Failed to select grade type '%s': %s", grade_type, e)
+            raise
+
+    @measured("add_row")
     def add_row(self, task: str, grade: str, weight: int = 0, max_grade: int = None):
         """Utility method to add a row with task, grade, and weight data."""
         driver = self.driver
@@ -55,47 +86,53 @@ class TestGradeCalculator:
             time.sleep(0.5)  # Wait for the row to be added
         except Exception as e:
             driver.save_screenshot("failed_click.png")
-            logging.error(f"Failed to click '+ Add new row': {str(e)}")
+            logging.error("Failed to click '+ Add new row': %s", e)
             raise
 
         # Enter data into the newly created row
         self.fill_details(task, grade, weight, max_grade)
+        if self.engine is not None:
+            self.engine.add(task, grade, weight, max_grade)
+            shown = result_display.expect_result(self.driver, self.engine)
+            logging.info("Result after adding %s: %s", task, shown)
 
+    @measured("fill_details")
     def fill_details(self, task: str, grade: str, weight: int = 0, max_grade: int = None):
         """Fill in the details of the new row, handling different grade types."""
         driver = self.driver
         try:
             # Access the last input fields to enter the data
             task_inputs = driver.find_elements(By.CSS_SELECTOR, "input[placeholder='e.g Assignment']")
-            task_inputs[-1].clear()
-            task_inputs[-1].send_keys(task)
+            enter_text(driver, task_inputs[-1], task)
 
             # For letter grades use a select input, otherwise use normal input
             grade_elements = driver.find_elements(By.CSS_SELECTOR, "select[name*='rows'][name*='grade']")
             if grade_elements:  # Letter grade case
-                grade_elements[-1].send_keys(grade)
+                select_letter(driver, grade_elements[-1], grade)
             else:  # Numeric or point grades
                 grade_inputs = driver.find_elements(By.CSS_SELECTOR, "input[name*='rows'][name*='grade']")
-                grade_inputs[-1].clear()
-                grade_inputs[-1].send_keys(str(grade))
+                enter_text(driver, grade_inputs[-1], str(grade))
 
             # Handle weight or max grade based on grade type
             weight_inputs = driver.find_elements(By.CSS_SELECTOR, "input[name*='rows'][name*='weight']")
             if weight_inputs:  # Weight (for percentage or letter grade types)
-                weight_inputs[-1].clear()
-                weight_inputs[-1].send_keys(str(weight))
+                enter_text(driver, weight_inputs[-1], str(weight))
             else:  # Max grade (specific to the points grade type)
                 max_grade_inputs = driver.find_elements(By.CSS_SELECTOR, "input[name*='rows'][name*='maxGrade']")
-                max_grade_inputs[-1].clear()
-                max_grade_inputs[-1].send_keys(str(max_grade))
+                enter_text(driver, max_grade_inputs[-1], str(max_grade))
 
-            logging.info(f"Data entered successfully: {task}, {grade}, {weight}, {max_grade}")
+            logging.info("Data entered successfully: %s, %s, %s, %s", task, grade, weight, max_grade)
         except Exception as e:
-            logging.error(f"Error entering data in the new row: {str(e)}")
+            logging.error("Error entering data in the new row: %s", e)
             driver.save_screenshot("data_input_error.png")
             raise
 
-    def run_tests_for_grade_type(self, grade_type: str, tasks):
+    def check_screenshot(self, grade_type: str, state: str):
+        """Compare the current page against the stored baseline for this grade type and state."""
+        result = self.visual.compare(grade_type, state, self.driver.get_screenshot_as_png())
+        assert result["passed"], f"Visual regression for {grade_type} '{state}': {result['reason']}"
+
+    def run_tests_for_grade_type(self, grade_type: str, tasks, check_visuals: bool = True):
         """Add, reset, and delete rows for the given grade type."""
         driver = self.driver
         self.select_grade_type(grade_type)
@@ -104,11 +141,14 @@ class TestGradeCalculator:
         try:
             form = driver.find_element(By.CSS_SELECTOR, "form.flex.flex-col.gap-2")
             initial_rows = len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row"))
-            logging.info(f"Initial rows count for {grade_type}: {initial_rows}")
+            logging.info("Initial rows count for %s: %s", grade_type, initial_rows)
         except Exception as e:
-            logging.error(f"Error counting initial rows for {grade_type}: {str(e)}")
+            logging.error("Error counting initial rows for %s: %s", grade_type, e)
             driver.save_screenshot(f"initial_rows_error_{grade_type.lower()}.png")
             raise
+        self.engine = GradeEngine(grade_type, initial_rows)
+        if check_visuals:
+            self.check_screenshot(grade_type, "empty form")
 
         # Add the specified rows, handle extra parameter for points
         for task_data in tasks:
@@ -120,42 +160,102 @@ class TestGradeCalculator:
                 self.add_row(task, grade, weight)
 
         # Verify the number of added rows
+        expected_rows = self.engine.row_count
         WebDriverWait(driver, 10).until(
-            lambda d: len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row")) == initial_rows + len(tasks)
+            lambda d: len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row")) == expected_rows
         )
         added_rows = len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row"))
-        expected_rows = initial_rows + len(tasks)
         assert added_rows == expected_rows, f"Expected {expected_rows} rows but found {added_rows}"
-        logging.info(f"Rows after addition for {grade_type}: {added_rows}")
+        logging.info("Rows after addition for %s: %s", grade_type, added_rows)
+        recorder = golden_master.session_recorder()
+        if recorder is not None:
+            recorder.record(grade_type, tasks, *golden_master.displayed_state(driver))
+        if check_visuals:
+            self.check_screenshot(grade_type, f"{len(tasks)} rows")
 
         # Click the "Reset/Clear" button to remove all rows
         try:
             reset_button = WebDriverWait(driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, "//button[normalize-space()='Reset/Clear']"))
             )
-            driver.execute_script("arguments[0].click();", reset_button)
-            logging.info(f"Clicked 'Reset/Clear' button for {grade_type}.")
+            with self.metrics.measure("reset"):
+                driver.execute_script("arguments[0].click();", reset_button)
+            logging.info("Clicked 'Reset/Clear' button for %s.", grade_type)
+            self.engine.reset()
             time.sleep(1)
         except Exception as e:
-            logging.error(f"Failed to click 'Reset/Clear' button for {grade_type}: {str(e)}")
+            logging.error("Failed to click 'Reset/Clear' button for %s: %s", grade_type, e)
             driver.save_screenshot(f"failed_reset_click_{grade_type.lower()}.png")
             raise
 
         # Verify the rows are reset to the initial state
         WebDriverWait(driver, 10).until(
-            lambda d: len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row")) == initial_rows
+            lambda d: len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row")) == self.engine.row_count
         )
         cleared_rows = len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row"))
         assert cleared_rows == initial_rows, f"Expected {initial_rows} rows after reset for {grade_type} but got {cleared_rows}"
-        logging.info(f"Rows after reset for {grade_type}: {cleared_rows}")
+        assert self.engine.result() is None, f"Expected no result after reset for {grade_type}"
+        result_display.expect_result(driver, self.engine)
+        logging.info("Rows after reset for %s: %s", grade_type, cleared_rows)
+        if check_visuals:
+            self.check_screenshot(grade_type, "after reset")
 
     def test_all_grade_types(self):
         """Test add/reset/delete operations across different grade types."""
-        grade_types_and_tasks = {
-            "Percentage": [("Assignment", 90, 25), ("Exam", 85, 30), ("Project", 70, 15)],
-            "Letter": [("Presentation", "A", 20), ("Quiz", "B+", 10), ("Report", "C", 20)],
-            "Points": [("Task 1", 80, 100), ("Task 2", 75, 90), ("Task 3", 90, 100)],
-        }
-
-        for grade_type, tasks in grade_types_and_tasks.items():
+        for grade_type, tasks in GRADE_TYPES_AND_TASKS.items():
             self.run_tests_for_grade_type(grade_type, tasks)
+
+    def grade_type_flow(self, grade_type: str, tasks):
+        """``run_tests_for_grade_type`` as a tab flow: yields instead of blocking while the page renders."""
+        def flow(driver):
+            yield Wait(lambda d: current_grade_type(d) == grade_type and row_count(d) > 0, label="form loaded")
+            initial_rows = row_count(driver)
+            engine = GradeEngine(grade_type, initial_rows)
+            self.check_screenshot(grade_type, "empty form")
+
+            for task, grade, value in tasks:
+                before = row_count(driver)
+                click_button(driver, "+ Add new row")
+                yield Wait(lambda d: row_count(d) > before, label="row added")
+                if grade_type == "Points":
+                    self.fill_details(task, grade, max_grade=value)
+                    engine.add(task, grade, max_grade=value)
+                else:
+                    self.fill_details(task, grade, value)
+                    engine.add(task, grade, value)
+                yield Wait(lambda d: result_display.shows_result(d, grade_type, engine.result()), label="result shown")
+            logging.info("Expected result for %s: %s", grade_type, engine.result())
+
+            added_rows = row_count(driver)
+            assert added_rows == engine.row_count, f"Expected {engine.row_count} rows but found {added_rows}"
+            self.check_screenshot(grade_type, f"{len(tasks)} rows")
+
+            click_button(driver, "Reset/Clear")
+            engine.reset()
+            yield Wait(lambda d: row_count(d) == initial_rows, label="rows reset")
+            assert engine.result() is None, f"Expected no result after reset for {grade_type}"
+            yield Wait(lambda d: result_display.shows_result(d, grade_type, None), label="result cleared")
+            self.check_screenshot(grade_type, "after reset")
+        return flow
+
+    def test_all_grade_types_concurrently(self):
+        """Run the grade type flows in one tab each of the same browser, interleaving their commands."""
+        scheduler = TabScheduler(self.driver)
+        for grade_type, tasks in GRADE_TYPES_AND_TASKS.items():
+            scheduler.add(grade_type, grade_type_url(grade_type), self.grade_type_flow(grade_type, tasks))
+        start = time.perf_counter()
+        durations = scheduler.run()
+        elapsed = time.perf_counter() - start
+        logging.info("Concurrent grade types took %.2fs, slowest tab %.2fs, all tabs in progress for %.2fs",
+                     elapsed, max(durations.values()), scheduler.overlap())
+        assert set(durations) == set(GRADE_TYPES_AND_TASKS)
+        assert scheduler.overlap() > 0, f"The tabs ran one after another: started {scheduler.started}, finished {durations}"
+
+    @pytest.mark.parametrize("grade_type,tasks", SCENARIO_PLAN, ids=scenarios.session_ids(SCENARIO_PLAN))
+    def test_pairwise_scenarios(self, grade_type, tasks):
+        """Run one session of the pairwise covering set (see scenarios.scenario_plan)."""
+        start = time.perf_counter()
+        try:
+            self.run_tests_for_grade_type(grade_type, tasks, check_visuals=False)
+        finally:
+            scenarios.coverage.record(grade_type, tasks, time.perf_counter() - start)
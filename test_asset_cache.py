@@ -0,0 +1,127 @@
+import base64
+import json
+import time
+
+import pytest
+
+from asset_cache import AssetInterceptor, cache_version
+from chrome_pool import browser_websocket_url, new_session
+from navigation import BASE_URL
+from snapshots import IMMUTABLE, SnapshotStore
+
+
+SITE = {
+    "https://gradecal.test/calculator/grade-calculator": (b"<script src='/_next/static/app.js'></script>", "text/html"),
+    "https://gradecal.test/_next/static/app.js": (b"console.log('app');", "application/javascript"),
+}
+
+
+@pytest.fixture
+def interceptor(tmp_path):
+    root = str(tmp_path)
+    version = SnapshotStore(root).capture("https://gradecal.test/calculator/grade-calculator", fetcher=SITE.get)
+    return AssetInterceptor(version, root, allowlist={"gradecal.test"})
+
+
+def paused(url, resource_type="Script", request_id="1"):
+    return {"requestId": request_id, "resourceType": resource_type, "request": {"url": url}}
+
+
+def test_cached_asset_is_fulfilled_locally(interceptor):
+    interceptor.decide(paused("https://gradecal.test/calculator/grade-calculator?type=letter", "Document"))
+    method, params = interceptor.decide(paused("https://gradecal.test/_next/static/app.js"))
+    assert method == "Fetch.fulfillRequest"
+    assert base64.b64decode(params["body"]) == b"console.log('app');"
+    headers = {header["name"]: header["value"] for header in params["responseHeaders"]}
+    assert headers["Content-Type"] == "application/javascript"
+    assert headers["Cache-Control"] == IMMUTABLE
+    stats = interceptor.pages["https://gradecal.test/calculator/grade-calculator?type=letter"]
+    assert stats["cached"] == 2
+    assert stats["cached_bytes"] == sum(len(body) for body, _ in SITE.values())
+
+
+def test_allowlisted_miss_goes_to_network_and_others_are_blocked(interceptor):
+    assert interceptor.decide(paused("https://gradecal.test/api/health"))[0] == "Fetch.continueRequest"
+    method, params = interceptor.decide(paused("https://www.googletagmanager.com/gtag/js"))
+    assert method == "Fetch.failRequest"
+    assert params["errorReason"] == "BlockedByClient"
+    assert interceptor.totals() == {"cached": 0, "network": 1, "blocked": 1, "cached_bytes": 0}
+
+
+class Connection:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+def sent(connection):
+    return [(message["method"], message.get("sessionId")) for message in connection.sent]
+
+
+def attached(session, target, waiting=True):
+    return {"method": "Target.attachedToTarget", "params": {
+        "sessionId": session, "targetInfo": {"targetId": target, "type": "page"}, "waitingForDebugger": waiting,
+    }}
+
+
+def test_tabs_opened_later_are_intercepted_before_they_load(interceptor):
+    interceptor._connection = Connection()
+    interceptor.handle(attached("s1", "first-tab", waiting=False))
+    interceptor.handle(attached("s2", "second-tab"))
+    assert sent(interceptor._connection) == [
+        ("Fetch.enable", "s1"), ("Fetch.enable", "s2"), ("Runtime.runIfWaitingForDebugger", "s2"),
+    ]
+
+    interceptor._connection.sent.clear()
+    interceptor.handle({"method": "Fetch.requestPaused", "sessionId": "s2",
+                        "params": paused("https://www.googletagmanager.com/gtag/js")})
+    assert sent(interceptor._connection) == [("Fetch.failRequest", "s2")]
+
+
+def test_tabs_open_at_attach_are_attached_once(interceptor):
+    interceptor._connection = Connection()
+    interceptor._listing = 7
+    interceptor.handle({"id": 7, "result": {"targetInfos": [
+        {"targetId": "tab", "type": "page"}, {"targetId": "worker", "type": "service_worker"},
+    ]}})
+    assert interceptor._connection.sent[-1]["params"] == {"targetId": "tab", "flatten": True}
+    interceptor.handle(attached("s1", "tab", waiting=False))
+    interceptor.handle(attached("s2", "tab"))
+    assert sent(interceptor._connection)[1:] == [
+        ("Fetch.enable", "s1"), ("Runtime.runIfWaitingForDebugger", "s2"), ("Target.detachFromTarget", None),
+    ]
+
+
+def test_pages_are_counted_per_tab_and_taken_once(interceptor):
+    interceptor.decide(paused("https://gradecal.test/calculator/grade-calculator?type=letter", "Document"), "s1")
+    interceptor.decide(paused("https://gradecal.test/calculator/grade-calculator?type=points", "Document"), "s2")
+    interceptor.decide(paused("https://gradecal.test/_next/static/app.js"), "s1")
+    pages = interceptor.take_pages()
+    assert pages["https://gradecal.test/calculator/grade-calculator?type=letter"]["cached"] == 2
+    assert pages["https://gradecal.test/calculator/grade-calculator?type=points"]["cached"] == 1
+    assert interceptor.take_pages() == {}
+
+
+@pytest.mark.skipif(not cache_version(), reason="needs ASSET_CACHE=<snapshot version> (see snapshots.py)")
+def test_cached_loads_are_faster():
+    driver = new_session()
+    try:
+        timings = {}
+        for mode in ("network", "cache"):
+            if mode == "cache":
+                driver.interceptor = AssetInterceptor(cache_version()).attach(browser_websocket_url(driver))
+            elif driver.interceptor is not None:
+                driver.interceptor.detach()
+                driver.interceptor = None
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            samples = []
+            for _ in range(5):
+                start = time.perf_counter()
+                driver.get(BASE_URL)
+                samples.append(time.perf_counter() - start)
+            timings[mode] = sorted(samples)[2]
+        assert timings["cache"] < timings["network"], f"Median load: {timings}"
+    finally:
+        driver.quit()
@@ -0,0 +1,74 @@
+import time
+
+from browser_lifecycle import BrowserManager, PING
+from fake_driver import FakeDriver
+
+
+def manager(**kwargs):
+    return BrowserManager(factory=FakeDriver, **kwargs)
+
+
+def test_recycle_after_max_tests():
+    browsers = manager(max_tests=2)
+    seen = []
+    for test in range(5):
+        with browsers.run(f"test_{test}") as driver:
+            seen.append(driver)
+    assert len(set(map(id, seen))) == 3
+    assert [event["event"] for event in browsers.events] == ["recycle", "recycle"]
+
+
+def test_unhealthy_browser_is_replaced():
+    browsers = manager()
+    with browsers.run("test_a") as first:
+        pass
+    first.closed = True
+    with browsers.run("test_b") as second:
+        assert second is not first
+    assert browsers.events[0]["event"] == "replace"
+    assert browsers.events[0]["test"] == "test_b"
+
+
+def test_overrunning_test_is_killed_and_replaced():
+    browsers = manager(test_timeout=0.05)
+    with browsers.run("test_slow") as slow:
+        time.sleep(0.2)
+    assert browsers.events[0]["event"] == "kill"
+    assert browsers.driver is not slow
+    with browsers.run("test_next", timeout=5) as driver:
+        assert driver.execute_script(PING) == "complete"
+
+
+def test_begin_and_end_apply_the_budget_like_run():
+    browsers = manager(max_tests=1, test_timeout=0.05)
+    first = browsers.begin("test_setup_a")
+    browsers.end()
+    second = browsers.begin("test_setup_b")
+    time.sleep(0.2)
+    browsers.end()
+    assert second is not first
+    assert [event["event"] for event in browsers.events] == ["recycle", "kill"]
+    assert browsers.driver is not second
+
+
+def test_failed_setup_ends_its_budget():
+    browsers = manager(test_timeout=0.05)
+    try:
+        with browsers.setting_up("test_broken_setup") as driver:
+            raise ConnectionError("page did not load")
+    except ConnectionError:
+        pass
+    time.sleep(0.2)
+    assert browsers.driver is driver and not driver.closed
+    assert browsers.events == []
+
+
+def test_begin_ends_a_budget_left_running():
+    browsers = manager(test_timeout=0.05)
+    first = browsers.begin("test_without_teardown")
+    second = browsers.begin("test_next", timeout=5)
+    time.sleep(0.2)
+    browsers.end()
+    assert second is first and not second.closed
+    assert browsers.events == []
+    assert browsers.tests_run == 2
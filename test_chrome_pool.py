@@ -0,0 +1,102 @@
+import os
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import chrome_pool
+from fake_driver import FakeDriver
+
+
+class RunningProcess:
+    def poll(self):
+        return None
+
+
+def test_clone_profile_skips_lock_files(tmp_path):
+    template = tmp_path / "template"
+    (template / "Default" / "Cache").mkdir(parents=True)
+    (template / "Default" / "Cache" / "data_0").write_bytes(b"cached bundle")
+    os.symlink("host-1234", template / "SingletonLock")
+    clone = chrome_pool.clone_profile(str(template))
+    try:
+        assert (tmp_path / clone / "Default" / "Cache" / "data_0").read_bytes() == b"cached bundle"
+        assert not os.path.lexists(os.path.join(clone, "SingletonLock"))
+    finally:
+        chrome_pool.shutil.rmtree(clone)
+
+
+def test_shared_service_survives_quit():
+    service = chrome_pool.SharedService()
+    process = RunningProcess()
+    service.process = process
+    service.start()
+    service.stop()
+    assert service.process is process
+
+
+def test_shared_service_starts_and_shuts_down_without_a_process(monkeypatch):
+    started = []
+    monkeypatch.setattr(chrome_pool.Service, "start", lambda self: started.append(self))
+    service = chrome_pool.SharedService()
+    service.shutdown()
+    service.start()
+    assert started == [service]
+
+
+@pytest.mark.skipif(not os.environ.get("CHROME_BENCHMARK"), reason="times real Chrome sessions, run with CHROME_BENCHMARK=1")
+def test_shared_service_creates_sessions_faster():
+    results = chrome_pool.benchmark_session_creation(sessions=3)
+    assert results["shared_service"] < results["per_test_spawn"]
+
+
+def test_failed_template_build_leaves_nothing_behind(tmp_path, monkeypatch):
+    def no_chrome(options, service):
+        raise WebDriverException("chrome not found")
+
+    monkeypatch.setattr(chrome_pool.tempfile, "tempdir", str(tmp_path / "tmp"))
+    (tmp_path / "tmp").mkdir()
+    monkeypatch.setattr(chrome_pool.webdriver, "Chrome", no_chrome)
+    with pytest.raises(WebDriverException):
+        chrome_pool.build_profile_template(path=str(tmp_path / "repo" / "template"))
+    assert os.listdir(tmp_path / "tmp") == []
+    assert not (tmp_path / "repo").exists()
+
+
+def test_failed_session_setup_quits_and_removes_the_clone(tmp_path, monkeypatch):
+    clone = tmp_path / "clone"
+    clone.mkdir()
+    sessions = []
+
+    def session(options=None, profile=None):
+        sessions.append(FakeDriver())
+        return sessions[-1]
+
+    def broken_profile(driver, device):
+        raise ValueError(f"Unknown device profile: {device}")
+
+    monkeypatch.setattr(chrome_pool, "build_profile_template", lambda: "template")
+    monkeypatch.setattr(chrome_pool, "clone_profile", lambda template: str(clone))
+    monkeypatch.setattr(chrome_pool, "PooledChrome", session)
+    monkeypatch.setattr(chrome_pool, "apply_device_profile", broken_profile)
+    with pytest.raises(ValueError):
+        chrome_pool.new_session(device="pager")
+    # PooledChrome.quit removes the clone once the session exists
+    assert len(sessions) == 1 and sessions[0].closed
+
+    monkeypatch.setattr(chrome_pool, "PooledChrome", lambda options, profile: broken_profile(None, "pager"))
+    with pytest.raises(ValueError):
+        chrome_pool.new_session(device="pager")
+    assert not clone.exists()
+
+
+def test_new_tabs_get_the_session_device_profile():
+    driver = FakeDriver()
+    driver.device_profile = "slow 3G"
+    chrome_pool.EmulatingSwitchTo(driver).new_window("tab")
+    assert driver.current_window_handle == "window-1"
+    assert [command for command, _ in driver.commands] == [
+        "Emulation.setCPUThrottlingRate", "Network.enable", "Network.emulateNetworkConditions",
+    ]
+    driver.device_profile, driver.commands = None, []
+    chrome_pool.EmulatingSwitchTo(driver).new_window("tab")
+    assert driver.commands == []
@@ -0,0 +1,70 @@
+import numpy as np
+
+import columnar
+import gradebook
+import scenarios
+
+
+def write_csv(path, rows):
+    lines = ["student,course,grade_type,task,grade,weight,max_grade"]
+    lines += [f"{student},Math,{grade_type},{task},{grade},{weight},{max_grade}"
+              for student, grade_type, task, grade, weight, max_grade in rows]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_round_trip_is_zero_copy(tmp_path, gradebook_rows):
+    write_csv(tmp_path / "gradebook.csv", gradebook_rows)
+    assert columnar.convert_csv(str(tmp_path / "gradebook.csv"), str(tmp_path / "gradebook.gbc")) == len(gradebook_rows)
+    with columnar.ColumnarGradebook(str(tmp_path / "gradebook.gbc")) as table:
+        assert len(table) == len(gradebook_rows)
+        grades = table["grade"]
+        assert not grades.flags.owndata and not grades.flags.writeable
+        assert table.dictionaries["student"] == ["ana", "ben", "cy"]
+        assert [columnar.LETTERS[code] for code in table["letter"] if code >= 0] == ["A", "B+"]
+
+
+def test_close_leaves_views_and_copies_usable(tmp_path, gradebook_rows):
+    write_csv(tmp_path / "gradebook.csv", gradebook_rows)
+    columnar.convert_csv(str(tmp_path / "gradebook.csv"), str(tmp_path / "gradebook.gbc"))
+    with columnar.ColumnarGradebook(str(tmp_path / "gradebook.gbc")) as table:
+        weights = table["weight"]
+        grades = table.copy("grade")
+        expected = weights.copy()
+    assert grades.flags.owndata
+    assert np.array_equal(weights, expected, equal_nan=True)
+    assert grades[0] == 90
+
+
+def test_totals_match_text_gradebook(tmp_path, gradebook_rows):
+    write_csv(tmp_path / "gradebook.csv", gradebook_rows)
+    columnar.convert_csv(str(tmp_path / "gradebook.csv"), str(tmp_path / "gradebook.gbc"))
+    expected, rows = gradebook.compute(str(tmp_path / "gradebook.csv"), workers=1)
+    actual, columnar_rows = gradebook.compute(str(tmp_path / "gradebook.gbc"))
+    assert columnar_rows == rows
+    assert actual.keys() == expected.keys()
+    for key in expected:
+        assert actual[key][0] == expected[key][0]
+        assert actual[key][1:] == expected[key][1:]
+
+
+def test_scenarios(tmp_path, gradebook_rows):
+    write_csv(tmp_path / "gradebook.csv", gradebook_rows)
+    columnar.convert_csv(str(tmp_path / "gradebook.csv"), str(tmp_path / "gradebook.gbc"))
+    with columnar.ColumnarGradebook(str(tmp_path / "gradebook.gbc")) as table:
+        sessions = {student: (grade_type, rows) for student, _, grade_type, rows in table.scenarios()}
+    assert sessions["ana"] == ("Percentage", [("Assignment", 90, 25), ("Exam", 85, 30), ("Project", 70, 15)])
+    assert sessions["ben"] == ("Letter", [("Presentation", "A", 20), ("Quiz", "B+", 10)])
+    assert sessions["cy"] == ("Points", [("Task 1", 80, 100), ("Task 2", 75, 90)])
+
+
+def test_gradebook_plan_splits_sessions(tmp_path, gradebook_rows):
+    write_csv(tmp_path / "gradebook.csv", gradebook_rows)
+    columnar.convert_csv(str(tmp_path / "gradebook.csv"), str(tmp_path / "gradebook.gbc"))
+    plan = scenarios.gradebook_plan(str(tmp_path / "gradebook.gbc"), rows_per_session=2)
+    assert plan == [
+        ("Percentage", [("Assignment", 90, 25), ("Exam", 85, 30)]),
+        ("Percentage", [("Project", 70, 15)]),
+        ("Letter", [("Presentation", "A", 20), ("Quiz", "B+", 10)]),
+        ("Points", [("Task 1", 80, 100), ("Task 2", 75, 90)]),
+    ]
+    assert scenarios.session_ids(plan) == ["Percentage-1", "Percentage-2", "Letter-1", "Points-1"]
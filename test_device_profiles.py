@@ -0,0 +1,31 @@
+import pytest
+
+from device_profiles import LatencyMatrix, apply_device_profile
+from fake_driver import FakeDriver
+
+
+def test_apply_profile():
+    driver = FakeDriver()
+    apply_device_profile(driver, "slow 3G")
+    commands = dict(driver.commands)
+    assert commands["Emulation.setCPUThrottlingRate"] == {"rate": 2}
+    assert commands["Network.emulateNetworkConditions"]["latency"] == 400
+    assert commands["Network.emulateNetworkConditions"]["downloadThroughput"] == 400 * 1024 / 8
+
+
+def test_baseline_lifts_throttling():
+    driver = FakeDriver()
+    apply_device_profile(driver, "baseline")
+    conditions = dict(driver.commands)["Network.emulateNetworkConditions"]
+    assert (conditions["latency"], conditions["downloadThroughput"]) == (0, -1)
+    with pytest.raises(ValueError):
+        apply_device_profile(driver, "smartwatch")
+
+
+def test_latency_matrix_orders_profiles():
+    matrix = LatencyMatrix()
+    matrix.record("grade_type_switch", "low-end laptop", "p95", 180.0)
+    matrix.record("grade_type_switch", "baseline", "p95", 45.0)
+    header, row = matrix.format().splitlines()
+    assert header.split()[1:] == ["baseline", "low-end", "laptop"]
+    assert row.split() == ["grade_type_switch", "p95", "45.0", "ms", "p95", "180.0", "ms"]
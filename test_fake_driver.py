@@ -0,0 +1,170 @@
+import logging
+import time
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+import final
+import grade_engine
+import page_ready
+import test_all
+import test_letter
+import test_letter_input_values
+from fake_driver import FakeCalculator, FakeDriver, INITIAL_ROWS
+from navigation import BASE_URL, ROUTES, GradeTypeNavigator, current_grade_type
+from page_metrics import PageMetrics
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """The helpers sleep to let the real page render; the fake renders synchronously."""
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+
+
+@pytest.fixture
+def driver():
+    driver = FakeDriver()
+    driver.get(BASE_URL)
+    return driver
+
+
+def suite_with(suite, driver):
+    suite.driver = driver
+    suite.navigator = GradeTypeNavigator(driver, timings={route: [] for route in ROUTES}, broken=set())
+    suite.metrics = PageMetrics(driver, enabled=False)
+    suite.engine = None
+    return suite
+
+
+def last_row_values(driver):
+    row = driver.find_elements(By.CSS_SELECTOR, "form.flex.flex-col.gap-2 div.flex.flex-row")[-1]
+    return [field.get_attribute("value") for field in row.find_elements(By.CSS_SELECTOR, "input, select")]
+
+
+def test_fill_details_uses_max_grade_for_points(driver):
+    suite = suite_with(final.TestGradeCalculator("test_points_grade_type"), driver)
+    suite.select_grade_type("Points")
+    assert current_grade_type(driver) == "Points"
+    suite.add_row("Task 1", 80, max_grade=100)
+    assert last_row_values(driver) == ["Task 1", "80", "100"]
+
+
+def test_fill_details_uses_select_for_letter(driver):
+    suite = suite_with(final.TestGradeCalculator("test_letter_grade_type"), driver)
+    suite.select_grade_type("Letter")
+    suite.add_row("Quiz", "B+", 10)
+    assert last_row_values(driver) == ["Quiz", "B+", "10"]
+
+
+def test_letter_select_type_ahead_matches_by_prefix(driver):
+    driver.get(BASE_URL + "?type=letter")
+    select = driver.find_elements(By.CSS_SELECTOR, "select[name*='rows'][name*='grade']")[0]
+    select.send_keys("B")
+    # Typing "B" picks the first option starting with it, like Chrome does
+    assert select.get_attribute("value") == "B+"
+
+
+@pytest.mark.parametrize("grade_type,tasks", test_all.GRADE_TYPES_AND_TASKS.items())
+def test_run_tests_for_grade_type_row_accounting(driver, grade_type, tasks):
+    suite = suite_with(test_all.TestGradeCalculator(), driver)
+    suite.run_tests_for_grade_type(grade_type, tasks, check_visuals=False)
+    assert len(driver.page.rows) == INITIAL_ROWS
+    assert suite.engine.row_count == INITIAL_ROWS
+
+
+@pytest.mark.parametrize("grade_type,shown", [
+    ("Percentage", "Your grade: 83.57% (B)"),
+    ("Letter", "GPA: 3.06 (B)"),
+    ("Points", "Your grade: 84.48% (B)"),
+])
+def test_displayed_result_is_worked_out_by_hand(driver, grade_type, shown):
+    # (90*25 + 85*30 + 70*15) / 70, (4.0*20 + 3.3*10 + 2.0*20) / 50 and 245 / 290 points
+    suite = suite_with(final.TestGradeCalculator("test_percentage_grade_type"), driver)
+    suite.select_grade_type(grade_type)
+    for task, grade, last in test_all.GRADE_TYPES_AND_TASKS[grade_type]:
+        if grade_type == "Points":
+            suite.add_row(task, grade, max_grade=last)
+        else:
+            suite.add_row(task, grade, last)
+    assert driver.page.displayed_result() == shown
+
+
+def test_letter_suite_checks_the_displayed_result(driver):
+    driver.get(BASE_URL + "?type=letter")
+    suite = suite_with(test_letter.TestGradeCalculator(), driver)
+    suite.test_delete_single_row()
+    driver.refresh()
+    suite.test_add_and_reset_multiple_times()
+    assert suite.engine.result() is None
+
+
+def test_wrong_displayed_result_fails_the_suite(driver, monkeypatch):
+    suite = suite_with(test_all.TestGradeCalculator(), driver)
+    monkeypatch.setattr(FakeCalculator, "displayed_result", lambda page: "Your grade: 12.00% (F)")
+    monkeypatch.setattr(test_all.result_display, "RESULT_TIMEOUT", 0.05)
+    with pytest.raises(AssertionError, match="the page shows 'Your grade: 12.00% \\(F\\)'"):
+        suite.run_tests_for_grade_type("Percentage", test_all.GRADE_TYPES_AND_TASKS["Percentage"], check_visuals=False)
+
+
+@pytest.mark.parametrize("confirmed", [False, True])
+def test_letter_gpa_is_checked_only_on_a_confirmed_scale(driver, monkeypatch, confirmed):
+    suite = suite_with(test_all.TestGradeCalculator(), driver)
+    monkeypatch.setattr(grade_engine, "scale_confirmed", confirmed)
+    monkeypatch.setattr(FakeCalculator, "displayed_result", lambda page: "GPA: 1.00 (D)")
+    monkeypatch.setattr(test_all.result_display, "RESULT_TIMEOUT", 0.05)
+    tasks = test_all.GRADE_TYPES_AND_TASKS["Letter"]
+    if confirmed:
+        with pytest.raises(AssertionError, match="the page shows 'GPA: 1.00"):
+            suite.run_tests_for_grade_type("Letter", tasks, check_visuals=False)
+    else:
+        suite.run_tests_for_grade_type("Letter", tasks, check_visuals=False)
+
+
+def test_reset_makes_rows_stale(driver):
+    task_input = driver.find_elements(By.CSS_SELECTOR, "input[placeholder='e.g Assignment']")[0]
+    driver.find_element(By.XPATH, "//button[normalize-space()='Reset/Clear']").click()
+    with pytest.raises(StaleElementReferenceException):
+        task_input.get_attribute("value")
+
+
+def test_delete_first_row_renumbers(driver):
+    driver.find_element(By.XPATH, "//div[contains(@class,'flex flex-col gap-2')]//div[1]//button[1]").click()
+    names = [field.get_attribute("name") for field in driver.find_elements(By.CSS_SELECTOR, "input[name*='rows'][name*='weight']")]
+    assert names == [f"rows.{index}.weight" for index in range(INITIAL_ROWS - 1)]
+
+
+def test_handle_click_recovers_from_intercepted_click(driver):
+    driver.page.add_button.obscured = True
+    test_letter_input_values.handle_click(driver, (By.XPATH, "//button[normalize-space()='+ Add new row']"))
+    assert len(driver.page.rows) == INITIAL_ROWS + 1
+    assert "scroll" in driver.scripts
+
+
+def test_step_buttons_clamp_to_range(driver):
+    weight = driver.find_elements(By.CSS_SELECTOR, "input[name*='rows'][name*='weight']")[0]
+    for _ in range(150):
+        driver.execute_script("arguments[0].stepUp();", weight)
+    assert weight.get_attribute("value") == "100"
+    weight.clear()
+    weight.send_keys("abc12")
+    assert weight.get_attribute("value") == "12"
+
+
+def test_helpers_run_repeatedly_without_a_browser(driver):
+    suite = suite_with(final.TestGradeCalculator("test_percentage_grade_type"), driver)
+    start = time.perf_counter()
+    for cycle in range(100):
+        for task in range(10):
+            suite.add_row(f"Task {task}", 90, 10)
+        suite.clear_all_rows()
+    logging.info("%.0f add_row calls per second against the fake driver", 1000 / (time.perf_counter() - start))
+    assert len(driver.page.rows) == INITIAL_ROWS
+
+
+def test_unknown_script_is_rejected(driver):
+    with pytest.raises(ValueError, match="unknown script"):
+        driver.execute_script("return document.title;")
+    edited = page_ready.FORM_STATE.replace("input, select", "input")
+    with pytest.raises(ValueError, match="unknown script"):
+        driver.execute_script(edited)
@@ -0,0 +1,50 @@
+import itertools
+import random
+
+from golden_master import GoldenMasterRecorder, GoldenMasterStore, diff, main, scenario_key
+
+
+def scenarios(count, seed=0):
+    rng = random.Random(seed)
+    for index in range(count):
+        tasks = [(f"Task {index}-{row}", rng.randint(0, 100), rng.randint(0, 100)) for row in range(rng.randint(1, 6))]
+        yield "Percentage", tasks
+
+
+def record_version(root, version, overrides=None, skip=(), buffer_size=700):
+    with GoldenMasterRecorder(version, root, buffer_size=buffer_size) as recorder:
+        for grade_type, tasks in scenarios(3000):
+            key = scenario_key(grade_type, tasks)
+            if key in skip:
+                continue
+            result = (overrides or {}).get(key, f"{sum(grade for _, grade, _ in tasks)} %")
+            recorder.record(grade_type, tasks, result, [[str(value) for value in task] for task in tasks])
+
+
+def test_scan_is_sorted_and_latest_run_wins(tmp_path):
+    root = str(tmp_path)
+    record_version(root, "v1")
+    store = GoldenMasterStore(root)
+    assert len(store.runs("v1")) == 5
+    keys = [record["scenario"] for record in store.scan("v1")]
+    assert keys == sorted(keys) and len(keys) == 3000
+
+    grade_type, tasks = next(scenarios(1))
+    with GoldenMasterRecorder("v1", root) as recorder:
+        recorder.record(grade_type, tasks, "re-recorded", [])
+    key = scenario_key(grade_type, tasks)
+    assert [record["result"] for record in store.scan("v1") if record["scenario"] == key] == ["re-recorded"]
+
+
+def test_diff_lists_only_changed_scenarios(tmp_path, capsys):
+    root = str(tmp_path)
+    keys = [scenario_key(grade_type, tasks) for grade_type, tasks in itertools.islice(scenarios(3000), 0, 3000, 500)]
+    record_version(root, "v1")
+    record_version(root, "v2", overrides={keys[0]: "changed", keys[1]: "changed"}, skip={keys[2]}, buffer_size=1000)
+
+    changes = {change["scenario"]: change["status"] for change in diff(GoldenMasterStore(root), "v1", "v2")}
+    assert changes == {keys[0]: "changed", keys[1]: "changed", keys[2]: "removed"}
+    assert {change["scenario"] for change in diff(GoldenMasterStore(root), "v2", "v1")} == set(keys[:3])
+
+    main(["--root", root, "diff", "v1", "v2"])
+    assert "3 scenarios differ between v1 and v2" in capsys.readouterr().out
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from grade_engine import GradeEngine, LETTER_SCALE, REFERENCE_SCALE, load_letter_scale, matches_display, percentage_to_letter
+
+
+def full_recompute(grade_type, rows):
+    numerator = denominator = 0.0
+    for task, grade, weight, max_grade in rows:
+        if grade_type == "Points":
+            numerator += grade
+            denominator += max_grade
+        else:
+            value = LETTER_SCALE[grade][0] if grade_type == "Letter" else grade
+            numerator += value * weight
+            denominator += weight
+    return numerator / denominator
+
+
+def test_percentage_add_edit_delete_reset():
+    engine = GradeEngine("Percentage", initial_rows=5)
+    assert engine.result() is None
+    engine.add("Assignment", 90, 25)
+    exam = engine.add("Exam", 85, 30)
+    engine.add("Project", 70, 15)
+    assert engine.row_count == 8
+    assert engine.result()["percentage"] == round((90 * 25 + 85 * 30 + 70 * 15) / 70, 2)
+    engine.edit(exam, "Exam", 100, 30)
+    engine.delete_at(5)
+    assert engine.result() == {"percentage": round((100 * 30 + 70 * 15) / 45, 2), "letter": "A-"}
+    engine.reset()
+    assert engine.row_count == 5
+    assert engine.result() is None
+
+
+def test_letter_and_points():
+    letter = GradeEngine("Letter")
+    letter.add("Presentation", "A", 20)
+    letter.add("Quiz", "B+", 10)
+    letter.add("Report", "C", 20)
+    assert letter.result() == {"gpa": 3.06, "letter": "B"}
+    with pytest.raises(ValueError):
+        letter.add("Typo", "E", 10)
+
+    points = GradeEngine("Points")
+    points.add("Task 1", 80, max_grade=100)
+    points.add("Task 2", 75, max_grade=90)
+    assert points.result() == {"percentage": round(155 / 190 * 100, 2), "letter": percentage_to_letter(155 / 190 * 100)}
+
+
+@pytest.mark.parametrize("grade_type", ["Percentage", "Letter", "Points"])
+def test_running_sums_match_full_recompute(grade_type):
+    rng = random.Random(7)
+    engine = GradeEngine(grade_type)
+    rows = {}
+    for _ in range(2000):
+        if rows and rng.random() < 0.3:
+            row_id = rng.choice(list(rows))
+            engine.delete(row_id)
+            del rows[row_id]
+            continue
+        grade = rng.choice(list(LETTER_SCALE)) if grade_type == "Letter" else rng.randint(0, 100)
+        values = ("Task", grade, rng.randint(1, 100), rng.randint(100, 150))
+        rows[engine.add(*values)] = values
+    expected = full_recompute(grade_type, rows.values())
+    actual = engine.weighted_sum / engine.total_weight
+    assert actual == pytest.approx(expected)
+
+
+def test_positions_follow_the_form_after_deletes():
+    engine = GradeEngine("Percentage", initial_rows=2)
+    ids = [engine.add(f"Task {n}", 80, 10) for n in range(4)]
+    engine.delete_at(2)
+    engine.delete(ids[-1])
+    assert engine.row_id_at(2) == ids[1]
+    assert engine.row_id_at(-1) == ids[2]
+    assert engine.row_count == len(engine.order) == 4
+    with pytest.raises(KeyError):
+        engine.delete(ids[0])
+
+
+@pytest.mark.parametrize("grade_type,expected,text,matches", [
+    ("Percentage", {"percentage": 82.86, "letter": "B-"}, "Your grade: 82.86% (B-)", True),
+    ("Percentage", {"percentage": 82.86, "letter": "B-"}, "Your grade is 82.9%", True),
+    ("Percentage", {"percentage": 82.86, "letter": "B-"}, "Your grade is 83.9%", False),
+    ("Letter", {"gpa": 3.06, "letter": "B"}, "GPA: 3.06 (B)", True),
+    ("Letter", {"gpa": 3.06, "letter": "B"}, "GPA 2.5", False),
+    ("Points", None, "", True),
+    ("Points", None, "Your grade: 0%", True),
+    ("Points", None, "Your grade: 81.58%", False),
+    ("Percentage", {"percentage": 90.0, "letter": "A-"}, "", False),
+])
+def test_matches_display(grade_type, expected, text, matches):
+    assert matches_display(grade_type, expected, text) is matches
+
+
+def test_letter_scale_file_replaces_the_reference_scale(tmp_path):
+    path = tmp_path / "scale.json"
+    path.write_text('{"A": [4, 90], "B": [3, 80], "C": [2, 70], "F": [0, 0]}')
+    assert load_letter_scale(str(path)) == {"A": (4.0, 90.0), "B": (3.0, 80.0), "C": (2.0, 70.0), "F": (0.0, 0.0)}
+    assert load_letter_scale() == REFERENCE_SCALE
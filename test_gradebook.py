@@ -0,0 +1,56 @@
+import json
+
+import gradebook
+from grade_engine import GradeEngine
+
+
+def expected(rows):
+    engines = {}
+    for student, grade_type, task, grade, weight, max_grade in rows:
+        engine = engines.setdefault(student, GradeEngine(grade_type))
+        engine.add(task, grade, weight, max_grade or None)
+    return {student: engine.result() for student, engine in engines.items()}
+
+
+def results(totals):
+    return {student: gradebook.result_from_sums(grade_type, numerator, denominator)
+            for (student, _), (grade_type, numerator, denominator, _) in totals.items()}
+
+
+def test_csv_in_small_chunks(tmp_path, gradebook_rows):
+    path = tmp_path / "gradebook.csv"
+    lines = ["student,grade_type,task,grade,weight,max_grade"]
+    lines += [",".join(str(value) for value in row) for row in gradebook_rows]
+    path.write_text("\n".join(lines) + "\n")
+    header, ranges = gradebook.chunk_ranges(str(path), chunk_size=40)
+    assert header.startswith(b"student,")
+    assert len(ranges) > 2
+    totals, rows = gradebook.compute(str(path), workers=2, chunk_size=40)
+    assert rows == len(gradebook_rows)
+    assert results(totals) == expected(gradebook_rows)
+
+
+def test_jsonl(tmp_path, gradebook_rows):
+    path = tmp_path / "gradebook.jsonl"
+    keys = ("student", "grade_type", "task", "grade", "weight", "max_grade")
+    path.write_text("".join(json.dumps(dict(zip(keys, row))) + "\n" for row in gradebook_rows))
+    totals, rows = gradebook.compute(str(path), workers=2, chunk_size=100)
+    assert rows == len(gradebook_rows)
+    assert results(totals) == expected(gradebook_rows)
+
+
+def test_quoted_fields_spanning_lines_stay_in_one_chunk(tmp_path, gradebook_rows):
+    path = tmp_path / "gradebook.csv"
+    rows = [(student, grade_type, f'"{task},\n""part""\n2"', grade, weight, max_grade)
+            for student, grade_type, task, grade, weight, max_grade in gradebook_rows]
+    lines = ["student,grade_type,task,grade,weight,max_grade"]
+    lines += [",".join(str(value) for value in row) for row in rows]
+    path.write_text("\n".join(lines) + "\n")
+    _, ranges = gradebook.chunk_ranges(str(path), chunk_size=10)
+    assert len(ranges) == len(gradebook_rows)
+    totals, count = gradebook.compute(str(path), workers=2, chunk_size=10)
+    assert count == len(gradebook_rows)
+    assert results(totals) == expected(gradebook_rows)
+    assert gradebook.process_chunk(str(path), b"student,grade_type,task,grade,weight,max_grade\n", *ranges[0]) == {
+        ("ana", ""): ["Percentage", 90.0 * 25, 25.0, 1],
+    }
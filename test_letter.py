@@ -1,21 +1,34 @@
 import time
 import logging
-from selenium import webdriver
+from browser_lifecycle import browsers, open_clean
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
+from waits import AdaptiveWait as WebDriverWait
+from grade_engine import GradeEngine
+from result_display import expect_result
+from page_metrics import PageMetrics, measured
+from text_entry import enter_text
+from letter_select import select_letter
 from selenium.webdriver.support import expected_conditions as EC
+from log_buffer import install_logging
+from navigation import grade_type_url
 
 class TestGradeCalculator:
     def setup_method(self, method):
         """Initial setup of the WebDriver with logging configuration."""
-        logging.basicConfig(level=logging.INFO)
-        self.driver = webdriver.Chrome()
-        self.driver.get("https://softekogradecalculator.netlify.app/calculator/grade-calculator?type=letter")
+        install_logging()
+        with browsers.setting_up(method.__qualname__) as driver:
+            self.driver = open_clean(driver, grade_type_url("Letter"))
+            self.engine = None
+            self.metrics = PageMetrics(self.driver)
 
     def teardown_method(self, method):
-        """Tear down the WebDriver session."""
-        self.driver.quit()
+        """Clear the page's timing marks and hand the browser back to the manager, which recycles it when due."""
+        try:
+            self.metrics.clear()
+        finally:
+            browsers.end()
 
+    @measured("add_row")
     def add_row(self, task: str, grade: str, weight: int):
         """Utility method to add a row with task, grade, and weight data."""
         driver = self.driver
@@ -31,31 +44,33 @@ class TestGradeCalculator:
             time.sleep(0.5)  # Wait for the row to be added
         except Exception as e:
             driver.save_screenshot("failed_click.png")
-            logging.error(f"Failed to click '+ Add new row': {str(e)}")
+            logging.error("Failed to click '+ Add new row': %s", e)
             raise
 
         # Enter data into the newly created row
         self.fill_details(task, grade, weight)
+        if self.engine is not None:
+            self.engine.add(task, grade, weight)
+            expect_result(driver, self.engine)
 
+    @measured("fill_details")
     def fill_details(self, task: str, grade: str, weight: int):
         """Fill in the details of the new row."""
         driver = self.driver
         try:
             # Access the last input fields to enter the data
             task_inputs = driver.find_elements(By.CSS_SELECTOR, "input[placeholder='e.g Assignment']")
-            task_inputs[-1].clear()
-            task_inputs[-1].send_keys(task)
+            enter_text(driver, task_inputs[-1], task)
 
             grade_selects = driver.find_elements(By.CSS_SELECTOR, "select[name*='rows'][name*='grade']")
-            grade_selects[-1].send_keys(grade)
+            select_letter(driver, grade_selects[-1], grade)
 
             weight_inputs = driver.find_elements(By.CSS_SELECTOR, "input[name*='rows'][name*='weight']")
-            weight_inputs[-1].clear()
-            weight_inputs[-1].send_keys(str(weight))
+            enter_text(driver, weight_inputs[-1], str(weight))
 
-            logging.info(f"Data entered successfully: {task}, {grade}, {weight}")
+            logging.info("Data entered successfully: %s, %s, %s", task, grade, weight)
         except Exception as e:
-            logging.error(f"Error entering data in the new row: {str(e)}")
+            logging.error("Error entering data in the new row: %s", e)
             driver.save_screenshot("data_input_error.png")
             raise
 
@@ -67,9 +82,10 @@ class TestGradeCalculator:
         try:
             form = driver.find_element(By.CSS_SELECTOR, "form.flex.flex-col.gap-2")
             initial_rows = len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row"))
-            logging.info(f"Initial rows count: {initial_rows}")
+            logging.info("Initial rows count: %s", initial_rows)
+            self.engine = GradeEngine("Letter", initial_rows)
         except Exception as e:
-            logging.error(f"Error counting initial rows: {str(e)}")
+            logging.error("Error counting initial rows: %s", e)
             driver.save_screenshot("initial_rows_error.png")
             raise
 
@@ -90,9 +106,9 @@ class TestGradeCalculator:
                 added_rows = len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row"))
                 expected_rows = initial_rows + rows_per_cycle
                 assert added_rows == expected_rows, f"Expected {expected_rows} rows but found {added_rows}"
-                logging.info(f"Rows after addition in cycle {cycle + 1}: {added_rows}")
+                logging.info("Rows after addition in cycle %s: %s", cycle + 1, added_rows)
             except AssertionError as e:
-                logging.error(f"Assertion error in cycle {cycle + 1}: {str(e)}")
+                logging.error("Assertion error in cycle %s: %s", cycle + 1, e)
                 driver.save_screenshot(f"row_count_error_cycle_{cycle + 1}.png")
                 raise
 
@@ -101,10 +117,13 @@ class TestGradeCalculator:
                 reset_button = WebDriverWait(driver, 10).until(
                     EC.element_to_be_clickable((By.XPATH, "//button[normalize-space()='Reset/Clear']"))
                 )
-                reset_button.click()
-                logging.info(f"Clicked 'Reset/Clear' button successfully in cycle {cycle + 1}.")
+                with self.metrics.measure("reset"):
+                    reset_button.click()
+                self.engine.reset()
+                expect_result(driver, self.engine)
+                logging.info("Clicked 'Reset/Clear' button successfully in cycle %s.", cycle + 1)
             except Exception as e:
-                logging.error(f"Failed to click 'Reset/Clear' button in cycle {cycle + 1}: {str(e)}")
+                logging.error("Failed to click 'Reset/Clear' button in cycle %s: %s", cycle + 1, e)
                 driver.save_screenshot(f"failed_reset_click_cycle_{cycle + 1}.png")
                 raise
 
@@ -112,9 +131,9 @@ class TestGradeCalculator:
             try:
                 cleared_rows = len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row"))
                 assert cleared_rows == initial_rows, f"Expected {initial_rows} rows after reset in cycle {cycle + 1} but got {cleared_rows}"
-                logging.info(f"Rows after reset in cycle {cycle + 1}: {cleared_rows}")
+                logging.info("Rows after reset in cycle %s: %s", cycle + 1, cleared_rows)
             except AssertionError as e:
-                logging.error(f"Assertion error after reset in cycle {cycle + 1}: {str(e)}")
+                logging.error("Assertion error after reset in cycle %s: %s", cycle + 1, e)
                 driver.save_screenshot(f"reset_error_cycle_{cycle + 1}.png")
                 raise
 
@@ -126,9 +145,10 @@ class TestGradeCalculator:
         try:
             form = driver.find_element(By.CSS_SELECTOR, "form.flex.flex-col.gap-2")
             initial_rows = len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row"))
-            logging.info(f"Initial rows count: {initial_rows}")
+            logging.info("Initial rows count: %s", initial_rows)
+            self.engine = GradeEngine("Letter", initial_rows)
         except Exception as e:
-            logging.error(f"Error counting initial rows: {str(e)}")
+            logging.error("Error counting initial rows: %s", e)
             driver.save_screenshot("initial_rows_error.png")
             raise
 
@@ -147,26 +167,29 @@ class TestGradeCalculator:
         added_rows = len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row"))
         expected_rows = initial_rows + len(tasks)
         assert added_rows == expected_rows, f"Expected {expected_rows} rows but found {added_rows}"
-        logging.info(f"Rows after addition: {added_rows}")
+        logging.info("Rows after addition: %s", added_rows)
 
         # Click the "cross" button to delete the first added row
         try:
             # Locate the first row and its delete button
             row = form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row")[initial_rows]
             delete_button = row.find_element(By.XPATH, ".//button")
-            driver.execute_script("arguments[0].click();", delete_button)
-            logging.info("Deleted the first row successfully.")
+            with self.metrics.measure("delete"):
+                driver.execute_script("arguments[0].click();", delete_button)
+            self.engine.delete_at(initial_rows)
+            shown = expect_result(driver, self.engine)
+            logging.info("Deleted the first row successfully, page shows: %s", shown)
             time.sleep(1)  # Allow time to visually confirm deletion
         except Exception as e:
-            logging.error(f"Failed to locate the delete button: {str(e)}")
+            logging.error("Failed to locate the delete button: %s", e)
             driver.save_screenshot("delete_button_error.png")
             raise
 
         # Wait for the row to be removed and verify
+        expected_remaining = self.engine.row_count
         WebDriverWait(driver, 10).until(
-            lambda d: len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row")) == expected_rows - 1
+            lambda d: len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row")) == expected_remaining
         )
         remaining_rows = len(form.find_elements(By.CSS_SELECTOR, "div.flex.flex-row"))
-        expected_remaining = expected_rows - 1
         assert remaining_rows == expected_remaining, f"Expected {expected_remaining} rows after deletion but found {remaining_rows}"
-        logging.info(f"Rows after deletion: {remaining_rows}")
+        logging.info("Rows after deletion: %s", remaining_rows)
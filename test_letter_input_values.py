@@ -1,16 +1,11 @@
 import pytest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
+from waits import AdaptiveWait as WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, ElementClickInterceptedException
-
-@pytest.fixture
-def driver():
-    driver = webdriver.Chrome()
-    driver.get("https://softekogradecalculator.netlify.app/calculator/grade-calculator?type=letter")
-    yield driver
-    driver.quit()
+from text_entry import enter_text, compare_modes
+from letter_select import select_letter
+from grade_engine import LETTER_SCALE
 
 def wait_for_clickable(driver, locator, timeout=10):
     """Wait for an element to be clickable and return it."""
@@ -36,9 +31,12 @@ def add_row(driver, task, grade, weight):
     # Wait for inputs to appear and fill them out
     inputs = WebDriverWait(driver, 10).until(lambda d: d.find_elements(By.CSS_SELECTOR, "input[type='text']"))
     selects = driver.find_elements(By.CSS_SELECTOR, "select")
-    inputs[0].send_keys(task)
-    selects[0].send_keys(grade)
-    inputs[1].send_keys(str(weight))
+    enter_text(driver, inputs[0], task)
+    if grade in LETTER_SCALE:
+        select_letter(driver, selects[0], grade)
+    else:
+        selects[0].send_keys(grade)  # typed as-is, so the test sees what the select does with it
+    enter_text(driver, inputs[1], weight)
 
 @pytest.mark.parametrize("task, grade, weight", [
     ("Homework", "A", 20),
@@ -49,6 +47,7 @@ def test_add_and_reset_rows(driver, task, grade, weight):
     add_row(driver, task, grade, weight)
     # Add assertions here to check for the expected outcomes or states
 
+@pytest.mark.text_entry("keystroke")
 def test_invalid_input_data(driver):
     """Test if the input field prevents invalid data from being accepted."""
     invalid_task = "123416283182"
@@ -76,3 +75,12 @@ def test_invalid_input_data(driver):
         pytest.fail("Input fields are retaining invalid values.")
     else:
         print("Test passed: Input fields did not retain invalid values.")
+
+def test_fast_entry_speedup(driver):
+    """Measure how much faster fast text entry is than typing on a long input."""
+    handle_click(driver, (By.XPATH, "//button[normalize-space()='+ Add new row']"))
+    task_input = WebDriverWait(driver, 10).until(lambda d: d.find_elements(By.CSS_SELECTOR, "input[type='text']"))[0]
+    long_task = "Semester project presentation and written report " * 4
+    fast, keystroke, speedup = compare_modes(driver, task_input, long_task)
+    assert task_input.get_attribute("value") == long_task
+    assert fast < keystroke, f"Fast entry took {fast:.3f}s, typing took {keystroke:.3f}s"
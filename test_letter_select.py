@@ -0,0 +1,71 @@
+import pytest
+from selenium.webdriver.common.by import By
+
+import grade_engine
+from fake_driver import FakeDriver
+from grade_engine import LETTER_SCALE
+from letter_select import build_index, options_index, select_letter
+from navigation import BASE_URL
+
+
+@pytest.fixture
+def driver():
+    driver = FakeDriver()
+    driver.get(BASE_URL + "?type=letter")
+    return driver
+
+
+def letter_selects(driver):
+    return driver.find_elements(By.CSS_SELECTOR, "select[name*='rows'][name*='grade']")
+
+
+def test_index_covers_the_reference_scale(driver):
+    _, index = options_index(driver, letter_selects(driver)[0], refresh=True)
+    assert list(index) == list(LETTER_SCALE)
+
+
+@pytest.mark.parametrize("letter", ["B", "B-", "C", "D+"])
+def test_select_is_exact_where_type_ahead_is_not(driver, letter):
+    typed, selected = letter_selects(driver)[:2]
+    typed.send_keys(letter)
+    select_letter(driver, selected, letter)
+    assert selected.get_attribute("value") == letter
+    if letter == "B":
+        assert typed.get_attribute("value") == "B+"
+
+
+def test_options_are_read_once_per_page_load(driver):
+    for select, letter in zip(letter_selects(driver), ["A", "B", "C"]):
+        select_letter(driver, select, letter)
+    assert driver.scripts.count("read_options") == 1
+    assert driver.scripts.count("select_option") == 3
+
+    driver.refresh()
+    select = letter_selects(driver)[0]
+    select_letter(driver, select, "F")
+    assert select.get_attribute("value") == "F"
+    assert driver.scripts.count("read_options") == 2
+
+
+def test_invalid_letter_is_rejected(driver):
+    with pytest.raises(ValueError, match="Invalid letter grade"):
+        select_letter(driver, letter_selects(driver)[0], "E")
+
+
+def test_index_must_match_the_scale(monkeypatch):
+    monkeypatch.setattr(grade_engine, "scale_confirmed", False)
+    options = [["Select", ""]] + [[letter, letter] for letter in LETTER_SCALE if letter != "D-"]
+    with pytest.raises(ValueError, match=r"missing \['D-'\]"):
+        build_index(options + [["E", "E"]])
+    build_index(options + [["D-", "D-"]])
+    assert not grade_engine.scale_confirmed
+
+
+def test_grade_point_options_confirm_or_reject_the_scale(monkeypatch):
+    monkeypatch.setattr(grade_engine, "scale_confirmed", False)
+    options = [[letter, str(points)] for letter, (points, _) in LETTER_SCALE.items()]
+    assert build_index(options)["A-"] == "3.7"
+    assert grade_engine.scale_confirmed
+    options[0] = ["A+", "4.0"]
+    with pytest.raises(ValueError, match="differ from LETTER_SCALE: {'A\\+': 4.0}"):
+        build_index(options)
@@ -0,0 +1,115 @@
+import gc
+import json
+import logging
+import weakref
+
+import pytest
+
+from log_buffer import LogBuffer
+
+
+@pytest.fixture
+def log_buffer():
+    log_buffer = LogBuffer(capacity=5).install()
+    yield log_buffer
+    log_buffer.uninstall()
+
+
+class Counted:
+    """Counts how often the message it is part of gets formatted."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "value"
+
+
+def test_records_are_tagged_and_the_oldest_fall_off(log_buffer):
+    log_buffer.start_test("test_a")
+    for n in range(4):
+        logging.info("a %s", n)
+    log_buffer.start_test("test_b")
+    for n in range(3):
+        logging.info("b %s", n)
+    assert [record.getMessage() for record in log_buffer.records()] == ["a 2", "a 3", "b 0", "b 1", "b 2"]
+    assert [record.getMessage() for record in log_buffer.records("test_a")] == ["a 2", "a 3"]
+    assert log_buffer.overhead["test_a"]["records"] == 4
+    assert log_buffer.overhead["test_b"]["handler_seconds"] > 0
+
+
+def test_records_keep_no_references_to_their_arguments(log_buffer, tmp_path, monkeypatch):
+    # pytest's log capture keeps its own copy of every record for the report
+    monkeypatch.setattr(logging.getLogger(), "handlers", [log_buffer.handler])
+    log_buffer.start_test("test_x.py::TestX::test_rows[A-1]")
+    value = Counted()
+    alive = weakref.ref(value)
+    logging.info("Data entered successfully: %s", value)
+    del value
+    gc.collect()
+    assert alive() is None
+    [record] = log_buffer.records()
+    assert record.args is None and record.msg == "Data entered successfully: value"
+
+    path = log_buffer.dump_test("test_x.py::TestX::test_rows[A-1]", root=str(tmp_path))
+    assert path == str(tmp_path / "test_x.py_TestX_test_rows_A-1.jsonl")
+    with open(path) as f:
+        [entry] = [json.loads(line) for line in f]
+    assert entry["message"] == "Data entered successfully: value"
+    assert entry["level"] == "INFO"
+    assert entry["test"] == "test_x.py::TestX::test_rows[A-1]"
+
+
+def test_records_below_the_level_are_not_formatted(log_buffer):
+    value = Counted()
+    logging.debug("Row state: %s", value)
+    assert value.formatted == 0
+    assert log_buffer.records() == []
+
+
+def test_records_after_a_test_belong_to_no_test(log_buffer):
+    log_buffer.start_test("test_a")
+    logging.info("during")
+    log_buffer.end_test()
+    logging.info("after")
+    assert [record.test for record in log_buffer.records()] == ["test_a", None]
+
+
+def test_exceptions_are_kept_with_their_traceback(log_buffer, tmp_path):
+    log_buffer.start_test("test_error")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.exception("Failed to click")
+    log_buffer.dump(str(tmp_path / "all.jsonl"))
+    with open(tmp_path / "all.jsonl") as f:
+        entry = json.loads(f.read())
+    assert entry["level"] == "ERROR"
+    assert "ValueError: boom" in entry["exception"]
+    assert log_buffer.records()[0].exc_info is None
+
+
+def test_record_cost_is_calibrated_outside_the_buffer(log_buffer):
+    log_buffer.start_test("test_cost")
+    cost = log_buffer.record_cost(calls=200)
+    assert cost > 0
+    assert log_buffer.record_cost() == cost
+    assert log_buffer.records() == []
+    assert log_buffer.overhead["test_cost"]["records"] == 0
+    logging.info("one record")
+    entry = log_buffer.overhead["test_cost"]
+    assert log_buffer.test_seconds("test_cost") == entry["handler_seconds"] + cost
+
+
+def test_zero_capacity_leaves_logging_unbuffered():
+    log_buffer = LogBuffer(capacity=0).install()
+    assert not log_buffer.installed
+    assert log_buffer.records() == []
+
+
+def test_pytest_capture_keeps_working_next_to_the_buffer(log_buffer, caplog):
+    log_buffer.start_test("test_caplog")
+    logging.info("Selected grade type: %s via %s", "Letter", "url")
+    assert caplog.messages == ["Selected grade type: Letter via url"]
+    assert [record.getMessage() for record in log_buffer.records("test_caplog")] == caplog.messages
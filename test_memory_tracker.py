@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import memory_tracker
+from fake_driver import FakeDriver
+from memory_tracker import MemoryTracker, sample_memory, MB
+
+
+class Process:
+    """A psutil.Process stand-in with a fixed command line, RSS and children."""
+
+    def __init__(self, cmdline, rss=0, children=()):
+        self._cmdline = cmdline
+        self.rss = rss
+        self._children = list(children)
+
+    def cmdline(self):
+        return self._cmdline
+
+    def memory_info(self):
+        return SimpleNamespace(rss=self.rss)
+
+    def children(self, recursive=False):
+        if not recursive:
+            return list(self._children)
+        return [descendant for child in self._children for descendant in [child] + child.children(recursive=True)]
+
+
+def sample(browser, renderer, heap=0):
+    return {"browser_rss": browser * MB, "renderer_rss": renderer * MB, "js_heap": heap * MB}
+
+
+def test_growth_over_threshold_is_flagged():
+    tracker = MemoryTracker(growth_threshold=50 * MB)
+    tracker.record("test_small", sample(200, 100), sample(210, 110))
+    result = tracker.record("test_leaky", sample(200, 100), sample(240, 180, 30))
+    assert result["total_growth"] == 120 * MB
+    assert result["growth"]["js_heap"] == 30 * MB
+    assert tracker.flagged() == ["test_leaky"]
+
+
+def test_over_budget():
+    tracker = MemoryTracker(memory_budget=500 * MB)
+    assert not tracker.over_budget(sample(300, 150))
+    assert tracker.over_budget(sample(300, 250))
+
+
+def test_sample_without_service_reads_js_heap():
+    driver = FakeDriver()
+    driver.js_heap = 12 * MB
+    result = sample_memory(driver)
+    assert result == {"browser_rss": 0, "renderer_rss": 0, "js_heap": 12 * MB}
+
+
+def test_sample_counts_only_this_sessions_browser(monkeypatch):
+    def browser(profile, port, rss, renderer_rss):
+        return Process(["chrome", f"--user-data-dir={profile}", f"--remote-debugging-port={port}"], rss * MB, [
+            Process(["chrome", "--type=renderer", f"--user-data-dir={profile}"], renderer_rss * MB),
+        ])
+
+    # Two sessions on one shared chromedriver
+    chromedriver = Process(["chromedriver"], children=[browser("/tmp/a", 9001, 100, 50), browser("/tmp/b", 9002, 300, 80)])
+    monkeypatch.setattr(memory_tracker.psutil, "Process", lambda pid: chromedriver)
+    driver = FakeDriver()
+    driver.service = SimpleNamespace(process=SimpleNamespace(pid=1))
+    driver.capabilities = {"chrome": {"userDataDir": "/tmp/b"}, "goog:chromeOptions": {"debuggerAddress": "localhost:9002"}}
+    assert sample_memory(driver) == {"browser_rss": 300 * MB, "renderer_rss": 80 * MB, "js_heap": 0}
+    driver.capabilities = {"goog:chromeOptions": {"debuggerAddress": "127.0.0.1:9001"}}
+    assert sample_memory(driver)["browser_rss"] == 100 * MB
+    driver.capabilities = {}
+    assert memory_tracker.browser_processes(driver) == []
@@ -0,0 +1,70 @@
+import pytest
+
+import navigation
+from fake_driver import FakeDriver
+from navigation import GradeTypeNavigator, grade_type_url, BASE_URL, ROUTES
+
+
+def navigator_with(driver=None, **kwargs):
+    return GradeTypeNavigator(driver, timings={route: [] for route in ROUTES}, broken=set(), **kwargs)
+
+
+def test_grade_type_url():
+    assert grade_type_url("Letter") == f"{BASE_URL}?type=letter"
+
+
+def test_every_route_is_tried_before_the_fastest_wins():
+    navigator = navigator_with()
+    assert navigator.choose_route("Letter") == "click"
+    navigator.timings["click"] = [0.4, 0.3]
+    assert navigator.choose_route("Letter") == "url"
+    navigator.timings["url"] = [1.2]
+    navigator.timings["tab"] = [0.05, 0.9, 0.04]
+    assert navigator.choose_route("Letter") == "tab"
+
+
+def test_broken_and_stateful_routes_are_skipped():
+    navigator = navigator_with()
+    navigator.timings.update({"click": [0.1], "url": [1.0], "tab": [0.01]})
+    navigator.broken.add(("tab", "Points"))
+    assert navigator.choose_route("Points") == "click"
+    assert navigator.choose_route("Letter") == "tab"
+    assert navigator.choose_route("Letter", fresh=True) == "url"
+
+
+def test_navigators_share_the_process_timings(monkeypatch):
+    monkeypatch.setattr(navigation, "route_timings", {route: [] for route in ROUTES})
+    monkeypatch.setattr(navigation, "broken_routes", set())
+    first = GradeTypeNavigator(driver=None)
+    first.timings["click"].append(0.2)
+    second = GradeTypeNavigator(driver=None)
+    assert second.choose_route("Letter") == "url"
+
+
+@pytest.fixture
+def fake_driver():
+    driver = FakeDriver()
+    driver.get(BASE_URL)
+    return driver
+
+
+def test_route_that_lands_on_the_wrong_form_is_dropped_without_waiting_out_the_timeout(fake_driver, monkeypatch):
+    navigator = navigator_with(fake_driver, timeout=60, settle=0)
+    monkeypatch.setattr(navigator, "_via_click", lambda grade_type: None)  # leaves the Percentage form up
+    assert navigator.switch("Letter") == "url"
+    assert ("click", "Letter") in navigator.broken
+
+
+def test_tab_route_times_only_warm_switches_and_closes_its_tabs(fake_driver):
+    navigator = navigator_with(fake_driver)
+    navigator.timings.update({"click": [5.0], "url": [5.0]})
+    assert navigator.switch("Letter") == "tab"
+    assert navigator.timings["tab"] == []
+    navigator.switch("Points")
+    assert navigator.switch("Letter") == "tab"
+    assert len(navigator.timings["tab"]) == 1
+    assert len(fake_driver.window_handles) == 3
+
+    navigator.close()
+    assert fake_driver.window_handles == ["window-0"]
+    assert fake_driver.current_window_handle == "window-0"
@@ -0,0 +1,51 @@
+from fake_driver import FakeDriver
+from page_metrics import PageMetrics, measured
+
+
+def fake_driver():
+    driver = FakeDriver()
+    driver.performance = {"TaskDuration": 1.0, "LayoutCount": 10, "Timestamp": 123}
+    driver.performance_now = 1000.0
+    return driver
+
+
+class Helpers:
+    def __init__(self, driver, enabled):
+        self.driver = driver
+        self.metrics = PageMetrics(driver, enabled=enabled)
+
+    @measured("add_row")
+    def add_row(self):
+        self.driver.performance["TaskDuration"] += 0.02
+        self.driver.performance["LayoutCount"] += 3
+        self.driver.long_tasks.append({"start": self.driver.performance_now + 5, "duration": 60})
+        self.driver.performance_now += 30
+        return "added"
+
+
+def test_helper_metrics_are_recorded():
+    helpers = Helpers(fake_driver(), enabled=True)
+    assert helpers.add_row() == "added"
+    record, = helpers.metrics.records
+    assert record["action"] == "add_row"
+    assert record["devtools"]["LayoutCount"] == 3
+    assert round(record["main_thread"], 3) == 0.02
+    assert record["page_time"] == 0.03
+    assert record["harness"] == max(record["wall"] - record["main_thread"], 0.0)
+    assert len(record["long_tasks"]) == 1
+
+
+def test_disabled_metrics_do_not_touch_the_driver():
+    helpers = Helpers(None, enabled=False)
+    helpers.driver = fake_driver()
+    helpers.metrics.driver = None
+    assert helpers.add_row() == "added"
+    assert helpers.metrics.records == []
+
+
+def test_clear_removes_the_page_marks_only_when_enabled():
+    driver = fake_driver()
+    PageMetrics(driver, enabled=False).clear()
+    assert driver.scripts == []
+    PageMetrics(driver, enabled=True).clear()
+    assert driver.scripts == ["clear_marks"]
@@ -0,0 +1,70 @@
+import pytest
+from selenium.webdriver.common.by import By
+
+import page_ready
+from fake_driver import FakeDriver
+from navigation import BASE_URL
+
+
+@pytest.fixture
+def readiness(monkeypatch):
+    """A report and known-pristine forms of its own, so the fake gates never reach the session's."""
+    monkeypatch.setattr(page_ready, "pristine_forms", {})
+    return page_ready.ReadinessReport()
+
+
+def fresh_driver():
+    driver = FakeDriver()
+    driver.get(BASE_URL)
+    return driver
+
+
+def test_first_gate_resets_and_keeps_the_pristine_form(readiness):
+    driver = fresh_driver()
+    entry = page_ready.ensure_initial_state(driver, into=readiness)
+    assert entry["reset"] and entry["estimated_saving"] == 0
+    assert "click" in driver.scripts
+    assert page_ready.pristine_forms[BASE_URL] == driver.execute_script(page_ready.FORM_STATE)
+    assert readiness.records == [entry]
+    assert entry not in page_ready.report.records
+
+
+def test_pristine_form_skips_reset(readiness):
+    page_ready.ensure_initial_state(fresh_driver(), into=readiness)
+    driver = fresh_driver()
+    entry = page_ready.ensure_initial_state(driver, into=readiness)
+    assert not entry["reset"]
+    assert "click" not in driver.scripts
+    assert entry["estimated_saving"] == page_ready.LEGACY_RESET_SLEEP + readiness.reset_cost()
+    assert readiness.estimated_saving() == entry["estimated_saving"]
+
+
+def test_dirty_form_is_reset_to_the_known_pristine_one(readiness):
+    page_ready.ensure_initial_state(fresh_driver(), into=readiness)
+    driver = fresh_driver()
+    driver.find_elements(By.CSS_SELECTOR, "input[placeholder='e.g Assignment']")[0].send_keys("Left over")
+    entry = page_ready.ensure_initial_state(driver, into=readiness)
+    assert entry["reset"] and entry["estimated_saving"] == 0
+    assert driver.execute_script(page_ready.FORM_STATE) == page_ready.pristine_forms[BASE_URL]
+
+
+def test_a_form_served_dirty_is_not_taken_as_pristine(readiness):
+    page_ready.ensure_initial_state(fresh_driver(), into=readiness)
+    driver = fresh_driver()
+    driver.find_element(By.XPATH, "//button[normalize-space()='+ Add new row']").click()
+    assert page_ready.ensure_initial_state(driver, into=readiness)["reset"]
+
+
+def test_script_timeout_is_restored(readiness):
+    driver = fresh_driver()
+    driver.set_script_timeout(7)
+    page_ready.wait_until_ready(driver, timeout=10)
+    assert driver.timeouts.script == 7
+
+
+def test_gate_passes_without_react_hydration(readiness, monkeypatch):
+    driver = fresh_driver()
+    answer = {"ready_at": 0.0, "state": driver.execute_script(page_ready.FORM_STATE), "hydrated": False}
+    monkeypatch.setattr(driver, "execute_async_script", lambda script, *args: answer)
+    entry = page_ready.ensure_initial_state(driver, into=readiness)
+    assert not entry["hydrated"]
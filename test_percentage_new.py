@@ -1,18 +1,21 @@
 import time
 import logging
-from selenium import webdriver
+from browser_lifecycle import browsers, open_clean
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
+from waits import AdaptiveWait as WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from log_buffer import install_logging
+from navigation import BASE_URL
+from text_entry import enter_text
 
 class TestGradeCalculator:
     def setup_method(self, method):
-        logging.basicConfig(level=logging.INFO)
-        self.driver = webdriver.Chrome()
-        self.driver.get("https://softekogradecalculator.netlify.app/calculator/grade-calculator")
+        install_logging()
+        with browsers.setting_up(method.__qualname__) as driver:
+            self.driver = open_clean(driver, BASE_URL)
 
     def teardown_method(self, method):
-        self.driver.quit()
+        browsers.end()
 
     def add_row(self, task: str, grade: int, weight: int):
         driver = self.driver
@@ -32,14 +35,11 @@ class TestGradeCalculator:
         driver = self.driver
         try:
             task_inputs = driver.find_elements(By.CSS_SELECTOR, "input[placeholder='e.g Assignment']")
-            task_inputs[-1].clear()
-            task_inputs[-1].send_keys(task)
+            enter_text(driver, task_inputs[-1], task)
             grade_inputs = driver.find_elements(By.CSS_SELECTOR, "input[name*='rows'][name*='grade']")
-            grade_inputs[-1].clear()
-            grade_inputs[-1].send_keys(str(grade))
+            enter_text(driver, grade_inputs[-1], str(grade))
             weight_inputs = driver.find_elements(By.CSS_SELECTOR, "input[name*='rows'][name*='weight']")
-            weight_inputs[-1].clear()
-            weight_inputs[-1].send_keys(str(weight))
+            enter_text(driver, weight_inputs[-1], str(weight))
         except Exception as e:
             driver.save_screenshot("data_input_error.png")
             raise
@@ -0,0 +1,76 @@
+import logging
+import os
+
+import pytest
+
+from chrome_pool import new_session
+from device_profiles import PROFILES, matrix
+from fake_driver import FakeDriver
+from perf_budgets import install_probe, load_budgets, max_ms, measure, summarize, STATISTICS
+
+
+BUDGETS = load_budgets()
+
+
+@pytest.fixture(scope="module", params=PROFILES)
+def budget_driver(request):
+    """One browser per device profile, emulating it from the first page load."""
+    driver = new_session(device=request.param)
+    driver.device_profile = request.param
+    yield driver
+    driver.quit()
+
+
+def test_summarize():
+    summary = summarize([12.0, 10.0, 50.0, 11.0])
+    assert summary["min"] == 10.0
+    assert summary["median"] == 11.5
+    assert summary["p95"] == 50.0
+    assert summary["samples"] == [12.0, 10.0, 50.0, 11.0]
+
+
+def test_probe_is_registered_once_per_driver():
+    driver, other = FakeDriver(), FakeDriver()
+    assert install_probe(driver) == install_probe(driver) == "1"
+    install_probe(other)
+    assert [command for command, _ in driver.commands] == ["Page.addScriptToEvaluateOnNewDocument"]
+    assert [command for command, _ in other.commands] == ["Page.addScriptToEvaluateOnNewDocument"]
+
+
+def test_budget_file_is_versioned():
+    assert BUDGETS["version"] >= 1
+    names = [budget["name"] for budget in BUDGETS["budgets"]]
+    assert len(names) == len(set(names))
+    assert all(budget["statistic"] in STATISTICS for budget in BUDGETS["budgets"])
+
+
+def test_profile_budgets():
+    assert max_ms(BUDGETS["budgets"][0]) == BUDGETS["budgets"][0]["max_ms"]
+    for budget in BUDGETS["budgets"]:
+        for profile in PROFILES:
+            limit = max_ms(budget, profile)
+            assert limit is None or limit >= budget["max_ms"]
+
+
+@pytest.mark.skipif(
+    not os.environ.get("GRADECAL_URL"),
+    reason="budgets are measured against the local app: serve a snapshot (snapshots.py serve) and set GRADECAL_URL",
+)
+@pytest.mark.parametrize("budget", BUDGETS["budgets"], ids=lambda budget: budget["name"])
+def test_performance_budget(budget_driver, budget, request):
+    profile = budget_driver.device_profile
+    limit = max_ms(budget, profile)
+    if limit is None:
+        pytest.skip(f"{budget['name']} has no budget for the {profile} profile")
+    summary = summarize(measure(budget_driver, budget))
+    measured = summary[budget["statistic"]]
+    matrix.record(budget["name"], profile, budget["statistic"], measured)
+    request.node.user_properties.append(("budget", {"budget": budget, "profile": profile, "measured": summary}))
+    logging.info("%s (%s): %s %.1f ms (budget %s ms)", budget["name"], profile, budget["statistic"], measured, limit)
+    if measured > limit:
+        distribution = ", ".join(f"{name} {summary[name]:.1f}" for name in STATISTICS)
+        pytest.fail(
+            f"{budget['description']}: {budget['statistic']} was {measured:.1f} ms on the {profile} profile, "
+            f"budget {limit} ms (budget file v{BUDGETS['version']}). Distribution in ms: {distribution}; "
+            f"samples {summary['samples']}"
+        )
@@ -0,0 +1,88 @@
+import glob
+import json
+import os
+import shutil
+import sqlite3
+
+import perf_trends
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def copy_reports(directory):
+    """The repository's saved pytest-html reports, copied so tests never touch the originals."""
+    copies = []
+    for report in sorted(glob.glob(os.path.join(HERE, "*.html"))):
+        copies.append(shutil.copy(report, str(directory / os.path.basename(report))))
+    return copies
+
+
+def test_parse_duration():
+    assert perf_trends.parse_duration("00:01:16") == 76
+    assert perf_trends.parse_duration("250 ms") == 0.25
+
+
+def test_import_existing_reports(tmp_path):
+    connection = perf_trends.connect(str(tmp_path / "trends.db"))
+    reports = copy_reports(tmp_path)
+    assert len(reports) == 8
+    total = sum(perf_trends.import_report(connection, report) for report in reports)
+    assert total == connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    history = perf_trends.trend(connection, "test_letter_input_values.py::test_add_and_reset_rows[Homework-A-20]")
+    assert [duration for _, _, duration in history] == [4, 7]
+
+    # Re-importing a report leaves its run alone instead of duplicating it
+    perf_trends.import_report(connection, str(tmp_path / "report.html"))
+    assert connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 8
+
+
+def test_overwritten_report_adds_a_run(tmp_path):
+    connection = perf_trends.connect(str(tmp_path / "trends.db"))
+    report = tmp_path / "report.html"
+    shutil.copy(os.path.join(HERE, "report_final.html"), report)
+    first = perf_trends.import_report(connection, str(report))
+    # pytest writes the next run's report over the same file
+    shutil.copy(os.path.join(HERE, "report_test_all.html"), report)
+    second = perf_trends.import_report(connection, str(report))
+    assert connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 2
+    assert connection.execute("SELECT COUNT(*) FROM results").fetchone()[0] == first + second
+
+
+def test_databases_keyed_by_path_are_migrated(tmp_path):
+    path = str(tmp_path / "trends.db")
+    old = sqlite3.connect(path)
+    old.executescript(
+        "CREATE TABLE runs (id INTEGER PRIMARY KEY, source TEXT NOT NULL UNIQUE, started_at TEXT NOT NULL);"
+        "INSERT INTO runs VALUES (1, '/ci/report.html', '2024-01-01T00:00:00');"
+    )
+    old.close()
+    connection = perf_trends.connect(path)
+    report = tmp_path / "report.html"
+    shutil.copy(os.path.join(HERE, "report_final.html"), report)
+    perf_trends.import_report(connection, str(report))
+    assert connection.execute("SELECT id, source FROM runs ORDER BY id").fetchall()[0] == (1, "/ci/report.html")
+    assert connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 2
+
+
+def test_json_results_and_regressions(tmp_path):
+    connection = perf_trends.connect(str(tmp_path / "trends.db"))
+    perf_trends.import_report(connection, os.path.join(HERE, "report_final.html"))
+    results = {
+        "created": 1893456000,
+        "tests": [
+            {"nodeid": "final.py::TestGradeCalculator::test_letter_grade_type", "outcome": "passed",
+             "setup": {"duration": 5.0}, "call": {"duration": 20.0}, "teardown": {"duration": 1.0}},
+            {"nodeid": "final.py::TestGradeCalculator::test_points_grade_type", "outcome": "passed",
+             "call": {"duration": 11.0}},
+        ],
+    }
+    with open(tmp_path / "results.json", "w") as f:
+        json.dump(results, f)
+    perf_trends.import_report(connection, str(tmp_path / "results.json"))
+
+    assert perf_trends.regressions(connection) == [
+        ("final.py::TestGradeCalculator::test_letter_grade_type", 12, 26)
+    ]
+    assert perf_trends.movers(connection, limit=1)[0][3] == 14
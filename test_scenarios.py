@@ -0,0 +1,42 @@
+import pytest
+
+import scenarios
+
+
+@pytest.mark.parametrize("grade_type", scenarios.PARAMETER_SPACE)
+def test_covering_set_covers_every_pair(grade_type):
+    space = scenarios.full_space(grade_type)
+    rows = scenarios.covering_set(grade_type)
+    required = set().union(*(scenarios.interactions(row) for row in space))
+    covered = set().union(*(scenarios.interactions(row) for row in rows))
+    assert covered == required
+    assert len(rows) < len(space)
+    assert all(row in space for row in rows)
+
+
+def test_letter_pairs_need_one_row_per_letter_and_weight():
+    rows = scenarios.covering_set("Letter")
+    assert len(rows) == len(scenarios.LETTER_SCALE) * len(scenarios.WEIGHTS)
+
+
+def test_three_way_is_exhaustive_for_three_parameters():
+    assert len(scenarios.covering_set("Percentage", strength=3)) == len(scenarios.full_space("Percentage"))
+
+
+def test_plan_and_coverage_report():
+    plan = scenarios.scenario_plan(rows_per_session=10)
+    assert all(len(tasks) <= 10 for _, tasks in plan)
+    assert len(set(scenarios.session_ids(plan))) == len(plan)
+
+    report = scenarios.CoverageReport()
+    for grade_type, tasks in plan:
+        report.record(grade_type, tasks, seconds=2.0)
+    summary = report.summary()
+    assert summary["coverage"] == 1.0
+    assert summary["interactions_per_browser_second"] == summary["total"] / (2.0 * len(plan))
+
+
+def test_points_constraint():
+    assert all(row["grade"] <= row["max_grade"] for row in scenarios.full_space("Points"))
+    planned = [task for grade_type, tasks in scenarios.scenario_plan() if grade_type == "Points" for task in tasks]
+    assert all(grade <= max_grade for _, grade, max_grade in planned)
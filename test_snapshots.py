@@ -0,0 +1,89 @@
+import functools
+import threading
+import urllib.error
+import urllib.request
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from snapshots import IMMUTABLE, REVALIDATE, SnapshotStore, serve
+
+
+PAGE = b"""<!DOCTYPE html><html><head>
+<link rel="stylesheet" href="/_next/static/css/app.css">
+<script src="/_next/static/chunks/main.js"></script>
+<script src="https://cdn.example.com/analytics.js"></script>
+</head><body><form class="flex flex-col gap-2"></form></body></html>"""
+
+
+@pytest.fixture
+def live_site(tmp_path):
+    site = tmp_path / "site"
+    (site / "calculator").mkdir(parents=True)
+    (site / "calculator" / "grade-calculator.html").write_bytes(PAGE)
+    (site / "_next" / "static" / "chunks").mkdir(parents=True)
+    (site / "_next" / "static" / "css").mkdir()
+    (site / "fonts").mkdir()
+    (site / "_next" / "static" / "chunks" / "main.js").write_text('import("/_next/static/chunks/letter.js");')
+    (site / "_next" / "static" / "chunks" / "letter.js").write_text("export const grades = ['A+', 'A'];")
+    (site / "_next" / "static" / "css" / "app.css").write_text("@font-face { src: url(/fonts/inter.woff2); }")
+    (site / "fonts" / "inter.woff2").write_bytes(b"wOF2 font")
+
+    class Handler(SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def send_head(self):
+            # Extension-less page route, like the deployed app
+            if self.path.split("?")[0] == "/calculator/grade-calculator":
+                self.path = "/calculator/grade-calculator.html"
+            return super().send_head()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(Handler, directory=str(site)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield site, f"http://127.0.0.1:{server.server_port}/calculator/grade-calculator"
+    server.shutdown()
+
+
+def test_capture_is_content_addressed_and_pinned(tmp_path, live_site):
+    site, url = live_site
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    version = store.capture(url, label="v1")
+    files = store.manifest(version)["files"]
+    assert set(files) == {
+        "/calculator/grade-calculator", "/_next/static/css/app.css", "/_next/static/chunks/main.js",
+        "/_next/static/chunks/letter.js", "/fonts/inter.woff2",
+    }
+    assert store.capture(url) == version
+
+    (site / "_next" / "static" / "chunks" / "letter.js").write_text("export const grades = ['A+', 'A', 'A-'];")
+    changed = store.capture(url, label="v2")
+    assert changed != version
+    assert store.manifest(changed)["files"]["/fonts/inter.woff2"] == files["/fonts/inter.woff2"]
+    assert [entry[1] for entry in store.versions()].count("v1") == 1
+
+
+def test_serve_snapshot_offline(tmp_path, live_site):
+    _, url = live_site
+    root = str(tmp_path / "snapshots")
+    version = SnapshotStore(root).capture(url)
+    server, served_url = serve(version, root)
+    try:
+        with urllib.request.urlopen(served_url + "?type=letter") as response:
+            assert response.read() == PAGE
+            assert response.headers["Content-Type"].startswith("text/html")
+            assert response.headers["Cache-Control"] == REVALIDATE
+        base = served_url.rsplit("/calculator", 1)[0]
+        with urllib.request.urlopen(base + "/_next/static/chunks/main.js") as response:
+            assert "javascript" in response.headers["Content-Type"]
+            assert response.headers["Cache-Control"] == IMMUTABLE
+            etag = response.headers["ETag"]
+        request = urllib.request.Request(base + "/_next/static/chunks/main.js", headers={"If-None-Match": etag})
+        with pytest.raises(urllib.error.HTTPError) as not_modified:
+            urllib.request.urlopen(request)
+        assert not_modified.value.code == 304
+        with pytest.raises(urllib.error.HTTPError) as missing:
+            urllib.request.urlopen(base + "/analytics.js")
+        assert missing.value.code == 404
+    finally:
+        server.shutdown()
@@ -0,0 +1,81 @@
+import logging
+import random
+
+import pytest
+
+from chrome_pool import new_session
+from grade_engine import GRADE_TYPES
+from navigation import grade_type_url
+from perf_budgets import ROW_COUNT, WAIT_INTERACTIVE, install_probe
+from soak import CYCLE, SoakMonitor, fit_trend, sample_every, sample_page, save_heap_snapshot, soak_cycles
+
+
+ROWS_PER_CYCLE = 4
+
+
+def test_fit_trend():
+    slope, r2 = fit_trend([0, 1, 2, 3], [10, 12, 14, 16])
+    assert slope == pytest.approx(2.0)
+    assert r2 == pytest.approx(1.0)
+    assert fit_trend([0, 1, 2], [5, 5, 5]) == (0.0, 0.0)
+
+
+def test_monitor_flags_steady_growth_only():
+    rng = random.Random(0)
+    steady = SoakMonitor(sample_every=10, warmup=0)
+    leaky = SoakMonitor(sample_every=10, warmup=0)
+    for cycle in range(0, 1000, 10):
+        noise = rng.uniform(-50_000, 50_000)
+        steady.record_sample(cycle, {"js_heap": 4_000_000 + noise, "dom_nodes": 300, "listeners": 40})
+        leaky.record_sample(cycle, {"js_heap": 4_000_000 + 5_000 * cycle + noise, "dom_nodes": 300 + cycle, "listeners": 40})
+    for cycle in range(1000):
+        steady.record_cycle(cycle, 30 + rng.uniform(-5, 5))
+        leaky.record_cycle(cycle, 30 + 0.05 * cycle + rng.uniform(-5, 5))
+    assert steady.climbing() == {}
+    assert not steady.leaking()
+    assert set(leaky.climbing()) == {"js_heap", "dom_nodes", "latency_ms"}
+    assert leaky.leaking()
+
+
+def test_monitor_ignores_warmup_and_single_spike():
+    monitor = SoakMonitor(sample_every=10, warmup=100)
+    for cycle in range(0, 500, 10):
+        heap = 1_000_000 * (cycle // 10) if cycle < 100 else 10_000_000
+        if cycle == 300:
+            heap = 30_000_000
+        monitor.record_sample(cycle, {"js_heap": heap, "dom_nodes": 300, "listeners": 40})
+    assert monitor.climbing() == {}
+
+
+@pytest.mark.skipif(not soak_cycles(), reason="soak mode is enabled with SOAK_CYCLES=<cycles per grade type>")
+@pytest.mark.parametrize("grade_type", GRADE_TYPES)
+def test_soak_add_reset_delete(grade_type, request):
+    driver = new_session()
+    try:
+        driver.set_script_timeout(60)
+        install_probe(driver)
+        driver.get(grade_type_url(grade_type))
+        driver.execute_async_script(WAIT_INTERACTIVE)
+        initial_rows = driver.execute_script(ROW_COUNT)
+
+        monitor = SoakMonitor(sample_every=sample_every())
+        monitor.record_sample(0, sample_page(driver))
+        for cycle in range(1, soak_cycles() + 1):
+            monitor.record_cycle(cycle, driver.execute_async_script(CYCLE, ROWS_PER_CYCLE, initial_rows))
+            if monitor.due(cycle):
+                monitor.record_sample(cycle, sample_page(driver))
+
+        trends = monitor.trends()
+        request.node.user_properties.append(("soak", {"samples": monitor.samples, "trends": trends}))
+        for metric, (slope, r2) in trends.items():
+            logging.info("%s %s: %+.3f per cycle (r2 %.2f)", grade_type, metric, slope, r2)
+        climbing = monitor.climbing()
+        if monitor.leaking():
+            snapshot = save_heap_snapshot(driver, f"soak_{grade_type.lower()}.heapsnapshot")
+            logging.error("Leak suspected for %s, heap snapshot saved to %s", grade_type, snapshot)
+        assert not climbing, (
+            f"{grade_type} keeps climbing over {soak_cycles()} cycles: "
+            + ", ".join(f"{metric} {slope:+.3f}/cycle (r2 {r2:.2f})" for metric, (slope, r2) in climbing.items())
+        )
+    finally:
+        driver.quit()
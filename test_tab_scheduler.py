@@ -0,0 +1,56 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+import tab_scheduler
+from fake_driver import FakeClock, FakeDriver
+from tab_scheduler import TabScheduler, Wait
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(tab_scheduler, "time", clock)
+    return clock
+
+
+def rendering_flow(clock, log, steps, render_time):
+    def flow(driver):
+        handle = driver.current_window_handle
+        for step in range(steps):
+            log.append((handle, step))
+            done = clock.now + render_time
+            yield Wait(lambda d: d.current_window_handle == handle and clock.now >= done, label="render")
+    return flow
+
+
+def test_flows_overlap_their_waits(clock):
+    driver = FakeDriver()
+    scheduler = TabScheduler(driver)
+    log = []
+    for name in ("Percentage", "Letter", "Points"):
+        scheduler.add(name, f"https://example.test/?type={name.lower()}", rendering_flow(clock, log, 3, 0.05))
+    assert driver.scripts.count("navigate") == 3
+
+    durations = scheduler.run()
+    assert set(durations) == {"Percentage", "Letter", "Points"}
+    # Three flows of 3 x 50 ms waits each finish in about the time of one, not three
+    assert 0.15 <= clock.now < 0.3
+    assert scheduler.overlap() >= 0.15
+    assert [handle for handle, _ in log[:3]] == ["window-0", "window-1", "window-2"]
+    assert driver.window_handles == ["window-0"]
+    assert driver.current_window_handle == "window-0"
+
+
+def test_wait_timeout_names_the_tab(clock):
+    driver = FakeDriver()
+    scheduler = TabScheduler(driver)
+
+    def stuck(driver):
+        yield Wait(lambda d: False, timeout=0.05, label="never")
+
+    scheduler.add("Letter", "https://example.test/", stuck)
+    scheduler.add("Points", "https://example.test/", stuck)
+    with pytest.raises(TimeoutException, match="Letter: wait for never"):
+        scheduler.run()
+    assert driver.window_handles == ["window-0"]
+    assert driver.current_window_handle == "window-0"
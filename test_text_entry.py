@@ -0,0 +1,49 @@
+import pytest
+from selenium.webdriver.common.by import By
+
+import text_entry
+from fake_driver import FakeDriver
+from navigation import BASE_URL
+
+
+@pytest.fixture
+def driver():
+    driver = FakeDriver()
+    driver.get(BASE_URL)
+    return driver
+
+
+def task_input(driver):
+    element = driver.find_element(By.NAME, "rows.0.task")
+    element.send_keys("old")
+    return element
+
+
+def test_fast_mode_is_one_script_call(driver):
+    element = task_input(driver)
+    text_entry.enter_text(driver, element, 12345678901234, mode="fast")
+    assert element.get_attribute("value") == "12345678901234"
+    assert driver.scripts == ["set_value"]
+
+
+@pytest.mark.text_entry("keystroke")
+def test_marker_selects_keystroke_mode(driver):
+    element = task_input(driver)
+    text_entry.enter_text(driver, element, "B+")
+    assert element.get_attribute("value") == "B+"
+    assert driver.scripts == []
+
+
+def test_timings_are_running_totals(driver, monkeypatch):
+    monkeypatch.setattr(text_entry, "timings", {mode: {"calls": 0, "characters": 0, "seconds": 0.0} for mode in text_entry.MODES})
+    for _ in range(100):
+        text_entry.enter_text(driver, task_input(driver), "95", mode="fast")
+    text_entry.enter_text(driver, task_input(driver), "B+", mode="keystroke")
+    assert text_entry.timings["fast"]["calls"] == 100
+    assert text_entry.timings["fast"]["characters"] == 200
+    assert text_entry.timings["keystroke"]["calls"] == 1
+
+
+def test_invalid_mode(driver):
+    with pytest.raises(ValueError):
+        text_entry.enter_text(driver, task_input(driver), "x", mode="paste")
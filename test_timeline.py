@@ -0,0 +1,39 @@
+import json
+import time
+
+from timeline import Timeline, merge, summarize
+
+
+def test_disabled_timeline_records_nothing():
+    timeline = Timeline(enabled=False)
+    with timeline.span("setup"):
+        pass
+    assert timeline.events == []
+
+
+def test_nested_spans():
+    timeline = Timeline(worker="gw0", enabled=True)
+    with timeline.span("tests/test_a.py::test_one", "test"):
+        with timeline.span("browser launch", "browser"):
+            time.sleep(0.01)
+    launch, test = timeline.events
+    assert launch["ph"] == test["ph"] == "X"
+    assert test["ts"] <= launch["ts"] and launch["ts"] + launch["dur"] <= test["ts"] + test["dur"]
+    assert launch["dur"] >= 10_000
+    assert launch["args"] == {"worker": "gw0"}
+
+
+def test_merge_and_summarize_workers(tmp_path):
+    for worker in ("gw0", "gw1"):
+        timeline = Timeline(worker=worker, enabled=True)
+        with timeline.span(f"test_{worker}", "test"):
+            with timeline.span("setup", "pytest"):
+                time.sleep(0.02 if worker == "gw0" else 0.001)
+        timeline.write(str(tmp_path))
+
+    with open(merge(str(tmp_path))) as f:
+        events = json.load(f)["traceEvents"]
+    assert sorted(event["args"]["name"] for event in events if event["ph"] == "M") == ["gw0", "gw1"]
+    summary = summarize(events)
+    assert summary["phases"]["setup"] >= 0.02
+    assert summary["idle"]["gw1"] > summary["idle"]["gw0"]
@@ -0,0 +1,76 @@
+import io
+import json
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import visual_regression
+from visual_regression import VisualBaselines, perceptual_hashes, hamming_distances
+
+
+def png(image):
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def form_image(rows=3):
+    image = np.full((200, 300, 3), 255, dtype=np.uint8)
+    for row in range(rows):
+        image[20 + row * 30:40 + row * 30, 20:280] = 180
+    return image
+
+
+def test_missing_baseline_fails_unless_recording(tmp_path, monkeypatch):
+    monkeypatch.delenv("VISUAL_RECORD", raising=False)
+    result = VisualBaselines(str(tmp_path / "baselines")).compare("Letter", "empty form", png(form_image()))
+    assert not result["passed"]
+    assert "VISUAL_RECORD=1" in result["reason"]
+    assert not os.path.exists(tmp_path / "baselines")
+
+    monkeypatch.setenv("VISUAL_RECORD", "1")
+    result = VisualBaselines(str(tmp_path / "baselines")).compare("Letter", "empty form", png(form_image()))
+    assert result["passed"] and result["new_baseline"]
+    assert os.path.exists(tmp_path / "baselines" / "letter_empty_form.png")
+    assert VisualBaselines(str(tmp_path / "baselines"), record=False).compare("Letter", "empty form", png(form_image()))["passed"]
+
+
+def test_changed_capture_fails_and_writes_heatmap(tmp_path):
+    baselines = VisualBaselines(str(tmp_path), record=True)
+    baselines.compare("Percentage", "3 rows", png(form_image(3)))
+    result = baselines.compare("Percentage", "3 rows", png(form_image(4)))
+    assert not result["passed"]
+    assert os.path.exists(result["heatmap"])
+    assert result["heatmap"] in result["reason"]
+
+
+def test_size_change_is_reported(tmp_path):
+    baselines = VisualBaselines(str(tmp_path), record=True)
+    baselines.compare("Letter", "empty form", png(form_image()))
+    result = baselines.compare("Letter", "empty form", png(form_image()[:150]))
+    assert not result["passed"]
+    assert result["reason"] == "image size changed from 300x200 to 300x150"
+
+
+def test_default_directory_is_next_to_the_module():
+    assert os.path.dirname(visual_regression.BASELINE_DIR) == os.path.dirname(os.path.abspath(visual_regression.__file__))
+
+
+def test_ignored_region_is_not_compared(tmp_path):
+    with open(tmp_path / "ignore_regions.json", "w") as f:
+        json.dump({"points_after_reset": [[0, 180, 300, 20]]}, f)
+    baselines = VisualBaselines(str(tmp_path), record=True)
+    baselines.compare("Points", "after reset", png(form_image()))
+    changed = form_image()
+    changed[185:195, 10:290] = 0
+    assert baselines.compare("Points", "after reset", png(changed))["passed"]
+
+
+def test_hash_batch():
+    images = [form_image(i % 5) for i in range(500)]
+    hashes = perceptual_hashes(images)
+    assert hashes.shape == (500, 64)
+    assert hamming_distances(hashes[:5], hashes[5:10]).tolist() == [0] * 5
+    assert hamming_distances(hashes[:1], hashes[1:2]).tolist() != [0]
@@ -0,0 +1,64 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.common.by import By
+
+import waits
+from fake_driver import FakeClock
+from waits import AdaptiveWait, WaitTelemetry, condition_label
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(waits, "time", clock)
+    return clock
+
+
+def test_instant_condition_costs_one_poll(clock):
+    telemetry = WaitTelemetry()
+    assert AdaptiveWait(None, 10, telemetry=telemetry).until(lambda d: "ready") == "ready"
+    assert clock.sleeps == []
+    assert telemetry.records[0]["polls"] == 1
+    assert telemetry.records[0]["elapsed"] == 0
+
+
+def test_backoff_and_ignored_exceptions(clock):
+    telemetry = WaitTelemetry()
+    calls = []
+
+    def condition(driver):
+        calls.append(driver)
+        if len(calls) < 4:
+            raise NoSuchElementException("not yet")
+        return True
+
+    AdaptiveWait("driver", 10, label="rows added", telemetry=telemetry).until(condition)
+    assert calls == ["driver"] * 4
+    assert clock.sleeps == [0.005, 0.01, 0.02]
+    summary = telemetry.summary()
+    assert summary["rows added"]["polls"] == 4
+    assert summary["rows added"]["elapsed"] == pytest.approx(0.035)
+
+
+def test_poll_interval_is_capped(clock):
+    telemetry = WaitTelemetry()
+    with pytest.raises(TimeoutException):
+        AdaptiveWait(None, 2, initial_poll=0.1, max_poll=0.5, telemetry=telemetry).until(lambda d: False)
+    assert clock.sleeps == pytest.approx([0.1, 0.2, 0.4, 0.5, 0.5, 0.3])
+    assert telemetry.records[0]["polls"] == 7
+
+
+def test_timeout_is_recorded(clock):
+    telemetry = WaitTelemetry()
+    with pytest.raises(TimeoutException):
+        AdaptiveWait(None, 0.05, telemetry=telemetry).until(lambda d: False, "never")
+    assert clock.sleeps == pytest.approx([0.005, 0.01, 0.02, 0.015])
+    assert telemetry.records[0]["timed_out"]
+    assert telemetry.records[0]["polls"] == 5
+    assert AdaptiveWait(None, 1, telemetry=telemetry).until_not(lambda d: False)
+
+
+def test_condition_labels():
+    assert condition_label(EC.element_to_be_clickable((By.ID, "x"))) == "element_to_be_clickable"
+    assert condition_label(lambda d: True).startswith("test_waits.py:")
@@ -0,0 +1,66 @@
+import logging
+import time
+
+
+MODES = ("fast", "keystroke")
+
+# Goes through the native value setter so frameworks that track the last value (React) see the change
+SET_VALUE_SCRIPT = """
+const element = arguments[0], value = arguments[1];
+const prototype = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+    : element instanceof HTMLSelectElement ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, value);
+element.dispatchEvent(new Event('input', {bubbles: true}));
+element.dispatchEvent(new Event('change', {bubbles: true}));
+"""
+
+default_mode = "fast"
+# Running totals per mode rather than one sample per call, so a long session stays flat
+timings = {mode: {"calls": 0, "characters": 0, "seconds": 0.0} for mode in MODES}
+
+
+def set_default_mode(mode: str):
+    """Mode used when ``enter_text`` is called without one; set per test by the ``text_entry`` marker."""
+    global default_mode
+    if mode not in MODES:
+        raise ValueError(f"Invalid text entry mode: {mode}")
+    default_mode = mode
+
+
+def enter_text(driver, element, value, mode: str = None):
+    """Replace the element's value.
+
+    "fast" sets it in one script call and fires a single input and change event.
+    "keystroke" clears the field and types one key event per character, for tests that
+    check how the field filters individual keys.
+    """
+    mode = mode or default_mode
+    value = str(value)
+    start = time.perf_counter()
+    if mode == "fast":
+        driver.execute_script(SET_VALUE_SCRIPT, element, value)
+    elif mode == "keystroke":
+        element.clear()
+        element.send_keys(value)
+    else:
+        raise ValueError(f"Invalid text entry mode: {mode}")
+    totals = timings[mode]
+    totals["calls"] += 1
+    totals["characters"] += len(value)
+    totals["seconds"] += time.perf_counter() - start
+
+
+def compare_modes(driver, element, value, repeats: int = 5):
+    """Time both modes entering ``value`` into ``element`` and return (fast, keystroke, speedup)."""
+    results = {}
+    for mode in MODES:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            enter_text(driver, element, value, mode)
+        results[mode] = (time.perf_counter() - start) / repeats
+    speedup = results["keystroke"] / max(results["fast"], 1e-9)
+    logging.info(
+        "Entering %s characters: fast %.1f ms, keystroke %.1f ms (%.1fx)",
+        len(value), results["fast"] * 1000, results["keystroke"] * 1000, speedup,
+    )
+    return results["fast"], results["keystroke"], speedup
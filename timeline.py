@@ -0,0 +1,93 @@
+import contextlib
+import glob
+import json
+import os
+import threading
+import time
+
+
+def timeline_dir():
+    """Directory for trace files; phase spans are recorded only when TIMELINE is set."""
+    return os.environ.get("TIMELINE")
+
+
+def now_us() -> float:
+    # Wall clock, so spans from different worker processes line up in the merged trace
+    return time.time_ns() / 1000
+
+
+class Timeline:
+    """Phase spans of one worker process in Chrome trace-event format.
+
+    Each span is a complete ("X") event on the recording thread; spans opened inside
+    another span nest under it in the trace viewer. The worker id names the process.
+    """
+
+    def __init__(self, worker: str = "main", enabled: bool = None):
+        self.worker = worker
+        self.enabled = timeline_dir() is not None if enabled is None else enabled
+        self.events = []
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "phase", **args):
+        if not self.enabled:
+            yield
+            return
+        start = now_us()
+        try:
+            yield
+        finally:
+            self.events.append({
+                "name": name, "cat": category, "ph": "X", "ts": start, "dur": now_us() - start,
+                "pid": os.getpid(), "tid": threading.get_ident(), "args": dict(args, worker=self.worker),
+            })
+
+    def metadata(self):
+        return [{"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": self.worker}}]
+
+    def write(self, directory: str) -> str:
+        """Write this worker's events to ``<directory>/trace-<worker>.json``."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"trace-{self.worker}.json")
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.metadata() + self.events}, f)
+        return path
+
+
+def merge(directory: str, output: str = None) -> str:
+    """Merge every worker trace in ``directory`` into one session timeline."""
+    events = []
+    for path in sorted(glob.glob(os.path.join(directory, "trace-*.json"))):
+        with open(path) as f:
+            events.extend(json.load(f)["traceEvents"])
+    output = output or os.path.join(directory, "timeline.json")
+    with open(output, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return output
+
+
+def summarize(events):
+    """Seconds per category and phase, plus each worker's idle time between tests."""
+    spans = [event for event in events if event["ph"] == "X"]
+    if not spans:
+        return {}
+    phases = {}
+    for event in spans:
+        key = event["name"] if event["cat"] in ("pytest", "browser") else event["cat"]
+        phases[key] = phases.get(key, 0.0) + event["dur"] / 1e6
+    start = min(event["ts"] for event in spans)
+    end = max(event["ts"] + event["dur"] for event in spans)
+    idle = {}
+    for worker in {event["args"]["worker"] for event in spans}:
+        busy = sum(event["dur"] for event in spans if event["cat"] == "test" and event["args"]["worker"] == worker)
+        idle[worker] = (end - start - busy) / 1e6
+    return {"wall": (end - start) / 1e6, "phases": phases, "idle": idle}
+
+
+def reset_directory(directory: str):
+    """Drop worker traces left over from an earlier run."""
+    for path in glob.glob(os.path.join(directory, "trace-*.json")):
+        os.remove(path)
+
+
+timeline = Timeline()
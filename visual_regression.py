@@ -0,0 +1,168 @@
+import io
+import json
+import logging
+import os
+
+import numpy as np
+from PIL import Image
+
+
+# Next to this module, so the suites find the same baselines from any working directory
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+HASH_SIZE = 8
+HASH_SAMPLE = 32
+
+
+def _dct_matrix(n: int):
+    """Orthonormal DCT-II matrix, so that D @ x @ D.T is the 2-D DCT of x."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+DCT = _dct_matrix(HASH_SAMPLE)
+
+
+def recording_enabled() -> bool:
+    """Missing baselines are recorded from the capture when VISUAL_RECORD is set to 1."""
+    return os.environ.get("VISUAL_RECORD") == "1"
+
+
+def load_image(source):
+    """Load a screenshot from a path or PNG bytes into an RGB uint8 array."""
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    with Image.open(source) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def perceptual_hashes(images):
+    """Compute 64-bit DCT perceptual hashes for a batch of RGB arrays in one vectorized pass."""
+    samples = np.stack([
+        np.asarray(Image.fromarray(image).convert("L").resize((HASH_SAMPLE, HASH_SAMPLE), Image.BILINEAR),
+                   dtype=np.float32)
+        for image in images
+    ])
+    coefficients = DCT @ samples @ DCT.T
+    low = coefficients[:, :HASH_SIZE, :HASH_SIZE].reshape(len(images), -1)
+    return low > np.median(low[:, 1:], axis=1, keepdims=True)
+
+
+def hamming_distances(hashes, other_hashes):
+    """Bit distance between two equally long batches of hashes."""
+    return np.count_nonzero(hashes != other_hashes, axis=-1)
+
+
+def ignore_mask(shape, regions):
+    """Boolean mask that is False inside every (x, y, width, height) region we ignore."""
+    mask = np.ones(shape[:2], dtype=bool)
+    for x, y, width, height in regions:
+        mask[y:y + height, x:x + width] = False
+    return mask
+
+
+def pixel_diff(baseline, actual, regions=(), tolerance: int = 16):
+    """Per-pixel max channel difference with ignored regions zeroed, and the changed-pixel mask."""
+    if baseline.shape != actual.shape:
+        raise ValueError(f"Image size changed from {baseline.shape} to {actual.shape}")
+    diff = np.abs(baseline.astype(np.int16) - actual.astype(np.int16)).max(axis=2)
+    diff *= ignore_mask(diff.shape, regions)
+    return diff, diff > tolerance
+
+
+def write_heatmap(path: str, baseline, diff):
+    """Overlay the difference magnitude in red on a dimmed greyscale copy of the baseline."""
+    grey = (baseline.mean(axis=2) * 0.4).astype(np.uint8)
+    heatmap = np.stack([grey, grey, grey], axis=2)
+    heatmap[..., 0] = np.maximum(grey, np.clip(diff * 4, 0, 255).astype(np.uint8))
+    Image.fromarray(heatmap).save(path)
+
+
+class VisualBaselines:
+    """Baseline screenshots stored per grade type and state, e.g. ``letter_after_reset.png``.
+
+    Baselines are recorded with ``record`` (default: VISUAL_RECORD=1), reviewed and
+    committed; the ``*_diff.png`` heatmaps written next to them are not.
+    """
+
+    def __init__(self, directory: str = BASELINE_DIR, max_hash_distance: int = 6, max_changed_ratio: float = 0.001,
+                 record: bool = None):
+        self.directory = directory
+        self.max_hash_distance = max_hash_distance
+        self.max_changed_ratio = max_changed_ratio
+        self.record = recording_enabled() if record is None else record
+        regions_file = os.path.join(directory, "ignore_regions.json")
+        self.regions = {}
+        if os.path.exists(regions_file):
+            with open(regions_file) as f:
+                self.regions = json.load(f)
+
+    @staticmethod
+    def key(grade_type: str, state: str) -> str:
+        return f"{grade_type.lower()}_{state.lower().replace(' ', '_')}"
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")
+
+    def compare(self, grade_type: str, state: str, screenshot):
+        """Compare one capture; see ``compare_many``."""
+        return self.compare_many([(grade_type, state, screenshot)])[0]
+
+    def compare_many(self, captures):
+        """Compare (grade_type, state, png bytes or path) captures against their baselines.
+
+        A missing baseline fails the capture, unless recording is on: then it is recorded
+        from the capture and passes with ``new_baseline`` set. Hashes for the whole batch are computed at once; the pixel
+        diff then decides, restricted to non-ignored regions. Failed results carry a
+        ``reason`` that says what differs.
+        """
+        results = [None] * len(captures)
+        pending = []
+        for index, (grade_type, state, screenshot) in enumerate(captures):
+            key = self.key(grade_type, state)
+            actual = load_image(screenshot)
+            if not os.path.exists(self.path(key)):
+                if not self.record:
+                    reason = f"no baseline {self.path(key)}; record one with VISUAL_RECORD=1"
+                    logging.error("Visual regression in %s: %s", key, reason)
+                    results[index] = {"key": key, "passed": False, "reason": reason}
+                    continue
+                os.makedirs(self.directory, exist_ok=True)
+                Image.fromarray(actual).save(self.path(key))
+                logging.warning("Recorded new visual baseline %s; review it before committing", self.path(key))
+                results[index] = {"key": key, "passed": True, "new_baseline": True}
+                continue
+            baseline = load_image(self.path(key))
+            if key in self.regions and baseline.shape == actual.shape:
+                # Ignored regions take the baseline's pixels so they cannot move the hash either
+                mask = ignore_mask(actual.shape, self.regions[key])
+                actual = np.where(mask[..., None], actual, baseline)
+            pending.append((index, key, baseline, actual))
+
+        if not pending:
+            return results
+
+        distances = hamming_distances(
+            perceptual_hashes([baseline for _, _, baseline, _ in pending]),
+            perceptual_hashes([actual for _, _, _, actual in pending]),
+        )
+        for (index, key, baseline, actual), distance in zip(pending, distances):
+            if baseline.shape != actual.shape:
+                reason = f"image size changed from {baseline.shape[1]}x{baseline.shape[0]} to {actual.shape[1]}x{actual.shape[0]}"
+                logging.error("Visual regression in %s: %s", key, reason)
+                results[index] = {"key": key, "passed": False, "hash_distance": int(distance), "changed_ratio": 1.0,
+                                  "reason": reason}
+                continue
+            diff, changed = pixel_diff(baseline, actual, self.regions.get(key, ()))
+            ratio = float(changed.mean())
+            passed = ratio <= self.max_changed_ratio and distance <= self.max_hash_distance
+            result = {"key": key, "passed": passed, "hash_distance": int(distance), "changed_ratio": ratio}
+            if not passed:
+                result["heatmap"] = os.path.join(self.directory, f"{key}_diff.png")
+                write_heatmap(result["heatmap"], baseline, diff)
+                result["reason"] = f"{ratio:.2%} pixels changed, hash distance {distance}, see {result['heatmap']}"
+                logging.error("Visual regression in %s: %s", key, result["reason"])
+            results[index] = result
+        return results
@@ -0,0 +1,106 @@
+import logging
+import os
+import time
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from timeline import timeline
+
+
+class WaitTelemetry:
+    """Collects how long each wait condition took and how many polls it needed."""
+
+    def __init__(self):
+        self.records = []
+
+    def reset(self):
+        self.records = []
+
+    def record(self, label: str, elapsed: float, polls: int, timed_out: bool):
+        self.records.append({"label": label, "elapsed": elapsed, "polls": polls, "timed_out": timed_out})
+
+    def summary(self):
+        """Total wait time per condition label, largest first."""
+        per_label = {}
+        for record in self.records:
+            entry = per_label.setdefault(record["label"], {"count": 0, "elapsed": 0.0, "polls": 0, "timeouts": 0})
+            entry["count"] += 1
+            entry["elapsed"] += record["elapsed"]
+            entry["polls"] += record["polls"]
+            entry["timeouts"] += record["timed_out"]
+        return dict(sorted(per_label.items(), key=lambda item: item[1]["elapsed"], reverse=True))
+
+    def total(self) -> float:
+        return sum(record["elapsed"] for record in self.records)
+
+
+telemetry = WaitTelemetry()
+
+
+def condition_label(method) -> str:
+    """Readable name for a wait condition, e.g. ``element_to_be_clickable`` or ``test_all.py:130``."""
+    qualname = getattr(method, "__qualname__", type(method).__name__)
+    if qualname.endswith("<lambda>"):
+        code = method.__code__
+        return f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}"
+    return qualname.split(".<locals>")[0]
+
+
+class AdaptiveWait:
+    """Drop-in replacement for ``WebDriverWait`` that polls with exponential backoff.
+
+    Polling starts at ``initial_poll`` seconds and doubles up to ``max_poll``, so conditions
+    that are already true return after a few milliseconds instead of up to half a second.
+    Every call is recorded in ``telemetry``.
+    """
+
+    def __init__(self, driver, timeout: float, initial_poll: float = 0.005, max_poll: float = 0.5,
+                 ignored_exceptions=None, label: str = None, telemetry: WaitTelemetry = telemetry):
+        self._driver = driver
+        self._timeout = timeout
+        self._initial_poll = initial_poll
+        self._max_poll = max_poll
+        self._ignored = (NoSuchElementException,) + tuple(ignored_exceptions or ())
+        self._label = label
+        self._telemetry = telemetry
+
+    def _wait(self, method, message: str, expect_truthy: bool):
+        label = self._label or condition_label(method)
+        with timeline.span(f"wait {label}", "wait"):
+            return self._poll(method, message, expect_truthy, label)
+
+    def _poll(self, method, message: str, expect_truthy: bool, label: str):
+        start = time.perf_counter()
+        deadline = start + self._timeout
+        poll = self._initial_poll
+        polls = 0
+        screen = stacktrace = None
+        while True:
+            polls += 1
+            try:
+                value = method(self._driver)
+                if bool(value) == expect_truthy:
+                    self._telemetry.record(label, time.perf_counter() - start, polls, False)
+                    return value if expect_truthy else True
+            except self._ignored as e:
+                if not expect_truthy:
+                    self._telemetry.record(label, time.perf_counter() - start, polls, False)
+                    return True
+                screen = getattr(e, "screen", None)
+                stacktrace = getattr(e, "stacktrace", None)
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            time.sleep(min(poll, deadline - now))
+            poll = min(poll * 2, self._max_poll)
+        self._telemetry.record(label, time.perf_counter() - start, polls, True)
+        logging.warning("Wait for %s timed out after %ss and %s polls", label, self._timeout, polls)
+        raise TimeoutException(message, screen, stacktrace)
+
+    def until(self, method, message: str = ""):
+        """Wait until ``method(driver)`` returns a truthy value and return it."""
+        return self._wait(method, message, True)
+
+    def until_not(self, method, message: str = ""):
+        """Wait until ``method(driver)`` returns a falsy value."""
+        return self._wait(method, message, False)